@@ -0,0 +1,43 @@
+'''throughput of option_price_batch (all contracts rolled back together on one stock price tree)
+    against one option_price_lattice call per contract
+usage: python benchmarks/batch_benchmark.py [contracts] [N]   (default 10000 contracts, N = 200)
+'''
+
+from __future__ import print_function
+import os, sys, time, math
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import derivative_pricing as dp
+
+def main(M,N):
+    T,sigma,S0 = 0.5,0.2,100.0
+    u = math.exp(sigma*math.sqrt(T/float(N)))
+    d = 1.0/u
+    stkval = dp.lattice_rows(u,d,S0)
+
+    rng = np.random.RandomState(0)
+    K = rng.uniform(70.,130.,M)
+    cp = rng.choice([1,-1],M)
+    am = rng.rand(M) < 0.5
+    r = rng.uniform(0.0,0.05,M)
+    c = rng.uniform(0.0,0.03,M)
+
+    t0 = time.time()
+    prices = dp.option_price_batch(u,d,N,T,r,c,cp,am,stkval,K)
+    t_batch = time.time()-t0
+
+    #one contract at a time
+    M_loop = min(M,200)
+    t0 = time.time()
+    loop = [dp.option_price_lattice(u,d,N,T,r[k],c[k],cp[k],am[k],stkval,K[k],keep=[0],closed_form=True)[0][0] for k in range(M_loop)]
+    t_loop = time.time()-t0
+
+    print('N=%d, %d contracts' % (N,M))
+    print('one call per contract: %12.0f contracts/s (%d contracts)' % (M_loop/t_loop,M_loop))
+    print('batch:                 %12.0f contracts/s' % (M/t_batch))
+    print('max difference:        %12.2e' % np.max(np.abs(prices[:M_loop]-loop)))
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*(args+[10000,200][len(args):]))
@@ -0,0 +1,56 @@
+'''accuracy against wall time of the lattice engines for an American put: binomial tree, binomial tree with
+    Broadie-Detemple smoothing, Richardson extrapolation of smoothed trees and trinomial tree
+the reference price is the mean of the plain binomial trees with 20000 and 20001 periods (independent of the smoothing
+    and extrapolation being measured; the mean cancels the odd-even oscillation of the binomial prices)
+the error is plotted against the wall time in convergence.png (requires matplotlib)
+usage: python benchmarks/convergence_benchmark.py
+'''
+
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import lattice_engines as le
+
+T,sigma,r,c,K,S0,cp,am = 1.0,0.2,0.05,0.0,100.0,100.0,-1,True
+
+methods = [('binomial',lambda u,N: le.binomial_option_price(u,1.0/u,N,T,r,c,cp,am,S0,K,smoothing=False)),
+           ('smoothed binomial',lambda u,N: le.binomial_option_price(u,1.0/u,N,T,r,c,cp,am,S0,K)),
+           ('Richardson',lambda u,N: le.richardson_option_price(u,1.0/u,N,T,r,c,cp,am,S0,K)),
+           ('trinomial',lambda u,N: le.trinomial_option_price(u,1.0/u,N,T,r,c,cp,am,S0,K))]
+
+def main():
+    Nref = 20000
+    reference = 0.5*sum(methods[0][1](np.exp(sigma*np.sqrt(T/N)),N) for N in (Nref,Nref+1))
+    print('reference price %.8f' % reference)
+    print('%20s %8s %14s %12s' % ('method','N','error','time (s)'))
+    results = {}
+    for name,price in methods:
+        results[name] = []
+        for N in [25,50,100,200,400,800,1600,3200]:
+            u = np.exp(sigma*np.sqrt(T/N))
+            t0 = time.time()
+            P = price(u,N)
+            t = time.time()-t0
+            results[name].append((t,abs(P-reference)))
+            print('%20s %8d %14.3e %12.5f' % (name,N,P-reference,t))
+
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return
+    plt.clf()
+    for name,_ in methods:
+        t,err = np.array(results[name]).T
+        plt.loglog(t,np.maximum(err,1e-12),'o-',label=name)
+    plt.axhline(1e-4*S0,color='k',ls=':') #one basis point of the stock price
+    plt.xlabel('wall time (s)')
+    plt.ylabel('absolute error')
+    plt.legend()
+    plt.savefig('convergence.png',format='png')
+
+if __name__ == '__main__':
+    main()
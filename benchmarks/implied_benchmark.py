@@ -0,0 +1,69 @@
+'''implied volatilities of a surface of option quotes with implied.implied_volatility (all the quotes solved in
+lockstep), against scipy's brentq per quote (timed on a sample and scaled), for European quotes (Black-Scholes) and
+American quotes (binomial trees), and implied short rates of zero-coupon bond prices
+usage: python benchmarks/implied_benchmark.py [quotes] [periods]   (default 50000 quotes, 100-period trees)
+'''
+
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+from scipy.optimize import brentq
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import implied as im
+from financial_markets import derivative_pricing as dp
+from financial_markets.black_scholes import black_scholes_price, black_scholes_greeks
+
+def surface(quotes,rng):
+    S0 = 100.0
+    K = rng.uniform(70.0,130.0,quotes)
+    T = rng.choice([1/12.,2/12.,3/12.,6/12.,9/12.,1.,1.5,2.],quotes)
+    r = 0.02
+    c = rng.uniform(0.0,0.03,quotes)
+    sigma = rng.uniform(0.1,0.6,quotes)
+    cp = np.where(rng.rand(quotes) < 0.5,1.0,-1.0)
+    return S0,K,T,r,c,sigma,cp
+
+def report(label,sigma,res,t,t_loop,ok):
+    print('%-10s lockstep %8.3f s, brentq per quote (estimated) %8.1f s, speedup %6.0f, max error %.1e (%d NaN)' %
+          (label,t,t_loop,t_loop/t,np.nanmax(np.abs(res-sigma)[ok]),np.isnan(res).sum()))
+
+def main(quotes,N):
+    rng = np.random.RandomState(0)
+    S0,K,T,r,c,sigma,cp = surface(quotes,rng)
+    #quotes whose price hardly depends on the volatility (deep in the money) are left out of the error
+    ok = black_scholes_greeks(S0,K,T,r,c,sigma,cp)['vega'] > 1.0
+    sample = np.nonzero(ok)[0][:50]
+
+    price = black_scholes_price(S0,K,T,r,c,sigma,cp)
+    t0 = time.time()
+    res = im.implied_volatility(price,S0,K,T,r,c,cp)
+    t = time.time()-t0
+    t0 = time.time()
+    for k in sample:
+        brentq(lambda s: black_scholes_price(S0,K[k],T[k],r,c[k],s,cp[k])-price[k],1e-4,5.0,xtol=1e-12)
+    report('European',sigma,res,t,(time.time()-t0)*quotes/float(len(sample)),ok)
+
+    price = im.lattice_option_prices(S0,K,T,r,c,sigma,cp,True,N)
+    ok &= price > np.maximum(cp*(S0-K),0.0)+1e-3 #and those exercised at once
+    sample = np.nonzero(ok)[0][:50]
+    t0 = time.time()
+    res = im.implied_volatility(price,S0,K,T,r,c,cp,am=True,N=N)
+    t = time.time()-t0
+    t0 = time.time()
+    for k in sample:
+        brentq(lambda s: im.lattice_option_prices(S0,K[k:k+1],T[k:k+1],r,c[k:k+1],s,cp[k:k+1],True,N)[0]-price[k],
+               1.01*abs(r-c[k])*np.sqrt(T[k]/N),5.0,xtol=1e-12)
+    report('American',sigma,res,t,(time.time()-t0)*quotes/float(len(sample)),ok)
+
+    bonds = quotes//10
+    r0 = rng.uniform(0.01,0.1,bonds)
+    n = rng.randint(1,31,bonds)
+    price = np.array([dp.ZCB_lattice(int(m),100.0,dp.lattice_rows(1.1,0.9,x),keep=[0])[0][0] for m,x in zip(n,r0)])
+    t0 = time.time()
+    res = im.implied_short_rate(price,n,100.0,1.1,0.9)
+    t = time.time()-t0
+    print('%d zero-coupon bonds, implied r0: %.3f s, max error %.1e' % (bonds,t,np.nanmax(np.abs(res-r0))))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,int(sys.argv[2]) if len(sys.argv) > 2 else 100)
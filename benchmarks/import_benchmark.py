@@ -0,0 +1,52 @@
+'''import time of every module of the package financial_markets, each in a fresh interpreter, with the output printed at import and
+the heavy optional modules (matplotlib, pandas, QSTK, pandas-datareader) loaded by the import
+usage: python benchmarks/import_benchmark.py [repeat]   (default 3 imports per module, the fastest is reported)
+'''
+
+from __future__ import print_function
+import os, sys, subprocess
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..')
+heavy = ['matplotlib','pandas','QSTK','pandas_datareader']
+
+#run in the fresh interpreter: imports numpy first, so that the time is the one of the module itself
+probe = '''
+import sys, time, io
+sys.path.insert(0,%(root)r)
+import numpy
+out = sys.stdout
+sys.stdout = io.BytesIO() if sys.version_info[0] < 3 else io.StringIO()
+t0 = time.time()
+try:
+    import financial_markets.%(module)s
+    error = ''
+except Exception as e:
+    error = '%%s: %%s' %% (type(e).__name__,e)
+t = time.time()-t0
+printed = len(sys.stdout.getvalue())
+sys.stdout = out
+print('%%r' %% ((t,printed,[m for m in %(heavy)r if m in sys.modules],error),))
+'''
+
+def modules():
+    package = os.path.join(root,'financial_markets')
+    return sorted(name[:-3] for name in os.listdir(package) if name.endswith('.py') and name != '__init__.py')
+
+def import_module(module,repeat):
+    runs = []
+    for k in range(repeat):
+        output = subprocess.check_output([sys.executable,'-c',probe % {'root': root, 'module': module, 'heavy': heavy}])
+        runs.append(eval(output.decode('utf-8').strip().splitlines()[-1]))
+    return min(runs)
+
+def main(repeat):
+    print('%-20s %10s %10s  %s' % ('module','import ms','printed','heavy modules loaded / error'))
+    total = 0.0
+    for module in modules():
+        t,printed,loaded,error = import_module(module,repeat)
+        total += t
+        print('%-20s %10.1f %10d  %s' % (module,t*1e3,printed,error or ', '.join(loaded)))
+    print('%-20s %10.1f' % ('total',total*1e3))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,55 @@
+'''all the indicators of indicators.py over a panel of symbols x 20 years of daily prices, against the per-element loops
+of technicalAnalysis.pro (timed on one symbol and scaled)
+usage: python benchmarks/indicator_benchmark.py [symbols]   (default 500 symbols)
+'''
+
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import indicators as ind
+
+#EMA with the FOR loop of technicalAnalysis.pro
+def loop_ema(price,N):
+    res = np.zeros(len(price))
+    res[:N] = np.mean(price[:N])
+    alpha = 2.0/(N+1.0)
+    for i in range(N,len(price)):
+        res[i] = res[i-1]+alpha*(price[i]-res[i-1])
+    return res
+
+#Bollinger bands with the FOR loops of technicalAnalysis.pro
+def loop_bollinger(price,N):
+    mean = np.zeros(len(price))
+    std = np.zeros(len(price))
+    mean[:N] = np.mean(price[:N])
+    std[:N] = np.std(price[:N],ddof=1)
+    for i in range(N,len(price)):
+        mean[i] = np.mean(price[i-N+1:i+1])
+        std[i] = np.std(price[i-N+1:i+1],ddof=1)
+    return mean,std
+
+def main(symbols):
+    days = 20*252
+    rng = np.random.RandomState(0)
+    price = 100.0*np.exp(np.cumsum(rng.normal(0.0,0.02,(days,symbols)),axis=0))
+    volume = rng.randint(100000,1000000,(days,symbols)).astype(float)
+    p = ind.default_parameters
+    ind.ema(price[:60,:1],20) #scipy.signal is imported on first use, not timed
+
+    t0 = time.time()
+    res = ind.indicators(price,volume)
+    t = time.time()-t0
+    print('%d indicators, %d dates x %d symbols: %.3f s' % (len(res),days,symbols,t))
+
+    t0 = time.time()
+    for N in (p['N0'],p['N1'],p['Nfast'],p['Nslow'],p['Nrsi'],p['Nrsi']):
+        loop_ema(price[:,0],N)
+    loop_bollinger(price[:,0],p['Nbol'])
+    t_loop = (time.time()-t0)*symbols
+    print('per-element loops (EMAs and Bollinger bands only), estimated for %d symbols: %.1f s' % (symbols,t_loop))
+    print('speedup: %.0f' % (t_loop/t))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,65 @@
+'''benchmark of the vectorized backward induction against the original double loop
+    over (i,j) for an American put and a zero-coupon bond
+usage: python benchmarks/lattice_benchmark.py [N ...]   (default N = 100 1000 5000)
+'''
+
+from __future__ import print_function
+import os, sys, time, math
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import derivative_pricing as dp
+
+#original implementation of option_price_lattice (without the early exercise print)
+def option_price_loop(u,d,N,T,r,c,cp,am,stkval,K):
+    optval = np.zeros((N+1,N+1))
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT)
+    q = (a-d)/(u-d)
+    for j in range(N+1):
+        optval[N,j]=max(0,cp*(stkval[N,j]-K))
+    for i in range(N-1,-1,-1):
+        for j in range(i+1):
+            optval[i,j]=(q*optval[i+1,j]+(1-q)*optval[i+1,j+1])/np.exp(r*deltaT)
+            if am:
+                optval[i,j] = max(optval[i,j],cp*(stkval[i,j]-K))
+    return optval
+
+#original implementation of ZCB_lattice
+def ZCB_loop(N,face,shrval):
+    zcbval = np.zeros((N+1,N+1))
+    q=0.5
+    for j in range(N+1):
+        zcbval[N,j]=face
+    for i in range(N-1,-1,-1):
+        for j in range(i+1):
+            zcbval[i,j]=(q*zcbval[i+1,j]+(1-q)*zcbval[i+1,j+1])/(1.0+shrval[i,j])
+    return zcbval
+
+def timeit(f,*args,**kwargs):
+    t0 = time.time()
+    res = f(*args,**kwargs)
+    return time.time()-t0,res
+
+def main(Ns):
+    T,sigma,r,c,K = 0.5,0.2,0.02,0.01,100.0
+    print('%8s %22s %12s %12s %9s %10s' % ('N','pricer','loop (s)','vector (s)','speedup','max diff'))
+    for N in Ns:
+        u = math.exp(sigma*math.sqrt(T/float(N)))
+        d = 1.0/u
+        stkval = dp.stock_price_lattice(u,d,N,100.0)
+        deltaT = T/float(N)
+        q = (np.exp((r-c)*deltaT)-d)/(u-d)
+
+        t_old,old = timeit(option_price_loop,u,d,N,T,r,c,-1,True,stkval,K)
+        payoff = -(stkval-K)
+        t_new,new = timeit(dp.backward_induction,np.maximum(0,payoff[N,:]),q,np.exp(r*deltaT),exercise=payoff)
+        print('%8d %22s %12.4f %12.4f %9.1f %10.2e' % (N,'American put',t_old,t_new,t_old/t_new,np.max(np.abs(old-new))))
+
+        shrval = dp.short_rate_lattice(1.0+0.1/math.sqrt(N),1.0-0.1/math.sqrt(N),N,0.05/N)
+        t_old,old = timeit(ZCB_loop,N,100.0,shrval)
+        t_new,new = timeit(dp.ZCB_lattice,N,100.0,shrval)
+        print('%8d %22s %12.4f %12.4f %9.1f %10.2e' % (N,'zero-coupon bond',t_old,t_new,t_old/t_new,np.max(np.abs(old-new))))
+
+if __name__ == '__main__':
+    main([int(n) for n in sys.argv[1:]] or [100,1000,5000])
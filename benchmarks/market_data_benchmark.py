@@ -0,0 +1,50 @@
+'''throughput and cache behavior of market_data.fetch against the local stand-in server (serve_fixtures), offline:
+sequential against concurrent downloads of the 15 symbols of portfolio.py, then a cached re-run and a longer date
+range (only the missing ranges are requested), with a simulated network latency and 10% of failed requests
+usage: python benchmarks/market_data_benchmark.py [latency]   (default 0.05 s per request)
+'''
+
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import market_data as md
+from price_store_benchmark import write_csv_files
+
+symbols = ['MBT','T','C','BAC','SAN','SCGLY','LFRGY','CRRFY','MTNOY','BACHY','BCS','SRGHY','VCISY','VIV','^GSPC']
+
+def run(server,label,*args,**options):
+    n = len(server.requests)
+    t0 = time.time()
+    data = md.fetch(*args,**options)
+    print('%-40s %8.3f s %6d requests' % (label,time.time()-t0,len(server.requests)-n))
+    return data
+
+def main(latency):
+    tmp = tempfile.mkdtemp()
+    try:
+        fixtures = os.path.join(tmp,'fixtures')
+        os.makedirs(fixtures)
+        write_csv_files(fixtures,len(symbols))
+        for k,symbol in enumerate(symbols):
+            os.rename(os.path.join(fixtures,'S%03d.csv' % k),os.path.join(fixtures,symbol+'.csv'))
+        server,url = md.serve_fixtures(fixtures,latency=latency,failure_rate=0.1)
+        cache = os.path.join(tmp,'cache')
+        try:
+            options = {'base_url': url, 'fields': ['actual_close','close'], 'backoff': 0.01}
+            run(server,'sequential, no cache',symbols,'2012-10-01','2013-09-30',connections=1,**options)
+            ref = run(server,'concurrent (8 connections), no cache',symbols,'2012-10-01','2013-09-30',**options)
+            data = run(server,'concurrent, cold cache',symbols,'2012-10-01','2013-09-30',cache_dir=cache,**options)
+            run(server,'concurrent, warm cache',symbols,'2012-10-01','2013-09-30',cache_dir=cache,**options)
+            run(server,'concurrent, cache and 2 more years',symbols,'2010-10-01','2013-09-30',cache_dir=cache,**options)
+            same = all(np.array_equal(ref[s][f][1],data[s][f][1]) for s in symbols for f in options['fields'])
+            print('cached prices identical to the downloaded ones: %s' % same)
+        finally:
+            server.shutdown()
+            server.server_close()
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05)
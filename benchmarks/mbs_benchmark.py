@@ -0,0 +1,70 @@
+'''projection of 10,000 pass-through pools x 360 months with mbs_engine.project_pools
+    against the month-by-month loop of the original MBS.py, run pool after pool
+usage: python benchmarks/mbs_benchmark.py [pools]   (default 10000)
+'''
+
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets.mbs_engine import project_pools
+
+#original MBS.py loop for one pool (rates in decimal), returns PV_PO, PV_IO, average_life, average_IO_life
+def project_pool_loop(initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r):
+    PSA_parameter_time=[1,30,240]
+    PSA_parameter_rate=[0.002,0.06,0.06]
+    month=np.zeros(terms)
+    monthly_interest_passed=np.zeros(terms)
+    total_principal_repayment=np.zeros(terms)
+    ending_balance=np.zeros(terms)
+    for i in range(terms):
+        month[i]=i+1
+        if i+seasoning < PSA_parameter_time[1]:
+            CPR=PSA_parameter_rate[0]+(month[i]+seasoning-PSA_parameter_time[0])*(PSA_parameter_rate[1]-PSA_parameter_rate[0])/(PSA_parameter_time[1]-PSA_parameter_time[0])
+        else:
+            CPR=PSA_parameter_rate[1]+(month[i]+seasoning-PSA_parameter_time[1])*(PSA_parameter_rate[2]-PSA_parameter_rate[1])/(PSA_parameter_time[2]-PSA_parameter_time[1])
+        CPR *= multiplier
+        beginning_balance = ending_balance[i-1] if i>0 else initial_balance
+        monthly_payment=beginning_balance*(mortgage_rate/12.)/(1.0-(1.0+(mortgage_rate/12.0))**(-(terms-seasoning-month[i]+1.0)))
+        monthly_interest_paid=mortgage_rate*beginning_balance/12.
+        monthly_interest_passed[i]=monthly_interest_paid*passthrough_rate/mortgage_rate
+        scheduled_principal_repayment=monthly_payment-monthly_interest_paid
+        prepayment=(beginning_balance-scheduled_principal_repayment)*(1.0-(1.0-CPR)**(1./12.))
+        total_principal_repayment[i]=scheduled_principal_repayment+prepayment
+        ending_balance[i]=beginning_balance-total_principal_repayment[i]
+    TP=total_principal_repayment.sum()
+    TI=monthly_interest_passed.sum()
+    discount=(1.0+r/12.0)**month
+    return ((total_principal_repayment/discount).sum(),(monthly_interest_passed/discount).sum(),
+            (month*total_principal_repayment).sum()/12./TP,(month*monthly_interest_passed).sum()/12./TI)
+
+def main(M):
+    rng = np.random.RandomState(0)
+    balance = rng.uniform(1e5,1e6,M)
+    rate = rng.uniform(0.03,0.07,M)
+    passthrough = rate-0.005
+    multiplier = rng.uniform(0.5,3.0,M)
+    r = 0.035
+
+    t0 = time.time()
+    res = project_pools(balance,rate,passthrough,0,360,multiplier,r,cash_flows=False)
+    t_agg = time.time()-t0
+    t0 = time.time()
+    project_pools(balance,rate,passthrough,0,360,multiplier,r)
+    t_all = time.time()-t0
+
+    M_loop = min(M,100)
+    t0 = time.time()
+    loop = np.array([project_pool_loop(balance[k],rate[k],passthrough[k],0,360,multiplier[k],r) for k in range(M_loop)])
+    t_loop = (time.time()-t0)*M/float(M_loop)
+    vec = np.array([res['PV_PO'],res['PV_IO'],res['average_life'],res['average_IO_life']]).T[:M_loop]
+
+    print('%d pools x 360 months' % M)
+    print('month-by-month loop:              %8.3f s (extrapolated from %d pools)' % (t_loop,M_loop))
+    print('vectorized, aggregates only:      %8.3f s' % t_agg)
+    print('vectorized, with the cash flows:  %8.3f s' % t_all)
+    print('max relative difference:          %8.1e' % np.max(np.abs(vec/loop-1)))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
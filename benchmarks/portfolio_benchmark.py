@@ -0,0 +1,41 @@
+'''rolling beta, Jensen's alpha, R-squared and Sharpe ratio of many portfolios over 10 years of daily returns with
+portfolio_analytics.rolling_statistics, against a least-squares refit per window (timed on a few portfolios and scaled)
+usage: python benchmarks/portfolio_benchmark.py [portfolios] [window]   (default 1000 portfolios, 252-day windows)
+'''
+
+from __future__ import print_function
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import portfolio_analytics as pa
+
+def main(portfolios,window):
+    days = 10*252
+    tickers = 500
+    rng = np.random.RandomState(0)
+    market = rng.normal(3e-4,0.01,days)
+    returns = rng.uniform(0.5,1.5,tickers)*market[:,np.newaxis]+rng.normal(0.0,0.015,(days,tickers))
+    prices = 50.0*np.vstack([np.ones(tickers),np.cumprod(1.0+returns,axis=0)])
+    holdings = rng.randint(0,1000,(portfolios,tickers))*(rng.rand(portfolios,tickers) < 0.05)
+    Rf = (1.+0.0025)**(1./252.)-1.
+
+    t0 = time.time()
+    y = pa.daily_returns(pa.portfolio_values(holdings,prices))
+    res = pa.rolling_statistics(y,market,window,Rf)
+    t = time.time()-t0
+    print('%d portfolios x %d days, %d-day windows (%d windows each): %.3f s' % (portfolios,days,window,len(res['end']),t))
+
+    sample = 5
+    t0 = time.time()
+    for p in range(sample):
+        for e in res['end']:
+            X = np.column_stack([np.ones(window),market[e-window+1:e+1]-Rf])
+            beta = np.linalg.lstsq(X,y[e-window+1:e+1,p]-Rf,rcond=None)[0]
+    t_refit = (time.time()-t0)*portfolios/float(sample)
+    print('refit per window (least squares, beta and alpha only), estimated: %.1f s' % t_refit)
+    print('speedup: %.0f' % (t_refit/t))
+    print('difference in the beta of the last window of the last portfolio refitted: %.2e' % abs(beta[1]-res['beta'][-1,sample-1]))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000,int(sys.argv[2]) if len(sys.argv) > 2 else 252)
@@ -0,0 +1,49 @@
+'''cold-start load of the local price store (price_store.py): all the fields of S&P 500-like symbols over 16 years
+usage: python benchmarks/price_store_benchmark.py [symbols]   (default 500 symbols, synthetic CSV files in a temporary directory)
+'''
+
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import price_store as ps
+
+#synthetic Yahoo-like CSV files (Date,Open,High,Low,Close,Volume,Adj Close, most recent date first)
+def write_csv_files(directory,symbols,start='1997-01-01',end='2013-10-01'):
+    rng = np.random.RandomState(0)
+    days = np.arange(np.datetime64(start),np.datetime64(end))
+    days = days[np.is_busday(days)]
+    for k in range(symbols):
+        d = days[rng.randint(0,250):]
+        close = 100.0*np.exp(np.cumsum(rng.normal(0.0,0.02,len(d))))
+        with open(os.path.join(directory,'S%03d.csv' % k),'w') as f:
+            f.write('Date,Open,High,Low,Close,Volume,Adj Close\n')
+            f.write(''.join('%s,%.2f,%.2f,%.2f,%.2f,%d,%.2f\n' % (t,c,c*1.01,c*0.99,c,1000000,c*0.95) for t,c in zip(d[::-1],close[::-1])))
+    return days
+
+def main(symbols):
+    tmp = tempfile.mkdtemp()
+    try:
+        csv_dir = os.path.join(tmp,'csv')
+        store_dir = os.path.join(tmp,'store')
+        os.makedirs(csv_dir)
+        write_csv_files(csv_dir,symbols)
+        t0 = time.time()
+        ps.ingest(csv_dir,store_dir)
+        print('%d symbols: ingest %.2f s (once)' % (symbols,time.time()-t0))
+
+        t0 = time.time()
+        store = ps.PriceStore(store_dir)
+        days = store.trading_days('1997-01-01','2013-10-01')
+        data = dict((field,store.load(field,days,store.symbols)) for field in ps.fields)
+        t = time.time()-t0
+        print('cold-start load of %d fields (%d dates x %d symbols): %.3f s' % (len(data),len(days),len(store.symbols),t))
+        t0 = time.time()
+        ps.fill_missing(data['close'])
+        print('fill of the missing prices (ffill, bfill): %.3f s' % (time.time()-t0))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
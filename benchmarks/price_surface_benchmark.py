@@ -0,0 +1,62 @@
+'''American put quotes served from a price surface (price_surface.py) against a tree per quote: time to build the
+surface, to save and memory-map it, per-quote time of batched and single multilinear and spline queries, interpolation
+errors against direct lattice pricing, and one round of grid refinement
+usage: python benchmarks/price_surface_benchmark.py [periods] [tol]   (default 100-period trees, tolerance 0.002)
+'''
+
+from __future__ import print_function
+import os, sys, time, shutil, tempfile
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import price_surface as ps
+from financial_markets.implied import lattice_option_prices
+
+def main(N,tol):
+    grid = ps.default_grid()
+    grid['r'] = np.array([0.0,0.04,0.08])
+    grid['c'] = np.array([0.0,0.03])
+    t0 = time.time()
+    surface = ps.build_surface(grid,-1,N)
+    print('build %s grid (%d trees of %d periods): %.1f s' % ('x'.join(map(str,surface.shape())),surface.prices.size,N,time.time()-t0))
+
+    tmp = tempfile.mkdtemp()
+    try:
+        surface.save(tmp)
+        t0 = time.time()
+        surface = ps.load_surface(tmp)
+        print('load (memory-mapped): %.1f ms' % ((time.time()-t0)*1e3))
+
+        quotes = 100000
+        rng = np.random.RandomState(1)
+        S0 = rng.uniform(60.0,140.0,quotes)
+        T = rng.uniform(0.1,2.0,quotes)
+        sigma = rng.uniform(0.1,0.6,quotes)
+        r = rng.uniform(0.0,0.08,quotes)
+        c = rng.uniform(0.0,0.03,quotes)
+        for method in ps.methods:
+            t0 = time.time()
+            surface.price(S0,100.0,T,r,c,sigma,method)
+            t_batch = (time.time()-t0)/quotes
+            t0 = time.time()
+            for k in range(1000):
+                surface.price(S0[k],100.0,T[k],r[k],c[k],sigma[k],method)
+            t_single = (time.time()-t0)/1000.
+            print('%-7s query: %6.2f us per quote in a batch of %d, %6.1f us for a single quote' % (method,t_batch*1e6,quotes,t_single*1e6))
+        t0 = time.time()
+        for k in range(100):
+            lattice_option_prices(S0[k:k+1],100.0,T[k:k+1],r[k:k+1],c[k:k+1],sigma[k:k+1],-1,True,N)
+        print('tree per quote: %.1f us per quote' % ((time.time()-t0)/100.*1e6))
+
+        for method in ps.methods:
+            res = ps.validate(surface,method=method)
+            print('%-7s errors per unit of strike: max %.1e, p99 %.1e, mean %.1e' % (method,res['max'],res['p99'],res['mean']))
+        t0 = time.time()
+        refined = ps.refine(surface,tol,rounds=1)
+        print('one refinement round to %g: %s grid in %.1f s, max error %.1e' %
+              (tol,'x'.join(map(str,refined.shape())),time.time()-t0,refined.errors['linear_max']))
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,float(sys.argv[2]) if len(sys.argv) > 2 else 0.002)
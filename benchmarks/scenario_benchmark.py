@@ -0,0 +1,32 @@
+'''scaling of rate_scenarios.run_scenarios with the number of worker processes
+usage: python benchmarks/scenario_benchmark.py [scenarios]   (default about 2000 scenarios)
+'''
+
+from __future__ import print_function
+import os, sys, time, multiprocessing
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+from financial_markets import rate_scenarios as rs
+
+def main(M):
+    n = max(1,int(round((M/5.)**0.25)))
+    scenarios = rs.scenario_grid(np.linspace(1.05,1.2,n),np.linspace(0.8,0.95,n),np.linspace(0.01,0.06,n),np.linspace(0.03,0.06,n),[10,50,100,200,500])
+    processes = [1]
+    while processes[-1]*2 <= multiprocessing.cpu_count():
+        processes.append(processes[-1]*2)
+    if processes[-1] != multiprocessing.cpu_count():
+        processes.append(multiprocessing.cpu_count())
+
+    print('%d scenarios, %d cores' % (len(scenarios),multiprocessing.cpu_count()))
+    print('%10s %12s %12s %10s' % ('processes','time (s)','scen./s','speedup'))
+    for p in processes:
+        t0 = time.time()
+        rs.run_scenarios(scenarios,processes=p)
+        t = time.time()-t0
+        if p == 1:
+            t1 = t
+        print('%10d %12.3f %12.0f %10.2f' % (p,t,len(scenarios)/t,t1/t))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
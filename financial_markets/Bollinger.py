@@ -8,48 +8,55 @@ to create these stock data, run: /usr/local/lib/python2.7/site-packages/QSTK/qst
 after creating a file symbols.txt in the directory you currently are
 then move the created .csv files into the QSData/Yahoo/ directory
 
+The data can also be read from a local price store (see price_store.py, PRICE_STORE environment variable)
+
 The output of the program is in the Bollinger.png figure (only for the 1st stock requested)
-The code also prints the Bollinger values for the requested sticks
-at the requested dates
+The code also writes the Bollinger values for the requested stocks
+at the requested dates in Bollinger.csv
 '''
 
-# QSTK Imports
-import QSTK.qstkutil.qsdateutil as du
-import QSTK.qstkutil.tsutil as tsu
-import QSTK.qstkutil.DataAccess as da
-# Third Party Imports
+# Third Party Imports (QSTK, pandas and matplotlib are imported by the functions that use them)
 import datetime as dt
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
-import math
+from financial_markets.price_store import PriceStore, store_path
+from financial_markets.results import ResultsWriter
 
 def moving_average(a, n=3):
     ret = np.cumsum(a, dtype=float)
     ret[n:] -= ret[:-n]
     return ret[n - 1:] / n
 
-def simulate(startdate,enddate,ls_symbols):
-
+def simulate(startdate,enddate,ls_symbols,output='Bollinger.csv'):
+    # output: file receiving the Bollinger values (CSV, Parquet or .npy, see results.py), None for no output
+    # (the prices are pandas DataFrames)
     timeofday = dt.timedelta(hours=16)
-    tradingdays = du.getNYSEdays(startdate,enddate,timeofday)
-    dataobj = da.DataAccess('Yahoo',cachestalltime=0)
+    #local price store (see price_store.py), or QSTK and its local copy of Yahoo data
+    if store_path:
+        dataobj = PriceStore(store_path)
+        tradingdays = dataobj.trading_days(startdate,enddate,timeofday)
+    else:
+        import QSTK.qstkutil.qsdateutil as du
+        import QSTK.qstkutil.DataAccess as da
+        tradingdays = du.getNYSEdays(startdate,enddate,timeofday)
+        dataobj = da.DataAccess('Yahoo',cachestalltime=0)
     df_data = dataobj.get_data(tradingdays,ls_symbols,"close")
-    df_data = df_data.fillna(method='ffill')
-    df_data = df_data.fillna(method='bfill')
-    df_data = df_data.fillna(1.0)
-    fDev  = pd.rolling_std(df_data,20,min_periods=20)
-    fMean = pd.rolling_mean(df_data,20,min_periods=20)
+    df_data = df_data.ffill().bfill().fillna(1.0)
+    fDev  = df_data.rolling(20,min_periods=20).std()
+    fMean = df_data.rolling(20,min_periods=20).mean()
     Bollinger=(df_data-fMean)/fDev
     
-    for ntime in np.arange(len(tradingdays)):
-        print Bollinger.index[ntime],Bollinger.values[ntime]
+    if output is not None:
+        with ResultsWriter(output,['date']+list(ls_symbols)) as writer:
+            table = dict((sym,Bollinger[sym].values) for sym in ls_symbols)
+            table['date'] = np.asarray(Bollinger.index)
+            writer.write(table)
     
     return (Bollinger,df_data)
 
 
 def main():
     ''' Main Function'''
+    import matplotlib.pyplot as plt
 
     # List of symbols
     ls_symbols = ['AAPL','GOOG','IBM','MSFT']
@@ -0,0 +1,57 @@
+''' program to price pass-through mortgage-backed securities
+the monthly cash flows are written to MBS.csv '''
+
+from __future__ import print_function
+from financial_markets.mbs_engine import project_pools
+from financial_markets.results import ResultsWriter
+
+#example run: cash flows and values of a pass-through pool, written to MBS.csv and printed
+def main():
+    initial_balance = 417000. #initial mortgage balance  (USD)
+    mortgage_rate = 4.75      #annualized mortgage rate in %
+    passthrough_rate = 4.75   #annualized pass-through rate in %
+    seasoning=0               #how old is the mortgage pool (in months)
+    terms=360                 #term of loan in months
+    multiplier=100            #multiplier for PSA prepayment model (in percent)
+    PSA_parameter_time=[1,30,240]
+    PSA_parameter_rate=[0.2,6.,6.] #CPR (constant prepayment rate) in percent
+
+    mortgage_rate /= 100.
+    passthrough_rate /= 100.
+    multiplier /= 100.
+    for i in range(3):
+        PSA_parameter_rate[i] /= 100.
+
+    r=3.5     #risk free interest rate in percent
+    r /=100.
+
+    #cash flows of the pool (one row of the arrays returned by project_pools)
+    pool = project_pools(initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r,
+                         PSA_parameter_time=PSA_parameter_time,PSA_parameter_rate=PSA_parameter_rate)
+    month = pool['month']
+    monthly_payment = pool['monthly_payment'][0]
+    monthly_interest_paid = pool['monthly_interest_paid'][0]
+    scheduled_principal_repayment = pool['scheduled_principal_repayment'][0]
+    ending_balance = pool['ending_balance'][0]
+
+    PV_PO = pool['PV_PO'][0] #present value of principal only MBS based on this passthrough mortgage
+    PV_IO = pool['PV_IO'][0] #present value of interest only
+
+    average_life = pool['average_life'][0]
+    average_IO_life = pool['average_IO_life'][0]
+
+    #monthly cash flows written in bulk to MBS.csv (or .parquet, .npy), the other columns of project_pools can be added
+    #(CPR, SMM, beginning_balance, monthly_interest_passed, prepayment, total_principal_repayment)
+    with ResultsWriter('MBS.csv',['month','monthly_payment','monthly_interest_paid','scheduled_principal_repayment','ending_balance']) as writer:
+        writer.write({'month': month, 'monthly_payment': monthly_payment, 'monthly_interest_paid': monthly_interest_paid,
+                      'scheduled_principal_repayment': scheduled_principal_repayment, 'ending_balance': ending_balance})
+
+
+    print('average MBS life',average_life)
+    print('Present value of PO (principal only) MBS:',PV_PO)
+    print('Present value of IO (interest only) MBS:',PV_IO)
+    print('average IO life',average_IO_life)
+
+
+if __name__ == '__main__':
+    main()
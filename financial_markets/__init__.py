@@ -0,0 +1,5 @@
+'''codes to analyze financial markets: derivatives and mortgage-backed securities pricing, technical analysis of stocks,
+event studies, portfolio analytics
+the modules are imported one by one (e.g. from financial_markets import derivative_pricing as dp): importing the
+package imports none of them
+'''
@@ -0,0 +1,76 @@
+'''closed-form Black-Scholes prices and Greeks of European options on stocks (with dividend yield)
+    and on futures contracts (Black model), vectorized over arrays of contracts
+'''
+
+import numpy as np
+
+#generalized Black-Scholes model with cost of carry b (b=r-c for a stock with dividend yield c, b=0 for a futures contract)
+def generalized_black_scholes(S0,K,T,r,b,sigma,cp):
+    #S0 is the price of the underlying asset at t=0
+    #K=strike price
+    #T is time to expiration (in years)
+    #r is risk free interest rate
+    #b is the cost of carry
+    #sigma is the volatility of the underlying asset
+    #cp: 1 for call, -1 for put
+    #all the arguments are scalars or arrays broadcast against each other
+    #returns a dictionary of arrays: price, delta, gamma, vega (per unit of volatility), theta (per year) and
+    #rho (per unit of interest rate, for a stock: see black_scholes_greeks and black_greeks for the futures case)
+    from scipy.special import ndtr #cumulative distribution function of the standard normal distribution
+    S0,K,T,r,b,sigma,cp = np.broadcast_arrays(*[np.asarray(x,dtype=float) for x in (S0,K,T,r,b,sigma,cp)])
+    sqrtT = np.sqrt(T)
+    carry = np.exp((b-r)*T) #discount of the underlying asset (dividends)
+    discount = np.exp(-r*T) #discount of the strike
+    with np.errstate(divide='ignore',invalid='ignore'):
+        d1 = (np.log(S0/K)+(b+0.5*sigma**2)*T)/(sigma*sqrtT)
+        d2 = d1-sigma*sqrtT
+        N1 = ndtr(cp*d1)
+        N2 = ndtr(cp*d2)
+        n1 = np.exp(-0.5*d1**2)/np.sqrt(2.0*np.pi) #standard normal density at d1
+        greeks = {}
+        greeks['price'] = cp*(S0*carry*N1-K*discount*N2)
+        greeks['delta'] = cp*carry*N1
+        greeks['gamma'] = carry*n1/(S0*sigma*sqrtT)
+        greeks['vega'] = S0*carry*n1*sqrtT
+        greeks['theta'] = -S0*carry*n1*sigma/(2.0*sqrtT)-cp*(b-r)*S0*carry*N1-cp*r*K*discount*N2
+        greeks['rho'] = cp*K*T*discount*N2
+
+    #at expiration (or for a zero volatility) the option is worth its discounted forward intrinsic value
+    expired = (T <= 0) | (sigma <= 0)
+    if np.any(expired):
+        forward = cp*(S0*carry-K*discount)
+        itm = (forward > 0)
+        greeks['price'] = np.where(expired,np.maximum(forward,0),greeks['price'])
+        greeks['delta'] = np.where(expired,np.where(itm,cp*carry,0.),greeks['delta'])
+        greeks['rho'] = np.where(expired,np.where(itm,cp*K*T*discount,0.),greeks['rho'])
+        for greek in ('gamma','vega','theta'):
+            greeks[greek] = np.where(expired,0.,greeks[greek])
+
+    return greeks
+
+#European option on a stock paying a continuous dividend yield c
+def black_scholes_greeks(S0,K,T,r,c,sigma,cp):
+    #c is dividend yield
+    #see generalized_black_scholes for the other arguments and the returned Greeks
+    return generalized_black_scholes(S0,K,T,r,np.subtract(r,c),sigma,cp)
+
+def black_scholes_price(S0,K,T,r,c,sigma,cp):
+    return black_scholes_greeks(S0,K,T,r,c,sigma,cp)['price']
+
+#European option on a futures contract (Black model)
+def black_greeks(F0,K,T,r,sigma,cp):
+    #F0 is the futures price at t=0
+    #see generalized_black_scholes for the other arguments and the returned Greeks
+    greeks = generalized_black_scholes(F0,K,T,r,0.0,sigma,cp)
+    greeks['rho'] = -np.asarray(T,dtype=float)*greeks['price'] #the futures price is held fixed when the rate moves
+    return greeks
+
+def black_price(F0,K,T,r,sigma,cp):
+    return black_greeks(F0,K,T,r,sigma,cp)['price']
+
+#volatility of the underlying asset implied by the up and down factors of a binomial tree calibrated by Black-Scholes
+#(u=exp(sigma*sqrt(deltaT)), d=1/u), None if the tree is not calibrated that way
+def lattice_volatility(u,d,deltaT):
+    if abs(u*d-1.0) > 1e-12:
+        return None
+    return np.log(u)/np.sqrt(deltaT)
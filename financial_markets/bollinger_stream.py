@@ -0,0 +1,78 @@
+''' streaming Bollinger values for live ticks of many symbols: O(1) work per symbol and tick
+the value is the one of Bollinger.simulate, (price-mean)/std over the last window prices (std with n-1, as
+DataFrame.rolling(window).std()), NaN until window prices have been seen
+every symbol keeps a ring buffer of its last window prices with the running mean and sum of squared deviations
+(M2), updated with Welford's recurrences (adding the new price and dropping the oldest one) rather than with running
+sums of x and x**2, whose difference loses the digits of the variance when the prices are large; the statistics are
+recomputed exactly from the buffers every resync ticks so that the rounding errors do not accumulate
+'''
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+#Bollinger values of a whole history (dates x symbols), as Bollinger.simulate
+def bollinger_values(prices,window=20):
+    prices = np.asarray(prices,dtype=float)
+    res = np.full(prices.shape,np.nan)
+    if len(prices) >= window:
+        windows = as_strided(prices,shape=(len(prices)-window+1,window)+prices.shape[1:],
+                             strides=(prices.strides[0],)+prices.strides)
+        mean = windows.mean(axis=1)
+        std = windows.std(axis=1,ddof=1)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            res[window-1:] = (prices[window-1:]-mean)/std
+    return res
+
+class BollingerStream(object):
+
+    #history: past prices (dates x symbols, with no missing prices), the last window dates seed the buffers
+    #(an array with 0 rows to start empty); resync: number of ticks between exact recomputations (None for never)
+    def __init__(self,history,window=20,resync=1000):
+        history = np.asarray(history,dtype=float)
+        self.window = window
+        self.resync = resync
+        self.symbols = history.shape[1]
+        last = history[len(history)-min(len(history),window):]
+        self.buffer = np.zeros((window,self.symbols))
+        self.buffer[:len(last)] = last
+        self.count = np.full(self.symbols,len(last),dtype=int)
+        self.pos = self.count%window #slot of the next price (the oldest price once the buffer is full)
+        self.mean = last.mean(axis=0) if len(last) else np.zeros(self.symbols)
+        self.M2 = ((last-self.mean)**2).sum(axis=0)
+        self.ticks = 0
+
+    #new prices for all the symbols, or for the symbols of the indices columns (each at most once); returns their
+    #Bollinger values
+    def update(self,prices,columns=None):
+        if columns is None:
+            columns = np.arange(self.symbols)
+        columns = np.asarray(columns)
+        x = np.asarray(prices,dtype=float)
+        count = self.count[columns]
+        pos = self.pos[columns]
+        mean = self.mean[columns]
+        full = count >= self.window
+        old = np.where(full,self.buffer[pos,columns],0.0)
+        n = np.minimum(count+1,self.window)
+        delta = np.where(full,x-old,x-mean)
+        new_mean = mean+delta/n
+        #window full: M2 += (x-old)*(x-new_mean+old-mean); filling: M2 += (x-mean)*(x-new_mean)
+        self.M2[columns] += delta*(x-new_mean+np.where(full,old-mean,0.0))
+        self.mean[columns] = new_mean
+        self.buffer[pos,columns] = x
+        self.pos[columns] = (pos+1)%self.window
+        self.count[columns] = n
+
+        self.ticks += 1
+        if self.resync is not None and self.ticks%self.resync == 0:
+            self.recompute()
+            new_mean = self.mean[columns]
+        with np.errstate(divide='ignore',invalid='ignore'):
+            std = np.sqrt(np.maximum(self.M2[columns],0.0)/(n-1))
+            return np.where(n >= self.window,(x-new_mean)/std,np.nan)
+
+    #exact mean and M2 of the symbols with a full buffer
+    def recompute(self):
+        full = self.count >= self.window
+        self.mean[full] = self.buffer[:,full].mean(axis=0)
+        self.M2[full] = ((self.buffer[:,full]-self.mean[full])**2).sum(axis=0)
@@ -0,0 +1,530 @@
+'''code to price derivatives on securities and fixed income assets (options, futures, swaps, caplets, floorlets, etc...) using binomial model
+    with calibration performed by Black Scholes model
+'''
+
+from __future__ import print_function
+import numpy as np
+import math
+from financial_markets.black_scholes import black_scholes_price, black_scholes_greeks, black_price, lattice_volatility
+
+#compute stock prices tree
+def stock_price_lattice(u,d,N,S0,packed=False):
+    #S0 is initial price of security
+    #N is the number of periods in the binomial model
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #packed: store only the (N+1)(N+2)/2 nodes (i,j) with j<=i, row after row, and return their row function
+    #(see packed_lattice_rows), which the pricers accept in place of the (N+1)x(N+1) lattice
+    stkval = lattice_nodes(u,d,S0,*lattice_indices(N,packed)) #stock value
+    return packed_lattice_rows(stkval) if packed else stkval
+
+#times i and states j of the nodes of an N-period lattice: all (N+1)x(N+1) pairs, or only the valid nodes j<=i (packed)
+def lattice_indices(N,packed=False):
+    if packed:
+        return np.tril_indices(N+1)
+    return np.ogrid[0:N+1,0:N+1]
+
+#value x0*u**(i-j)*d**j of a recombining lattice at the nodes (i,j), computed in log space (zero for j>i)
+def lattice_nodes(u,d,x0,i,j):
+    return np.where(j<=i,x0*np.exp((i-j)*np.log(u)+j*np.log(d)),0.0)
+
+#row function (see lattice_row) of a packed lattice, with the packed nodes in its attribute nodes
+def packed_lattice_rows(packed):
+    row = lambda i: packed[i*(i+1)//2:(i+1)*(i+2)//2]
+    row.nodes = packed
+    return row
+
+#(N+1)x(N+1) lattice of a packed lattice (the packed nodes or their row function)
+def unpack_lattice(packed):
+    packed = getattr(packed,'nodes',packed)
+    N = int(round((np.sqrt(8*len(packed)+1)-3)/2))
+    lattice = np.zeros((N+1,N+1))
+    lattice[np.tril_indices(N+1)] = packed
+    return lattice
+
+#stock prices (or short rates) at the nodes of time i, computed on demand instead of storing the (N+1)x(N+1) lattice
+def lattice_rows(u,d,x0):
+    #x0 is the value at t=0 (initial price of security, or short rate)
+    #the returned function of i can be used wherever a lattice is expected (see lattice_row)
+    #u, d and x0 may be arrays of shape (M,1) to generate the nodes of M trees at once
+    #the last row is remembered: going back one period (as in backward_induction) only divides it by u
+    logu,logd = np.log(u),np.log(d)
+    last = {}
+    def row(i):
+        if last.get('i') == i:
+            return last['row']
+        if last.get('i') == i+1:
+            val = last['row'][...,:i+1]/u
+        else:
+            j = np.arange(i+1)
+            val = x0*np.exp((i-j)*logu+j*logd) #log-space, one exponential per node
+        last['i'],last['row'] = i,val
+        return val
+    return row
+
+
+#values taken at the nodes of time i by a quantity that is either a scalar, a lattice,
+#a dictionary of time slices (as returned by backward_induction with keep) or a function of i
+#(other arrays are the same at every time: packed lattices are read through their row function, see packed_lattice_rows)
+def lattice_row(x,i):
+    if callable(x):
+        return x(i)
+    if isinstance(x,dict):
+        return x[i]
+    if np.ndim(x)==2:
+        return x[i,:i+1]
+    return x
+
+#backward induction on a recombining binomial lattice, rolling a whole time slice at once
+def backward_induction(terminal,q,discount=1.0,pre=0.0,post=0.0,survival=1.0,exercise=None,name=None,first=0,keep=None,trace=None):
+    #terminal are the N+1 values at maturity t=N
+    #q is the risk-neutral probability of an up move
+    #discount is the one-period discount factor dividing the expectation (e.g. exp(r*deltaT), or 1+shrval for a short-rate lattice)
+    #pre is the cash flow received at a node and discounted with the expectation (e.g. floating-fixed of a swap paid in arrears)
+    #post is the cash flow received at a node after discounting (e.g. coupon of a bond)
+    #survival is the probability of no default over the next period (the recovery goes into pre)
+    #exercise is the value of exercising at a node (American options), None if there is no early exercise
+    #name is the label of the nodes where early exercise is optimal in the trace
+    #trace: None, or an ExerciseTrace (see results.py) recording the nodes where early exercise is optimal
+    #first is the earliest time at which pre, post and exercise apply (at earlier times the expectation is only discounted)
+    #discount, pre, post, survival and exercise are either scalars, lattices with at least N+1 rows or functions of i (see lattice_row)
+    #keep: None to return the full (N+1)x(N+1) lattice, otherwise the times whose slices are returned in a dictionary {i: values at time i}
+    #      (e.g. keep=[0] when only the price at t=0 is needed): only one time slice is held, so memory is O(N)
+    #terminal may carry leading axes (e.g. one row per contract), in which case q and the values of discount, pre, post, survival
+    #and exercise broadcast against the time slices of shape (...,i+1) (per-contract arrays other than q must then be passed as
+    #functions of i, since 2-D arrays are read as lattices)
+    N = np.shape(terminal)[-1]-1
+    val = np.array(terminal,dtype=float)
+    if keep is None:
+        lattice = np.zeros(val.shape[:-1]+(N+1,N+1))
+        lattice[...,N,:] = val
+    else:
+        keep = set(keep)
+        slices = {}
+        if N in keep:
+            slices[N] = val
+    for i in range(N-1,-1,-1):
+        expect = q*val[...,:i+1]+(1-q)*val[...,1:i+2]
+        if i < first:
+            val = expect/lattice_row(discount,i)
+        else:
+            val = expect #the default (no default risk, no cash flow) terms are skipped
+            if not (np.isscalar(survival) and survival == 1.0):
+                val = lattice_row(survival,i)*val
+            if not (np.isscalar(pre) and pre == 0.0):
+                val = lattice_row(pre,i)+val
+            val = val/lattice_row(discount,i)
+            if not (np.isscalar(post) and post == 0.0):
+                val = val+lattice_row(post,i)
+            if exercise is not None:
+                payoff = lattice_row(exercise,i)
+                if trace is not None:
+                    trace.record(name,i,payoff >= val,val,payoff)
+                val = np.maximum(val,payoff)
+        if keep is None:
+            lattice[...,i,:i+1] = val
+        elif i in keep:
+            slices[i] = val
+    if keep is None:
+        return lattice
+    return slices
+
+
+#compute futures lattice:
+def futures_price_lattice(u,d,N,T,r,c,stkval,keep=None):
+    #S0 is initial price of security
+    #r is risk free interest rate
+    #N is number of periods
+    #T is time
+    #c is dividend yield
+    #stkval is price lattice of underlying asset (stock), or its row function (see lattice_row and stock_price_lattice(...,packed=True))
+    #keep: times to return instead of the full lattice (see backward_induction)
+
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+
+    futval = backward_induction(lattice_row(stkval,N),q,keep=keep) #futures contract value
+
+    return futval
+
+#compute option prices tree
+def option_price_lattice(u,d,N,T,r,c,cp,am,stkval,K,keep=None,closed_form=False,trace=None):
+    #r is risk free interest rate
+    #N is number of periods
+    #T is time
+    #c is dividend yield
+    #stkval is price lattice of underlying asset (stock), or its row function (see lattice_row and stock_price_lattice(...,packed=True))
+    #N is the number of periods in the binomial model
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #cp: 1 for call, -1 for put
+    #am: True for American option, False for European
+    #K=strike price
+    #keep: times to return instead of the full lattice (see backward_induction)
+    #closed_form: True to return the Black-Scholes price instead of rolling back the tree when only the price at t=0
+    #             of a European option is requested (keep=[0]) on a tree calibrated by Black-Scholes (d=1/u); off by
+    #             default so that keep=[0] gives the binomial price at t=0 of the full lattice
+    #trace: ExerciseTrace recording the early-exercise nodes of American options (see results.py), None for no trace
+    
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+
+    sigma = lattice_volatility(u,d,deltaT)
+    if closed_form and not am and keep is not None and set(keep)==set([0]) and sigma is not None:
+        return {0: np.array([black_scholes_price(lattice_row(stkval,0)[0],K,T,r,c,sigma,cp)])}
+
+    payoff = lambda i: cp*(lattice_row(stkval,i)-K)
+    exercise = payoff if am else None
+    optval = backward_induction(np.maximum(0,payoff(N)),q,np.exp(r*deltaT),exercise=exercise,name='option on stock',keep=keep,trace=trace) #option on stock value
+
+    return optval
+
+#compute the prices at t=0 of a batch of options on the same stock price tree
+def option_price_batch(u,d,N,T,r,c,cp,am,stkval,K,closed_form=True):
+    #stkval is price lattice of underlying asset (stock), shared by all the contracts
+    #T, r, c, cp, am and K are scalars or arrays (one value per contract) that are broadcast against each other
+    #T is time, r is risk free interest rate, c is dividend yield
+    #cp: 1 for call, -1 for put
+    #am: True for American option, False for European
+    #K=strike price
+    #closed_form: price the European contracts with Black-Scholes when the tree is calibrated by Black-Scholes (d=1/u)
+    #the other contracts are rolled back together along an extra contract axis: returns an array of option prices at t=0
+    T,r,c,cp,am,K = [np.asarray(x,dtype=float) for x in np.broadcast_arrays(T,r,c,cp,am,K)]
+    prices = np.zeros(T.shape)
+    tree = (am > 0) #contracts priced on the tree
+
+    sigma = lattice_volatility(u,d,T/float(N))
+    if closed_form and sigma is not None:
+        euro = ~tree
+        prices[euro] = black_scholes_price(lattice_row(stkval,0)[0],K[euro],T[euro],r[euro],c[euro],sigma[euro],cp[euro])
+    else:
+        tree[...] = True
+    if not np.any(tree):
+        return prices
+
+    T,r,c,cp,am,K = [x[tree][:,np.newaxis] for x in (T,r,c,cp,am,K)]
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+
+    optval = batch_option_induction(stkval,K,cp,am,q,np.exp(r*deltaT),N,keep=[0])
+    prices[tree] = optval[0][:,0]
+
+    return prices
+
+#backward induction of a batch of options on stocks, one contract per row
+def batch_option_induction(stkval,K,cp,am,q,discount,N,keep=[0]):
+    #stkval is the price lattice of the stock (or its row function), common to the contracts or with one row per contract
+    #K, cp, am, q and discount (one-period discount factor) are arrays of shape (M,1), one row per contract
+    #keep: times to return (see backward_induction)
+    payoff = lambda i: cp*(lattice_row(stkval,i)-K)
+    exercise = None
+    if np.all(am):
+        exercise = payoff
+    elif np.any(am):
+        exercise = lambda i: np.where(am>0,payoff(i),-np.inf) #European contracts are never exercised early
+    #the per-contract discount is passed as a function so it is not taken for a lattice
+    return backward_induction(np.maximum(0,payoff(N)),q,lambda i: discount,exercise=exercise,keep=keep)
+
+#delta, gamma and theta at t=0 read from the nodes at t=1 and t=2 of an option lattice
+def lattice_greeks(optval,stkval,deltaT):
+    #optval is the option lattice, stkval is price lattice of underlying asset (stock)
+    #both are lattices, dictionaries of time slices (at least keep=[0,1,2]) or functions of i, possibly with a leading contract axis
+    #deltaT is the length of a period
+    #theta assumes a recombining tree calibrated by Black-Scholes (d=1/u) so that the middle node at t=2 has the stock price at t=0
+    V0,V1,V2 = [lattice_row(optval,i) for i in range(3)]
+    S1,S2 = [lattice_row(stkval,i) for i in range(1,3)]
+    greeks = {}
+    greeks['price'] = V0[...,0]
+    greeks['delta'] = (V1[...,0]-V1[...,1])/(S1[...,0]-S1[...,1])
+    greeks['gamma'] = ((V2[...,0]-V2[...,1])/(S2[...,0]-S2[...,1])-(V2[...,1]-V2[...,2])/(S2[...,1]-S2[...,2]))/(0.5*(S2[...,0]-S2[...,2]))
+    greeks['theta'] = (V2[...,1]-V0[...,0])/(2.0*deltaT)
+    return greeks
+
+#risk report (price, delta, gamma, theta, vega, rho) of a batch of options from a single rollback
+def option_risk_batch(S0,K,T,r,c,sigma,cp,am,N,dsigma=0.01,dr=0.0001,closed_form=True):
+    #S0 is initial price of security
+    #K=strike price, T is time, r is risk free interest rate, c is dividend yield, sigma is the volatility of the stock
+    #cp: 1 for call, -1 for put
+    #am: True for American option, False for European
+    #S0, K, T, r, c, sigma, cp and am are scalars or arrays (one value per contract) that are broadcast against each other
+    #N is the number of periods of the trees calibrated by Black-Scholes (u=exp(sigma*sqrt(T/N)), d=1/u)
+    #dsigma and dr are the bumps of the central differences giving vega and rho
+    #closed_form: European contracts get their Black-Scholes Greeks
+    #delta, gamma and theta are read from the base tree (see lattice_greeks); the trees bumped in sigma and r are stacked
+    #with the base tree along the contract axis and rolled back in the same pass
+    #returns a dictionary with one array per Greek (vega per unit of volatility, theta per year, rho per unit of rate)
+    S0,K,T,r,c,sigma,cp,am = [np.asarray(x,dtype=float) for x in np.broadcast_arrays(S0,K,T,r,c,sigma,cp,am)]
+    risk = dict((greek,np.zeros(S0.shape)) for greek in ('price','delta','gamma','theta','vega','rho'))
+    tree = (am > 0) #contracts priced on the tree
+    if closed_form:
+        euro = ~tree
+        greeks = black_scholes_greeks(S0[euro],K[euro],T[euro],r[euro],c[euro],sigma[euro],cp[euro])
+        for greek in risk:
+            risk[greek][euro] = greeks[greek]
+    else:
+        tree[...] = True
+    M = np.count_nonzero(tree)
+    if M == 0:
+        return risk
+
+    #scenarios: base, sigma+dsigma, sigma-dsigma, r+dr, r-dr
+    bumps = np.array([[0.,dsigma,-dsigma,0.,0.],[0.,0.,0.,dr,-dr]])
+    S0,K,T,c,cp,am = [np.tile(x[tree],5)[:,np.newaxis] for x in (S0,K,T,c,cp,am)]
+    sig = (sigma[tree][np.newaxis,:]+bumps[0][:,np.newaxis]).reshape(-1,1)
+    rate = (r[tree][np.newaxis,:]+bumps[1][:,np.newaxis]).reshape(-1,1)
+    deltaT = T/float(N)
+    u = np.exp(sig*np.sqrt(deltaT))
+    d = 1.0/u
+    a = np.exp((rate-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+    stkval = lattice_rows(u,d,S0)
+
+    optval = batch_option_induction(stkval,K,cp,am,q,np.exp(rate*deltaT),N,keep=[0,1,2])
+
+    base = dict((i,optval[i][:M]) for i in range(3))
+    greeks = lattice_greeks(base,lambda i: stkval(i)[:M],deltaT[:M,0])
+    prices = optval[0][:,0].reshape(5,M)
+    greeks['vega'] = (prices[1]-prices[2])/(2.0*dsigma)
+    greeks['rho'] = (prices[3]-prices[4])/(2.0*dr)
+    for greek in risk:
+        risk[greek][tree] = greeks[greek]
+
+    return risk
+
+#compute option prices tree with short-rate lattice
+def option_price_lattice2(u,d,N,T,shrval,c,cp,am,stkval,K,keep=None,trace=None):
+    #shrval is the short-rate lattice, or its row function (see lattice_row and short_rate_lattice(...,packed=True))
+    #N is number of periods
+    #T is time
+    #c is dividend yield
+    #stkval is price lattice of underlying asset (stock), or its row function (see lattice_row and stock_price_lattice(...,packed=True))
+    #N is the number of periods in the binomial model
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #cp: 1 for call, -1 for put
+    #am: True for American option, False for European
+    #K=strike price
+    #keep: times to return instead of the full lattice (see backward_induction)
+    #trace: ExerciseTrace recording the early-exercise nodes (see option_price_lattice)
+    
+    q = 0.5
+
+    payoff = lambda i: cp*(lattice_row(stkval,i)-K)
+    exercise = payoff if am else None
+    optval = backward_induction(np.maximum(0,payoff(N)),q,lambda i: 1+lattice_row(shrval,i),exercise=exercise,name='option on stock',keep=keep,trace=trace) #option on stock value
+    
+    return optval
+
+
+#compute option price on futures tree
+def option_on_future_price_lattice(u,d,N,T,r,c,cp,am,N2,futval,K,keep=None,closed_form=False,trace=None):
+    #N2 is the number of periods of the option (the option expires at t=N2*T/N)
+    #keep, closed_form and trace: see option_price_lattice (the closed form is the Black model for options on futures)
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+
+    sigma = lattice_volatility(u,d,deltaT)
+    if closed_form and not am and keep is not None and set(keep)==set([0]) and sigma is not None:
+        return {0: np.array([black_price(lattice_row(futval,0)[0],K,N2*deltaT,r,sigma,cp)])}
+
+    payoff = lambda i: cp*(lattice_row(futval,i)-K)
+    exercise = payoff if am else None
+    optfutval = backward_induction(np.maximum(0,payoff(N2)),q,np.exp(r*deltaT),exercise=exercise,name='option on futures',keep=keep,trace=trace) #options on futures contract value
+
+    return optfutval
+
+
+def short_rate_lattice(u,d,N,r0,packed=False):
+    #N is the number of periods of the lattice
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #r0 is the short rate at t=0
+    #packed: store only the (N+1)(N+2)/2 nodes (i,j) with j<=i, row after row, and return their row function
+    #(see packed_lattice_rows), which the pricers accept in place of the (N+1)x(N+1) lattice
+    shrval = lattice_nodes(u,d,r0,*lattice_indices(N,packed)) #short rate value
+
+    return packed_lattice_rows(shrval) if packed else shrval
+
+#lattice for zero-coupn bond
+def ZCB_lattice(N,face,shrval,keep=None):
+    #keep: times to return instead of the full lattice (see backward_induction)
+    q=0.5
+    zcbval = backward_induction(np.repeat(float(face),N+1),q,lambda i: 1.0+lattice_row(shrval,i),keep=keep) #zero-coupon bond value, face value of coupon at maturity
+
+    return zcbval
+
+#lattice for coupon-bearing bond
+def CB_lattice(N,face,shrval,c,keep=None):
+    #c is the coupon
+    #face is the face value of the bond
+    #N is the time to maturity
+    #shrval is the short-rate lattice in the N-period binomial model, or its row function (see short_rate_lattice(...,packed=True))
+    #keep: times to return instead of the full lattice (see backward_induction)
+    
+    q=0.5
+    cbval = backward_induction(np.repeat(face*(1.0+c),N+1),q,lambda i: 1.0+lattice_row(shrval,i),post=face*c,keep=keep) #coupon-bearing bond value, face value of coupon at maturity+coupon
+    
+    return cbval
+
+
+#price of the forward contract on a coupon-bearing bond (when delivery occurs AFTER a coupon has been paid)
+def forward_on_bond(N,face,Nb,c,u,d,r0):
+    #Nb is the time to maturity of the bond
+    #face is the face value of the bond
+    #c is the coupon of the bond
+    #N is the period at which we take delivery of the underlying asset in the forward contract
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #r0 is the short rate at t=0
+
+    #short rates are computed one time slice at a time and only the needed slices of the bond lattices are kept
+    shrval=lattice_rows(u,d,r0)
+    #zcbval is the value of a zero coupon bond maturing at t=N
+    zcbval=ZCB_lattice(N,1.0,shrval,keep=[0])
+    #cbval2 is the value of a coupon-bearing bond maturing at t=Nb (1 coupon paid at each period)
+    cbval2=CB_lattice(Nb,face,shrval,c,keep=[N])
+    
+    q=0.5
+    #value of bond ex-coupon: we assume we take delivery of asset underlying the forward just AFTER a coupon has been paid
+    bexcouponval = backward_induction(cbval2[N]-face*c,q,lambda i: 1.0+shrval(i),keep=[0])
+    
+    forbonval=bexcouponval[0][0]/zcbval[0][0] #value at t=0 of forward contract on coupon-bearing bond
+    
+    return forbonval
+
+#price of the futures contract on a coupon-bearing bond (when dleivery occurs AFTER a coupon has been paid)
+def futures_on_bond(N,face,Nb,c,u,d,r0):
+    #Nb is the time to maturity of the bond
+    #face is the face value of the bond
+    #c is the coupon of the bond
+    #N is the period at which we take delivery of the underlying asset in the forward contract
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #r0 is the short rate at t=0
+    
+    #short rates are computed one time slice at a time and only the needed slices of the bond lattices are kept
+    shrval=lattice_rows(u,d,r0)
+    #cbval2 is the value of a coupon-bearing bond maturing at t=Nb (1 coupon paid at each period)
+    cbval2=CB_lattice(Nb,face,shrval,c,keep=[N])
+    
+    q=0.5
+    #value of bond ex-coupon: we assume we take delivery of asset underlying the forward just AFTER a coupon has been paid
+    bexcouponval = backward_induction(cbval2[N]-face*c,q,keep=[0])
+    
+    futbonval=bexcouponval[0][0] #value at t=0 of futures contract on coupon-bearing bond
+    
+    return futbonval
+
+#value of a swap (starts at t=1, expires a t=N+1. We pay fixed, receiving floating. N is the number of payments made)
+def swap(fixed,N,shrval,keep=None):
+    #fixed is the fixed rate
+    #N is the expiration of the swap in periods
+    #shrval is the short-rate lattice, or its row function (see lattice_row and short_rate_lattice(...,packed=True))
+    #keep: times to return instead of the full lattice (see backward_induction)
+    q=0.5
+    terminal = (lattice_row(shrval,N)-fixed)/(1+lattice_row(shrval,N))
+    swapval = backward_induction(terminal,q,lambda i: 1+lattice_row(shrval,i),pre=lambda i: lattice_row(shrval,i)-fixed,keep=keep) #swap value
+ 
+    return swapval
+
+#value of a forward-starting swap (starts at t=2, expires a t=N+2. We pay fixed, receiving floating)
+#forward-starting swap is like normal swap except thre is no cash flow for the first few periods!
+#but we still receive cash-flow after that in arrears (with 1 period delay)
+def forswap(fixed,N,shrval,keep=None):
+    #fixed is the fixed rate
+    #N is the expiration of the swap in periods
+    #shrval is the short-rate lattice, or its row function (see lattice_row and short_rate_lattice(...,packed=True))
+    #keep: times to return instead of the full lattice (see backward_induction)
+    q=0.5
+    terminal = (lattice_row(shrval,N)-fixed)/(1+lattice_row(shrval,N))
+    forswapval = backward_induction(terminal,q,lambda i: 1+lattice_row(shrval,i),pre=lambda i: lattice_row(shrval,i)-fixed,first=1,keep=keep) #forward-starting swap value, no cash flow at t=0
+
+    return forswapval
+
+#swaption value for strike=0
+def swaption(N,swapval,shrval,keep=None):
+    #swapval is the swap lattice (or its slice at t=N)
+    #keep: times to return instead of the full lattice (see backward_induction)
+    q=0.5
+    swaptionval = backward_induction(np.maximum(lattice_row(swapval,N),0),q,lambda i: 1+lattice_row(shrval,i),keep=keep) #swaption value
+
+    return swaptionval
+
+#defaultable zero-coupon bond with recovery
+def defaultable_ZCB(shrval,F,R,N=None,keep=None):
+    #F is face value of coupon
+    #shrval is short rate lattice, or its row function (see short_rate_lattice(...,packed=True))
+    #R is the recovery rate
+    #N is the maturity of the bond, by default the last period of the short-rate lattice (required with a row function)
+    #keep: times to return instead of the full lattice (see backward_induction)
+    if N is None:
+        N=shrval.shape[0]-1
+    a=0.01
+    b=1.01
+    h=lambda i: a*b**(np.arange(i+1)-i/2.) #1-step hazard rates
+
+    q=0.5
+    #price of a bond maturing on date T at node (i,j) AFTER RECOVERY, face value of coupon at maturity
+    zcbval=backward_induction(np.repeat(float(F),N+1),q,lambda i: 1.0+lattice_row(shrval,i),pre=lambda i: h(i)*R*F,survival=lambda i: 1-h(i),keep=keep)
+
+    return zcbval
+
+
+
+#example run: prices of derivatives on a stock and on the short rate, printed
+def main():
+    #calibration by Black-Scholes model
+    T=0.50
+    sigma=0.20
+    N=10   #periods in binomial model over which the underlying security price is computed
+    u=math.exp(sigma*math.sqrt(T/float(N)))
+    d=1.0/u
+    print('u=',u)
+    print('d=',d)
+    stkval=stock_price_lattice(u,d,N,100.0)
+
+    r=0.02 #risk-free interest rate
+    K=100.0#strike price for derivative
+    c=0.01 #dividend yield of underlying security, or coupon of bond
+    cp=-1   #+1 for call options, -1 for put options
+    am=False#True for American option, False for European
+    optval=option_price_lattice(u,d,N,T,r,c,cp,am,stkval,K)
+    print('option value on stock at t=0',optval[0,0])
+    futval=futures_price_lattice(u,d,N,T,r,c,stkval)
+    print('futures value on stock at t=0',futval[0,0])
+
+    N2=10  #periods in binomial model over which the derivative is computed (e.g. the options on futures contract)
+    optfutval=option_on_future_price_lattice(u,d,N,T,r,c,cp,am,N2,futval,K)
+    print('option value on futures at t=0',optfutval[0,0])
+    shrval=short_rate_lattice(1.1,0.9,10,0.05)
+    #shrval=short_rate_lattice(1.25,0.9,5,0.06)
+    #print('short rate lattice:',shrval)
+    zcbval=ZCB_lattice(10,100.0,shrval)
+    #zcbval=ZCB_lattice(4,100.0,shrval)
+    print('ZCB value at time t=0',zcbval[0,0])
+    #swapval=swap(0.05,5,shrval) #NB: if swaps expires at t=6, then N=5 !!!! careful!
+    #print('Swap value at t=0',swapval[0,0])
+    forswapval=forswap(0.045,10,shrval)
+    notional=1000000.0
+    print('Forward-starting swap value at t=0',forswapval[0,0]*notional)
+    swaptionval=swaption(5,forswapval,shrval)
+    print('Swaption value at t=0',swaptionval[0,0]*notional)
+    optonzcbval=option_price_lattice2(1.1,0.9,6,1,shrval,0.0,1,True,zcbval,80.0) #option on ZCB
+    #optonzcbval=option_price_lattice2(1.25,0.9,3,1,shrval,0.0,-1,True,zcbval,88.0) #option on ZCB
+    print('option on ZCB at t=0',optonzcbval[0,0])
+    forbonval=forward_on_bond(4,100.,10,0.0,1.1,0.9,0.05)
+    print('forward contract value on a coupon-bearing bond at t=0',forbonval)
+    futbonval=futures_on_bond(4,100.,10,0.0,1.1,0.9,0.05)
+    print('futures contract value on a coupon-bearing bond at t=0',futbonval)
+
+    shrval=short_rate_lattice(1.1,0.9,10,0.05)
+    defaultZCBval=defaultable_ZCB(shrval,100.,0.2)
+    print('price of a defaultable zero-coupon bond with recovery',defaultZCBval[0,0])
+
+
+if __name__ == '__main__':
+    main()
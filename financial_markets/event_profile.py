@@ -0,0 +1,136 @@
+''' event profile of an event study: cumulative abnormal returns (CAR) of the stocks around the events
+the events are given as a mask (dates x symbols: True or 1 at the events, False, 0 or NaN elsewhere, such as the
+event frame of event_study.find_events) with the close prices (dates x symbols)
+the abnormal (market-neutral) return of a day is the return of the stock minus the return of the market; the CAR
+k days after (or before, for k<0) the event is prod(1+abnormal returns between the event day and day k)-1, so that
+it is 0 on the event day, as the normalized prices of QSTK's EventProfiler
+the log cumulative abnormal returns are computed once for the whole panel and the [-lookback,+lookforward] windows
+of all the events are read from a strided view of it (no copy of the panel per event)
+'''
+
+import warnings
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+#log cumulative (abnormal) returns of a panel of prices: row t is sum of log(1+return) up to day t (0 on the first day)
+#prices that are missing (NaN) or not positive are treated as missing: the days whose return is missing (the day of
+#the missing price and the next day) are NaN and are skipped by the later sums, so that the difference of two rows is
+#the log cumulative return between them whenever the rows in between are finite
+def log_cumulative_returns(close,market=None):
+    #close: prices (dates x symbols); market: prices of the market (dates), for market-neutral returns
+    close = valid_prices(close)
+    ret = np.zeros(close.shape)
+    ret[1:] = close[1:]/close[:-1]-1.0
+    if market is not None:
+        market = valid_prices(market)
+        ret[1:] -= (market[1:]/market[:-1]-1.0)[:,np.newaxis]
+    with np.errstate(invalid='ignore'):
+        logret = np.log1p(ret)
+    missing = np.isnan(logret)
+    L = np.cumsum(np.where(missing,0.0,logret),axis=0)
+    L[missing] = np.nan
+    return L
+
+#prices with the missing (NaN) and non-positive ones set to NaN, with a warning for the non-positive ones
+def valid_prices(x):
+    x = np.array(x,dtype=float)
+    with np.errstate(invalid='ignore'):
+        bad = x <= 0
+    if bad.any():
+        warnings.warn('%d prices of zero or less treated as missing' % np.count_nonzero(bad))
+        x[bad] = np.nan
+    return x
+
+#event predicate: the return of the stock is below symdrop while the return of the market is at least marketrise
+def price_drop_event(symdrop=-0.05,marketrise=0.02):
+    def fn_event(symreturns,marketreturns):
+        return (symreturns < symdrop) & (marketreturns >= marketrise)
+    return fn_event
+
+#mask of the events (dates x symbols) of an event predicate
+def event_mask(close,market,fn_event):
+    #close: prices (dates x symbols); market: prices of the market (dates)
+    #fn_event(symreturns,marketreturns) returns the boolean mask of the events from the daily returns of the stocks
+    #(dates-1 x symbols) and of the market (dates-1 x 1); there are no events on the first day
+    close = np.asarray(close,dtype=float)
+    market = np.asarray(market,dtype=float)[:,np.newaxis]
+    mask = np.zeros(close.shape,dtype=bool)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        mask[1:] = fn_event(close[1:]/close[:-1]-1.0,market[1:]/market[:-1]-1.0)
+    return mask
+
+#windows of length lookback+lookforward+1 of a (dates x symbols) array: view of shape (dates-window+1, window, symbols)
+def rolling_windows(x,lookback,lookforward):
+    window = lookback+lookforward+1
+    return as_strided(x,shape=(x.shape[0]-window+1,window)+x.shape[1:],strides=(x.strides[0],)+x.strides)
+
+#profile of the events: mean, standard deviation and standard error of the CAR for every day around the events
+def event_profile(events,close,market=None,lookback=20,lookforward=20,chunksize=65536,keep_windows=False):
+    #events: mask of the events (dates x symbols), close: close prices (dates x symbols)
+    #market: close prices of the market (dates), None for raw instead of market-neutral returns
+    #lookback, lookforward: number of days before and after the events in the profile
+    #(the events closer than that to the first or last date are left out, as in EventProfiler)
+    #chunksize: number of events whose windows are gathered at a time (memory is 8*chunksize*window bytes)
+    #keep_windows: also return the CAR of every event, array (events x window)
+    #returns a dictionary with the days (-lookback..lookforward), the number of events count, the mean, std and
+    #stderr of the CAR on each day, and the (date, symbol) indices of the events kept (those with prices over their
+    #whole window)
+    with np.errstate(invalid='ignore'):
+        mask = np.asarray(events) == 1
+    return profile_events(mask,log_cumulative_returns(close,market),lookback,lookforward,chunksize,keep_windows)
+
+#event profile from the log cumulative returns L of log_cumulative_returns (to profile several sets of events on one panel)
+def profile_events(mask,L,lookback=20,lookforward=20,chunksize=65536,keep_windows=False):
+    windows = rolling_windows(L,lookback,lookforward)
+    mask = mask.copy()
+    mask[:lookback] = False
+    mask[len(mask)-lookforward:] = False
+    date,symbol = np.nonzero(mask)
+    n = len(date)
+    days = np.arange(-lookback,lookforward+1)
+
+    s1 = np.zeros(len(days))
+    s2 = np.zeros(len(days))
+    kept = [] if keep_windows else None
+    complete = np.ones(n,dtype=bool)
+    for k in range(0,n,chunksize):
+        t,s = date[k:k+chunksize],symbol[k:k+chunksize]
+        car = np.expm1(windows[t-lookback,:,s]-L[t,s][:,np.newaxis])
+        #the events whose window has missing prices are left out
+        ok = np.isfinite(car).all(axis=1)
+        complete[k:k+chunksize] = ok
+        car = car[ok]
+        s1 += car.sum(axis=0)
+        s2 += (car*car).sum(axis=0)
+        if keep_windows:
+            kept.append(car)
+    date,symbol = date[complete],symbol[complete]
+    n = len(date)
+
+    res = {'days': days, 'count': n, 'date': date, 'symbol': symbol}
+    res['mean'] = s1/n if n > 0 else np.full(len(days),np.nan)
+    res['std'] = np.sqrt(np.maximum(s2/n-res['mean']**2,0.0)*n/(n-1.0)) if n > 1 else np.full(len(days),np.nan)
+    res['stderr'] = res['std']/np.sqrt(n) if n > 0 else res['std']
+    if keep_windows:
+        res['windows'] = np.vstack(kept) if kept else np.zeros((0,len(days)))
+    return res
+
+#writes the profile (day, mean, std and stderr of the CAR) to a CSV file
+def write_profile(profile,filename):
+    table = np.column_stack([profile['days'],profile['mean'],profile['std'],profile['stderr']])
+    np.savetxt(filename,table,delimiter=',',fmt=['%d','%.15g','%.15g','%.15g'],header='day,mean,std,stderr',comments='')
+
+#plot of the mean CAR around the events (with error bars of one standard deviation if errorbars)
+def plot_profile(profile,filename='EventStudy.png',errorbars=False):
+    import matplotlib.pyplot as plt
+    plt.clf()
+    plt.axhline(y=0.0,color='k')
+    plt.axvline(x=0,color='k')
+    if errorbars:
+        plt.errorbar(profile['days'],profile['mean'],yerr=profile['std'],ecolor='#AAAAFF',alpha=0.5)
+    plt.plot(profile['days'],profile['mean'],linewidth=3,label='mean',color='b')
+    plt.xlim(profile['days'][0]-1,profile['days'][-1]+1)
+    plt.title('CAR of '+str(profile['count'])+' events')
+    plt.xlabel('Days')
+    plt.ylabel('Cumulative abnormal returns')
+    plt.savefig(filename,format='png')
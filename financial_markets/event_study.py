@@ -0,0 +1,79 @@
+'''
+Program to perform an event study (e.g. stock returns following a daily drop by X% in the
+stock price).
+This program uses the QSTK Python module to load the data,
+and event_profile.py for the profile of the events (EventStudy.csv and EventStudy.png).
+The data for the study should be located in the QSData/Yahoo/ directory,
+e.g.: /usr/local/lib/python2.7/site-packages/QSTK/QSData/Yahoo/
+assuming this path is correct, to add data for the event study, 
+run: /usr/local/lib/python2.7/site-packages/QSTK/qstktools/YahooDataPull.py
+after creating a file symbols.txt in the directory you currently are
+then move the created .csv files into the QSData/Yahoo/ directory
+'''
+
+from __future__ import print_function
+import numpy as np
+import datetime as dt
+from financial_markets.price_store import PriceStore, store_path
+from financial_markets.event_profile import price_drop_event, event_mask, event_profile, write_profile, plot_profile
+
+def find_events(ls_symbols, d_data, fn_event=price_drop_event(), s_market_sym='SPY'):
+    ''' Finding the event dataframe
+    fn_event(na_symreturns, na_marketreturns) returns the boolean mask of the events (dates x symbols) from the
+    daily returns of the symbols (dates x symbols) and of the market (dates x 1); the first day has no return
+    Returns the event dataframe (1 at the events, NaN elsewhere) and the list of the events as (symbol, date) '''
+    import pandas as pd
+    df_close = d_data['close']
+
+    print("Finding Events")
+
+    # Daily returns of all the symbols and of the market, with whole-frame operations
+    na_mask = event_mask(df_close.values, df_close[s_market_sym].values, fn_event)
+    na_mask &= df_close.columns.isin(ls_symbols)[np.newaxis, :]
+
+    df_events = pd.DataFrame(np.where(na_mask, 1.0, np.nan), index=df_close.index, columns=df_close.columns)
+
+    # Sparse list of the events, symbol after symbol as in the event frame columns
+    na_sym, na_time = np.nonzero(na_mask.T)
+    l_events = list(zip(df_close.columns[na_sym], df_close.index[na_time]))
+    print("%d events found" % len(na_sym))
+
+    return df_events, l_events
+
+
+def main():
+    ''' Event study of the drops of the S&P 500 stocks from 1997 to 2013 '''
+    dt_start = dt.datetime(1997, 1, 1)
+    dt_end = dt.datetime(2013,10,1)
+    dt_timeofday = dt.timedelta(hours=16)
+
+    #local price store (see price_store.py), or QSTK and its local copy of Yahoo data
+    if store_path:
+        dataobj = PriceStore(store_path)
+        ldt_timestamps = dataobj.trading_days(dt_start, dt_end, dt_timeofday)
+    else:
+        import QSTK.qstkutil.qsdateutil as du
+        import QSTK.qstkutil.DataAccess as da
+        ldt_timestamps = du.getNYSEdays(dt_start, dt_end, dt_timeofday)
+        dataobj = da.DataAccess('Yahoo',cachestalltime=0)
+    ls_symbols = dataobj.get_symbols_from_list('sp5002012')
+   #ls_symbols=['BAC','C','WFC','JPM','GS','MS','BK','USB','HBC','PNC','COF','TD']
+    ls_symbols.append('SPY')
+    
+    ls_keys = ['open', 'high', 'low', 'close', 'volume', 'actual_close']
+    ldf_data = dataobj.get_data(ldt_timestamps, ls_symbols, ls_keys)
+    d_data = dict(zip(ls_keys, ldf_data))
+    
+    for s_key in ls_keys:
+        d_data[s_key] = d_data[s_key].ffill().bfill().fillna(1.0)
+    
+    df_events, l_events = find_events(ls_symbols, d_data)
+    print("Creating Study")
+    d_profile = event_profile(df_events.values, d_data['close'].values, d_data['close']['SPY'].values,
+                              lookback=60, lookforward=60)
+    write_profile(d_profile, 'EventStudy.csv')
+    plot_profile(d_profile, 'EventStudy.png', errorbars=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+'''event studies over grids of event definitions (stock down more than symdrop while the market is up at least
+    marketrise, profiled over [-lookback,+lookforward] days) on one panel of close prices, fanned out across a process pool
+the panel is copied once into shared memory and mapped by every worker (it is not pickled with the tasks), and the
+definitions with the same thresholds share one event mask
+'''
+
+import itertools
+import multiprocessing
+import numpy as np
+from financial_markets import event_profile as ep
+
+definition_fields = ['symdrop','marketrise','lookback','lookforward']
+summary_fields = ['events','car','car_std','car_stderr','t_stat']
+
+#grid of event definitions: cartesian product of the values given for each field
+def definition_grid(symdrop,marketrise,lookback,lookforward):
+    grid = list(itertools.product(*[np.atleast_1d(x) for x in (symdrop,marketrise,lookback,lookforward)]))
+    definitions = np.zeros(len(grid),dtype=[('symdrop','f8'),('marketrise','f8'),('lookback','i8'),('lookforward','i8')])
+    for k,field in enumerate(definition_fields):
+        definitions[field] = [g[k] for g in grid]
+    return definitions
+
+panel = {}
+
+#worker initialization: map the shared panel and compute its market-neutral log cumulative returns once per worker
+def init_worker(shared_close,shared_market,shape):
+    close = np.frombuffer(shared_close,dtype=float).reshape(shape)
+    market = np.frombuffer(shared_market,dtype=float)
+    panel['close'] = close
+    panel['market'] = market
+    panel['L'] = ep.log_cumulative_returns(close,market)
+
+#summary of the definitions with the same thresholds: (symdrop, marketrise, list of (lookback, lookforward))
+def run_definitions(task):
+    symdrop,marketrise,windows = task
+    mask = ep.event_mask(panel['close'],panel['market'],ep.price_drop_event(symdrop,marketrise))
+    res = []
+    for lookback,lookforward in windows:
+        profile = ep.profile_events(mask,panel['L'],lookback,lookforward)
+        car,std,stderr = profile['mean'][-1],profile['std'][-1],profile['stderr'][-1]
+        res.append((profile['count'],car,std,stderr,car/stderr if stderr > 0 else np.nan))
+    return res
+
+#event counts and statistics of the CAR at +lookforward days for every definition
+def run_sweep(definitions,close,market,processes=None):
+    #definitions is a structured array with the definition_fields (see definition_grid)
+    #close: close prices (dates x symbols), market: close prices of the market (dates)
+    #processes is the number of worker processes (default: number of cores), 1 to run in the calling process
+    #returns a structured array with the definition_fields and the summary_fields: number of events, mean, standard
+    #deviation and standard error of the CAR on the last day of the window, and t statistic of the mean CAR
+    close = np.asarray(close,dtype=float)
+    shared_close = multiprocessing.RawArray('d',close.size)
+    shared_market = multiprocessing.RawArray('d',len(market))
+    np.frombuffer(shared_close,dtype=float)[:] = close.ravel()
+    np.frombuffer(shared_market,dtype=float)[:] = market
+
+    #one task per pair of thresholds, with all its windows
+    tasks = []
+    index = []
+    for key,group in itertools.groupby(np.lexsort((definitions['marketrise'],definitions['symdrop'])),
+                                       key=lambda k: (definitions['symdrop'][k],definitions['marketrise'][k])):
+        group = list(group)
+        tasks.append((key[0],key[1],[(int(definitions['lookback'][k]),int(definitions['lookforward'][k])) for k in group]))
+        index.append(group)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    initargs = (shared_close,shared_market,close.shape)
+    if processes == 1:
+        init_worker(*initargs)
+        summaries = [run_definitions(task) for task in tasks]
+    else:
+        pool = multiprocessing.Pool(processes,initializer=init_worker,initargs=initargs)
+        try:
+            summaries = pool.map(run_definitions,tasks,chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    res = np.zeros(len(definitions),dtype=definitions.dtype.descr+[('events','i8')]+[(field,'f8') for field in summary_fields[1:]])
+    for field in definition_fields:
+        res[field] = definitions[field]
+    for group,summary in zip(index,summaries):
+        for k,row in zip(group,summary):
+            for field,value in zip(summary_fields,row):
+                res[field][k] = value
+    return res
+
+#writes the summary table to a CSV file
+def write_summary(res,filename):
+    fmt = ['%.15g' if res.dtype[field].kind == 'f' else '%d' for field in res.dtype.names]
+    np.savetxt(filename,res,delimiter=',',fmt=fmt,header=','.join(res.dtype.names),comments='')
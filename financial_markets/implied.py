@@ -0,0 +1,127 @@
+''' implied volatilities of option quotes and implied short rates of zero-coupon bond prices, solved for whole arrays
+of quotes in lockstep: every iteration prices all the quotes that have not converged yet in one vectorized call
+(closed form for European options, one batch of binomial trees for American options, one batch of short-rate
+lattices for the bonds), and each quote keeps its own bracket [lo, hi] so that a Newton or secant step falling
+outside it is replaced by a bisection step (safeguarded Newton, as in Brent's method)
+'''
+
+import numpy as np
+from financial_markets import derivative_pricing as dp
+from financial_markets.black_scholes import black_scholes_greeks
+
+#roots of f(x)=target for arrays of targets, in lockstep
+def lockstep_solve(f,target,lo,hi,x0,fprime=None,exact=True,tol=1e-12,rtol=0.0,xtol=1e-12,maxiter=100):
+    #f(x,k) is increasing in x and returns the values of the quotes of indices k at x (array of the shape of k)
+    #target, lo, hi and x0 are arrays (one value per quote): the root is searched in [lo, hi] starting from x0
+    #fprime(x,k): derivative of f, used for Newton steps at every iteration if exact, otherwise only for the first
+    #step (an approximation of the derivative), the next steps being secant steps; bisection steps without fprime
+    #the quotes converge when |f(x)-target| <= tol+rtol*|target|, or when their bracket is narrower than xtol
+    #returns the roots, NaN for the quotes whose target is not reached in [lo, hi] or after maxiter iterations
+    target = np.asarray(target,dtype=float)
+    lo,hi,x = [np.array(np.broadcast_to(np.asarray(v,dtype=float),target.shape)) for v in (lo,hi,x0)]
+    x = np.clip(x,lo,hi)
+    lo0,hi0 = lo.copy(),hi.copy()
+    tol = tol+rtol*np.abs(target)
+    res = np.full(target.shape,np.nan)
+    prev_x = np.full(target.shape,np.nan)
+    prev_g = np.full(target.shape,np.nan)
+    active = np.nonzero(np.isfinite(target))[0]
+    for it in range(maxiter):
+        if len(active) == 0:
+            break
+        xa = x[active]
+        g = f(xa,active)-target[active]
+        done = np.abs(g) <= tol[active]
+        res[active[done]] = xa[done]
+
+        #bracket
+        above = g > 0
+        hi[active[above]] = np.minimum(hi[active[above]],xa[above])
+        lo[active[~above]] = np.maximum(lo[active[~above]],xa[~above])
+        stuck = ~done & (hi[active]-lo[active] <= xtol)
+        #a bracket shrunk onto one of the bounds: the target is outside the range of f over [lo, hi]
+        inside = stuck & (lo[active] > lo0[active]) & (hi[active] < hi0[active])
+        res[active[inside]] = xa[inside]
+        keep = ~done & ~stuck
+        active,xa,g = active[keep],xa[keep],g[keep]
+
+        #next step: Newton, secant, or bisection when the step leaves the bracket
+        with np.errstate(divide='ignore',invalid='ignore'):
+            if fprime is not None and (exact or it == 0):
+                step = g/fprime(xa,active)
+            else:
+                step = g*(xa-prev_x[active])/(g-prev_g[active])
+            new = xa-step
+            l,h = lo[active],hi[active]
+            outside = ~np.isfinite(new) | (new <= l) | (new >= h)
+        new[outside] = 0.5*(l[outside]+h[outside])
+        prev_x[active] = xa
+        prev_g[active] = g
+        x[active] = new
+    return res
+
+#prices of American (or European) options on binomial trees calibrated by Black-Scholes, one tree per quote
+def lattice_option_prices(S0,K,T,r,c,sigma,cp,am,N):
+    #S0, K, T, r, c, sigma, cp and am are arrays (one value per quote, see option_risk_batch), N the number of periods
+    #returns an array of prices of the shape of the broadcast arguments (a scalar if they are all scalars)
+    args = np.broadcast_arrays(*[np.asarray(x,dtype=float) for x in (S0,K,T,r,c,sigma,cp,am)])
+    shape = args[0].shape
+    S0,K,T,r,c,sigma,cp,am = [x.reshape(-1,1) for x in args]
+    deltaT = T/float(N)
+    u = np.exp(sigma*np.sqrt(deltaT))
+    d = 1.0/u
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+    prices = dp.batch_option_induction(dp.lattice_rows(u,d,S0),K,cp,am,q,np.exp(r*deltaT),N,keep=[0])[0][:,0]
+    return prices.reshape(shape)[()]
+
+#implied volatilities of option quotes
+def implied_volatility(price,S0,K,T,r,c,cp,am=False,N=100,lo=1e-4,hi=5.0,tol=1e-12,rtol=1e-10,maxiter=100):
+    #price is the option price, S0 the price of the stock, K the strike, T the time to expiration, r the risk free
+    #interest rate, c the dividend yield, cp 1 for calls and -1 for puts, am True for American options
+    #(all scalars or arrays broadcast against each other)
+    #European options are inverted with the Black-Scholes price and vega; American options on binomial trees of N
+    #periods (volatilities above 1.01*|r-c|*sqrt(T/N)), starting from the European implied volatility with secant steps
+    #tol and rtol: absolute and relative tolerances on the price (see lockstep_solve)
+    #returns the implied volatilities (of the shape of the broadcast arguments, a scalar if they are all scalars),
+    #NaN where the price is outside the range of prices for volatilities in [lo, hi]
+    args = np.broadcast_arrays(*[np.asarray(x,dtype=float) for x in (price,S0,K,T,r,c,cp,am)])
+    shape = args[0].shape
+    price,S0,K,T,r,c,cp,am = [x.ravel() for x in args]
+    bs = lambda s,k: black_scholes_greeks(S0[k],K[k],T[k],r[k],c[k],s,cp[k])
+    #initial guess: Brenner-Subrahmanyam approximation at the money
+    x0 = np.clip(np.sqrt(2.0*np.pi/np.maximum(T,1e-12))*price/S0,0.05,1.0)
+    sigma = lockstep_solve(lambda s,k: bs(s,k)['price'],price,lo,hi,x0,lambda s,k: bs(s,k)['vega'],
+                           exact=True,tol=tol,rtol=rtol,maxiter=maxiter)
+
+    american = np.nonzero(am > 0)[0]
+    if len(american):
+        #the American price is at least the European one: its implied volatility is at most the European one
+        euro = sigma[american]
+        x0 = np.where(np.isfinite(euro),euro,0.2)
+        f = lambda s,k: lattice_option_prices(S0[american[k]],K[american[k]],T[american[k]],r[american[k]],c[american[k]],
+                                              s,cp[american[k]],True,N)
+        fprime = lambda s,k: bs(s,american[k])['vega']
+        #the probabilities of the trees are in [0, 1] for volatilities above |r-c|*sqrt(deltaT)
+        lo_am = np.maximum(lo,1.01*np.abs(r-c)[american]*np.sqrt(T[american]/float(N)))
+        sigma[american] = lockstep_solve(f,price[american],lo_am,hi,x0,fprime,exact=False,tol=tol,rtol=rtol,maxiter=maxiter)
+    return sigma.reshape(shape)[()]
+
+#short rates r0 at t=0 implied by zero-coupon bond prices on the short-rate lattices of short_rate_lattice
+def implied_short_rate(price,N,face=100.0,u=1.1,d=0.9,lo=0.0,hi=1.0,tol=1e-12,maxiter=100):
+    #price is the price of the bond maturing at t=N (periods) with face value face, and u and d the factors by which
+    #the short rate goes up and down (all scalars or arrays broadcast against each other)
+    #returns r0 such that ZCB_lattice(N,face,short_rate_lattice(u,d,N,r0))[0,0] is the price (NaN if not in [lo, hi])
+    #(of the shape of the broadcast arguments, a scalar if they are all scalars)
+    price,N,face,u,d = np.broadcast_arrays(*[np.asarray(x,dtype=float) for x in (price,N,face,u,d)])
+    shape = price.shape
+    price,N,face,u,d = [x.ravel() for x in (price,N,face,u,d)]
+    res = np.full(len(price),np.nan)
+    for n in np.unique(N): #one batch of lattices per maturity
+        group = np.nonzero(N == n)[0]
+        uu,dd = u[group][:,np.newaxis],d[group][:,np.newaxis]
+        #the price decreases with r0: solve -price(r0) = -price for the bonds of face value 1
+        f = lambda x,k: -dp.ZCB_lattice(int(n),1.0,dp.lattice_rows(uu[k],dd[k],x[:,np.newaxis]),keep=[0])[0][:,0]
+        x0 = np.clip((face[group]/price[group])**(1.0/max(n,1.0))-1.0,lo,hi) #flat rate as initial guess
+        res[group] = lockstep_solve(f,-price[group]/face[group],lo,hi,x0,tol=tol,maxiter=maxiter)
+    return res.reshape(shape)[()]
@@ -0,0 +1,145 @@
+''' technical indicators of technicalAnalysis.pro for a whole panel of stocks (dates x symbols) at once:
+exponential moving averages (EMA), Wilder's and Cutler's RSI, MACD with its signal line and divergence, Bollinger
+bands and on-balance volume (OBV), with the same seeding as the IDL program: the first N values of an N-day average
+are the mean of the first N prices, then
+    EMA[i] = EMA[i-1]+alpha*(price[i]-EMA[i-1]), alpha = 2/(N+1)
+    SMA[i] = mean(price[i-N+1:i+1])
+the EMAs run as recursive filters (scipy.signal.lfilter) along the dates of all the symbols and the simple moving
+averages and standard deviations come from cumulative sums; indicators requested together share their
+intermediate averages (the price EMAs of MACD, the up and down moves of the two RSIs)
+'''
+
+import numpy as np
+
+#lengths of the averages (the parameters of config.dat)
+default_parameters = {
+    'N0': 12,     #fast EMA of the MACD
+    'N1': 26,     #slow EMA of the MACD
+    'N2': 9,      #EMA of the MACD signal line
+    'Nrsi': 14,   #averages of the up and down moves of the RSIs
+    'Nfast': 20,  #fast price EMA (EMAf)
+    'Nslow': 50,  #slow price EMA (EMAs)
+    'Nbol': 20,   #Bollinger bands
+}
+
+indicator_names = ['EMAf','EMAs','RSI','RSI2','MACD','signal','divergence','meanbol','stdbol','bollinger_up',
+                   'bollinger_down','bollinger','OBV']
+
+#N-day EMA along the first axis (dates), seeded with the mean of the first N values
+def ema(x,N):
+    x = np.asarray(x,dtype=float)
+    res = np.empty(x.shape)
+    N = min(N,len(x))
+    if N == 0:
+        return res
+    alpha = 2.0/(N+1.0)
+    res[:N] = x[:N].mean(axis=0)
+    if len(x) > N:
+        from scipy.signal import lfilter #slow to import (about 0.5 s), only loaded when needed
+        zi = ((1.0-alpha)*res[N-1])[np.newaxis]
+        res[N:] = lfilter([alpha],[1.0,alpha-1.0],x[N:],axis=0,zi=zi)[0]
+    return res
+
+#N-day simple moving average (and standard deviation with n-1, if std) along the first axis, the first N values being
+#those of the first full window
+def sma(x,N,std=False):
+    x = np.asarray(x,dtype=float)
+    N = min(N,len(x))
+    if N == 0:
+        return (np.empty(x.shape),np.empty(x.shape)) if std else np.empty(x.shape)
+    x0 = x[0]
+    c1 = np.cumsum(x-x0,axis=0) #sums of the deviations from the first value, to limit the cancellation in the variance
+    s1 = c1[N-1:].copy()
+    s1[1:] -= c1[:-N]
+    mean = np.empty(x.shape)
+    mean[N-1:] = s1/N
+    mean[:N-1] = mean[N-1]
+    if not std:
+        return mean+x0
+    c2 = np.cumsum((x-x0)**2,axis=0)
+    s2 = c2[N-1:].copy()
+    s2[1:] -= c2[:-N]
+    sd = np.empty(x.shape)
+    sd[N-1:] = np.sqrt(np.maximum(s2-s1*s1/N,0.0)/max(N-1,1))
+    sd[:N-1] = sd[N-1]
+    return mean+x0,sd
+
+#relative strength index of the averages of the up and down moves (100 where the down moves average to 0)
+def rsi(up,down):
+    with np.errstate(divide='ignore',invalid='ignore'):
+        res = 100.0-100.0/(1.0+up/down)
+    res[~np.isfinite(res)] = 100.0
+    return res
+
+#indicators of a panel of close prices (dates x symbols, or a single series) and volumes
+def indicators(price,volume=None,names=None,**parameters):
+    #names: the indicators to compute (see indicator_names), by default all of them (all but OBV without volumes);
+    #OBV requires the volumes
+    #parameters override default_parameters
+    #returns a dictionary of arrays with the shape of price
+    p = dict(default_parameters)
+    p.update(parameters)
+    price = np.asarray(price,dtype=float)
+    if names is None:
+        names = [name for name in indicator_names if volume is not None or name != 'OBV']
+    cache = {}
+    #intermediate results computed at most once
+    def get(key):
+        if key not in cache:
+            kind,N = key
+            if kind == 'ema':
+                cache[key] = ema(price,N)
+            elif kind == 'bollinger':
+                cache[key] = sma(price,N,std=True)
+            elif kind == 'moves':
+                dprice = np.zeros(price.shape)
+                dprice[1:] = price[1:]-price[:-1]
+                cache[key] = dprice,np.maximum(dprice,0.0),np.maximum(-dprice,0.0)
+            elif kind == 'macd':
+                cache[key] = get(('ema',p['N0']))-get(('ema',p['N1']))
+            elif kind == 'signal':
+                cache[key] = ema(get(('macd',None)),N)
+        return cache[key]
+
+    res = {}
+    for name in names:
+        if name == 'EMAf':
+            res[name] = get(('ema',p['Nfast']))
+        elif name == 'EMAs':
+            res[name] = get(('ema',p['Nslow']))
+        elif name == 'RSI': #Wilder's RSI, from EMAs of the up and down moves
+            dprice,up,down = get(('moves',None))
+            res[name] = rsi(ema(up,p['Nrsi']),ema(down,p['Nrsi']))
+        elif name == 'RSI2': #Cutler's RSI, from simple moving averages of the up and down moves
+            dprice,up,down = get(('moves',None))
+            res[name] = rsi(sma(up,p['Nrsi']),sma(down,p['Nrsi']))
+        elif name == 'MACD':
+            res[name] = get(('macd',None))
+        elif name == 'signal':
+            res[name] = get(('signal',p['N2']))
+        elif name == 'divergence':
+            res[name] = get(('macd',None))-get(('signal',p['N2']))
+        elif name in ('meanbol','stdbol','bollinger_up','bollinger_down','bollinger'):
+            mean,sd = get(('bollinger',p['Nbol']))
+            if name == 'meanbol':
+                res[name] = mean
+            elif name == 'stdbol':
+                res[name] = sd
+            elif name == 'bollinger_up':
+                res[name] = mean+2.0*sd
+            elif name == 'bollinger_down':
+                res[name] = mean-2.0*sd
+            else: #Bollinger value of Bollinger.py
+                with np.errstate(divide='ignore',invalid='ignore'):
+                    res[name] = (price-mean)/sd
+        elif name == 'OBV':
+            if volume is None:
+                raise ValueError('OBV requires the volumes')
+            volume = np.asarray(volume,dtype=float)
+            dprice,up,down = get(('moves',None))
+            flow = volume*np.sign(dprice)
+            flow[0] = volume.mean(axis=0)
+            res[name] = np.cumsum(flow,axis=0)
+        else:
+            raise ValueError('unknown indicator '+name)
+    return res
@@ -0,0 +1,121 @@
+'''memoizing cache of the stock price, short-rate and zero-coupon bond lattices of derivative_pricing.py
+    with a byte-size budget and least-recently-used eviction
+the cached lattices are returned read-only and must not be modified by the callers
+row i of a stock price or short-rate lattice does not depend on N: a lattice is served from a cached deeper one
+(as a view of its first rows and columns) or built by extending a cached shallower one
+'''
+
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from financial_markets import derivative_pricing as dp
+
+class LatticeCache(object):
+
+    def __init__(self,max_bytes=512*1024**2):
+        #max_bytes is the budget for the memory held by the cached lattices
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.entries = OrderedDict() #key -> lattice, from least to most recently used
+        self.owners = {} #id of a cached lattice -> its key
+        self.digests = {} #(key of a cached lattice, n) -> content key of its first n rows and columns
+        self.nbytes = 0
+        self.hits = 0
+        self.extensions = 0 #requests served by extending a shallower cached lattice
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'extensions': self.extensions, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.entries), 'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+    def lookup(self,key):
+        val = self.entries.pop(key,None)
+        if val is not None:
+            self.entries[key] = val #most recently used
+        return val
+
+    def store(self,key,val):
+        val.flags.writeable = False
+        if key in self.entries:
+            self.discard(key)
+        if val.nbytes > self.max_bytes:
+            return val #too large to be cached
+        self.entries[key] = val
+        self.owners[id(val)] = key
+        self.nbytes += val.nbytes
+        while self.nbytes > self.max_bytes:
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+        return val
+
+    def discard(self,key):
+        val = self.entries.pop(key)
+        del self.owners[id(val)]
+        for k in [k for k in self.digests if k[0] == key]:
+            del self.digests[k]
+        self.nbytes -= val.nbytes
+
+    #key identifying the content of the first n rows and columns of a lattice: a digest, the same whether the lattice
+    #was returned by the cache or not (the digests of the cached lattices are computed once)
+    def content_key(self,lattice,n):
+        n = min(n,lattice.shape[0])
+        base = lattice if lattice.base is None else lattice.base
+        key = self.owners.get(id(base))
+        cached = key is not None and self.entries.get(key) is base and lattice.strides == base.strides \
+            and lattice.__array_interface__['data'][0] == base.__array_interface__['data'][0]
+        if cached and (key,n) in self.digests:
+            return self.digests[(key,n)]
+        digest = ('digest',hashlib.sha1(np.ascontiguousarray(lattice[:n,:n])).hexdigest())
+        if cached:
+            self.digests[(key,n)] = digest
+        return digest
+
+    #recombining lattice x0*u**(i-j)*d**j (stock prices or short rates) with N periods
+    def recombining_lattice(self,kind,u,d,N,x0):
+        key = (kind,u,d,x0)
+        val = self.lookup(key)
+        if val is not None and val.shape[0] > N:
+            self.hits += 1
+            return val[:N+1,:N+1]
+        lattice = np.zeros((N+1,N+1))
+        if val is None:
+            self.misses += 1
+            start = 0
+        else:
+            self.extensions += 1
+            start = val.shape[0]
+            lattice[:start,:start] = val
+        #closed form of stock_price_lattice and short_rate_lattice for the missing rows
+        i,j = np.ogrid[start:N+1,0:N+1]
+        lattice[start:] = dp.lattice_nodes(u,d,x0,i,j)
+        return self.store(key,lattice)
+
+    def stock_price_lattice(self,u,d,N,S0):
+        return self.recombining_lattice('stock',u,d,N,S0)
+
+    def short_rate_lattice(self,u,d,N,r0):
+        return self.recombining_lattice('short rate',u,d,N,r0)
+
+    def ZCB_lattice(self,N,face,shrval):
+        key = ('ZCB',N,face,self.content_key(shrval,N)) #rows 0 to N-1 of the short rates are used
+        val = self.lookup(key)
+        if val is not None:
+            self.hits += 1
+            return val
+        self.misses += 1
+        return self.store(key,dp.ZCB_lattice(N,face,shrval))
+
+#cache shared by the module-level functions, drop-in replacements for the functions of derivative_pricing.py
+default_cache = LatticeCache()
+
+def stock_price_lattice(u,d,N,S0):
+    return default_cache.stock_price_lattice(u,d,N,S0)
+
+def short_rate_lattice(u,d,N,r0):
+    return default_cache.short_rate_lattice(u,d,N,r0)
+
+def ZCB_lattice(N,face,shrval):
+    return default_cache.ZCB_lattice(N,face,shrval)
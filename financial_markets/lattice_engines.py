@@ -0,0 +1,88 @@
+'''faster converging lattice engines for options on stocks, with the same parameters as option_price_lattice:
+    binomial tree with Broadie-Detemple smoothing (Black-Scholes values over the last period), Richardson extrapolation
+    of two binomial trees (N and N/2 periods) and trinomial tree (Kamrad-Ritchken)
+the trees are calibrated by Black-Scholes: the volatility is the one of the binomial tree u=exp(sigma*sqrt(T/N)), d=1/u
+all engines return the option price at t=0 and hold only one time slice of the tree (memory is O(N))
+'''
+
+import numpy as np
+from financial_markets import derivative_pricing as dp
+from financial_markets.black_scholes import black_scholes_price, lattice_volatility
+
+#volatility and initial stock price of a binomial tree calibrated by Black-Scholes
+def tree_parameters(u,d,N,T,stkval):
+    sigma = lattice_volatility(u,d,T/float(N))
+    if sigma is None:
+        raise ValueError('the tree is not calibrated by Black-Scholes (d=1/u)')
+    S0 = np.ravel(dp.lattice_row(stkval,0))[0] #stkval is a lattice, a row function or the initial price of the stock
+    return sigma,S0
+
+#binomial tree, optionally smoothed by replacing the values at the last period by Black-Scholes prices (Broadie-Detemple)
+def binomial_option_price(u,d,N,T,r,c,cp,am,stkval,K,smoothing=True):
+    #r is risk free interest rate
+    #N is the number of periods in the binomial model
+    #T is time
+    #c is dividend yield
+    #stkval is price lattice of underlying asset (stock), its row function or the initial price of the stock
+    #u is the factor by which the stock price goes up, d the factor by which it goes down
+    #cp: 1 for call, -1 for put
+    #am: True for American option, False for European
+    #K=strike price
+    sigma,S0 = tree_parameters(u,d,N,T,stkval)
+    deltaT = T/float(N)
+    a = np.exp((r-c) * deltaT) #dividend is subtracted from rate
+    q = (a-d)/(u-d)
+    stock = dp.lattice_rows(u,d,S0)
+    payoff = lambda i: cp*(stock(i)-K)
+    exercise = payoff if am else None
+
+    if smoothing:
+        #value at t=N-1 of the European option expiring one period later
+        terminal = black_scholes_price(stock(N-1),K,deltaT,r,c,sigma,cp)
+        if am:
+            terminal = np.maximum(terminal,payoff(N-1))
+    else:
+        terminal = np.maximum(0,payoff(N))
+    optval = dp.backward_induction(terminal,q,np.exp(r*deltaT),exercise=exercise,keep=[0])
+    return optval[0][0]
+
+#Richardson extrapolation of the (smoothed) binomial prices with N and N2=N//2 periods, whose error is O(1/N):
+#(N*P(N)-N2*P(N2))/(N-N2), that is 2*P(N)-P(N/2) for an even N
+def richardson_option_price(u,d,N,T,r,c,cp,am,stkval,K,smoothing=True):
+    #parameters of binomial_option_price; the tree with N2 periods has the same volatility
+    if N < 2:
+        raise ValueError('Richardson extrapolation needs at least 2 periods')
+    sigma,S0 = tree_parameters(u,d,N,T,stkval)
+    N2 = N//2
+    u2 = np.exp(sigma*np.sqrt(T/float(N2)))
+    P = binomial_option_price(u,d,N,T,r,c,cp,am,S0,K,smoothing)
+    P2 = binomial_option_price(u2,1.0/u2,N2,T,r,c,cp,am,S0,K,smoothing)
+    return (N*P-N2*P2)/float(N-N2)
+
+#trinomial tree of Kamrad and Ritchken: the stock goes up by the factor exp(stretch*sigma*sqrt(deltaT)), down by its inverse
+#or stays unchanged (middle branch), with probabilities matching the mean and variance of the log return
+def trinomial_option_price(u,d,N,T,r,c,cp,am,stkval,K,stretch=np.sqrt(1.5)):
+    #parameters of binomial_option_price
+    #stretch (lambda >= 1) is the ratio of the log step to sigma*sqrt(deltaT): the probability of no move is 1-1/lambda**2
+    #(0 for lambda=1, where the tree is a binomial tree on a coarser grid)
+    if stretch < 1.0:
+        raise ValueError('the stretch parameter must be at least 1')
+    sigma,S0 = tree_parameters(u,d,N,T,stkval)
+    deltaT = T/float(N)
+    dx = stretch*sigma*np.sqrt(deltaT)
+    drift = (r-c-0.5*sigma**2)*np.sqrt(deltaT)/(2.0*stretch*sigma)
+    pu = 0.5/stretch**2+drift #probability of an up move
+    pd = 0.5/stretch**2-drift #probability of a down move
+    pm = 1.0-1.0/stretch**2   #probability of no move
+    if min(pu,pd) < 0:
+        raise ValueError('negative probability in the trinomial tree: increase N')
+    discount = np.exp(-r*deltaT)
+    #stock prices S0*exp((i-k)*dx) at the 2i+1 nodes of time i
+    stock = lambda i: S0*np.exp((i-np.arange(2*i+1))*dx)
+
+    val = np.maximum(0,cp*(stock(N)-K))
+    for i in range(N-1,-1,-1):
+        val = discount*(pu*val[:-2]+pm*val[1:-1]+pd*val[2:])
+        if am:
+            val = np.maximum(val,cp*(stock(i)-K))
+    return val[0]
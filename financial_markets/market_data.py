@@ -0,0 +1,234 @@
+''' concurrent download of daily stock prices with a persistent on-disk cache, for portfolio.py
+the prices of a symbol come as a Yahoo-like CSV file (Date,Open,High,Low,Close,Volume,Adj Close, parsed by
+price_store.parse_symbol_csv, so the fields are those of price_store: close is the adjusted close and actual_close
+the close) from the URL url_template % {'base': base_url, 'symbol': symbol, 'start': start, 'end': end}
+the symbols are fetched by a pool of threads (at most connections requests at a time), every request is retried
+with exponential backoff, and the cache keeps for every (symbol, field) its prices and the date ranges already
+fetched, so that only the missing date ranges are requested again
+serve_fixtures starts a local HTTP stand-in serving fixture CSV files with the same URLs, to test offline
+'''
+
+import os
+import time
+import random
+import threading
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+import numpy as np
+from financial_markets.price_store import fields, parse_symbol_csv, to_days
+
+try:
+    from urllib.request import urlopen
+    from urllib.error import HTTPError, URLError
+    from urllib.parse import quote, unquote, urlparse, parse_qs
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError: #Python 2
+    from urllib2 import urlopen, HTTPError, URLError
+    from urllib import quote, unquote
+    from urlparse import urlparse, parse_qs
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+url_template = '%(base)s/%(symbol)s.csv?start=%(start)s&end=%(end)s'
+one_day = np.timedelta64(1,'D')
+
+#base URL and cache directory used by portfolio.py (environment variables MARKET_DATA_URL and MARKET_DATA_CACHE),
+#no base URL to download the prices with pandas' DataReader
+base_url = os.environ.get('MARKET_DATA_URL')
+cache_dir = os.environ.get('MARKET_DATA_CACHE','market_data_cache')
+
+#body of a URL, retried with exponential backoff (backoff, 2*backoff, ... seconds) on network errors and on
+#HTTP errors 429 and 5xx
+def fetch_url(url,retries=4,backoff=0.25,timeout=10.0):
+    for attempt in range(retries+1):
+        try:
+            response = urlopen(url,timeout=timeout)
+            try:
+                return response.read().decode('utf-8')
+            finally:
+                response.close()
+        except HTTPError as e:
+            if (e.code != 429 and e.code < 500) or attempt == retries:
+                raise
+        except (URLError,IOError):
+            if attempt == retries:
+                raise
+        time.sleep(backoff*2**attempt)
+
+#date ranges (start and end included) of [start, end] that are not covered by the ranges covered
+def missing_ranges(covered,start,end):
+    missing = []
+    for s,e in sorted(covered):
+        if e < start:
+            continue
+        if s > end:
+            break
+        if s > start:
+            missing.append((start,s-one_day))
+        start = max(start,e+one_day)
+        if start > end:
+            return missing
+    missing.append((start,end))
+    return missing
+
+#union of date ranges, merging the overlapping and adjacent ones
+def merge_ranges(ranges):
+    merged = []
+    for s,e in sorted(ranges):
+        if merged and s <= merged[-1][1]+one_day:
+            merged[-1] = (merged[-1][0],max(merged[-1][1],e))
+        else:
+            merged.append((s,e))
+    return merged
+
+#renames src to dst, replacing dst if it exists: os.replace (python 3), or os.rename on python 2, which replaces
+#dst only on POSIX (on Windows dst is removed first, so the replacement is not atomic there)
+def replace_file(src,dst):
+    if hasattr(os,'replace'):
+        os.replace(src,dst)
+    else:
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src,dst)
+
+#on-disk cache: one file <symbol>.npz per symbol holding, per field, the dates and prices and the ranges fetched
+class PriceCache(object):
+
+    def __init__(self,path):
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def filename(self,symbol):
+        return os.path.join(self.path,quote(symbol,safe='')+'.npz')
+
+    #{field: (dates, prices, covered ranges)} of a symbol
+    def load(self,symbol):
+        if not os.path.exists(self.filename(symbol)):
+            return {}
+        with np.load(self.filename(symbol)) as data:
+            return dict((field,(data[field+'_dates'],data[field],[tuple(r) for r in data[field+'_covered']]))
+                        for field in fields if field+'_dates' in data.files)
+
+    def save(self,symbol,cached):
+        arrays = {}
+        for field,(dates,prices,covered) in cached.items():
+            arrays[field+'_dates'] = dates
+            arrays[field] = prices
+            arrays[field+'_covered'] = np.array(covered,dtype='datetime64[D]').reshape(-1,2)
+        tmp = self.filename(symbol)+'.tmp.npz'
+        np.savez(tmp,**arrays)
+        replace_file(tmp,self.filename(symbol)) #the cache file is replaced at once
+
+#prices of one symbol between start and end, from the cache and the missing date ranges downloaded
+def fetch_symbol(symbol,start,end,fields,cache,base_url,retries=4,backoff=0.25):
+    #returns {field: (dates, prices)} between start and end (datetime64[D], included)
+    cached = cache.load(symbol) if cache is not None else {}
+    missing = []
+    for field in fields:
+        missing.extend(missing_ranges(cached[field][2] if field in cached else [],start,end))
+    missing = merge_ranges(missing)
+
+    for s,e in missing:
+        text = fetch_url(url_template % {'base': base_url, 'symbol': quote(symbol,safe=''), 'start': s, 'end': e},retries,backoff)
+        dates,downloaded = parse_symbol_csv(text.splitlines())
+        #a requested field missing from the CSV file is recorded as fetched with no prices, not requested again
+        for field in list(downloaded)+[field for field in fields if field not in downloaded]:
+            old_dates,old_prices,covered = cached.get(field,(np.zeros(0,dtype='datetime64[D]'),np.zeros(0),[]))
+            prices = downloaded.get(field,np.zeros(0))
+            keep = (old_dates < s) | (old_dates > e) #the prices downloaded replace those of the range
+            all_dates = np.concatenate([old_dates[keep],dates if field in downloaded else dates[:0]])
+            order = np.argsort(all_dates,kind='mergesort')
+            cached[field] = (all_dates[order],np.concatenate([old_prices[keep],prices])[order],merge_ranges(covered+[(s,e)]))
+    if missing and cache is not None:
+        cache.save(symbol,cached)
+
+    res = {}
+    for field in fields:
+        dates,prices,covered = cached.get(field,(np.zeros(0,dtype='datetime64[D]'),np.zeros(0),[]))
+        inside = (dates >= start) & (dates <= end)
+        res[field] = (dates[inside],prices[inside])
+    return res
+
+#prices of many symbols, fetched concurrently
+def fetch(symbols,start,end,fields=['close'],cache_dir=None,base_url=None,connections=8,retries=4,backoff=0.25):
+    #symbols: list of symbols, start and end: first and last dates (datetime, date, datetime64 or 'YYYY-MM-DD')
+    #fields: fields of price_store.fields; cache_dir: directory of the cache, None for no cache
+    #base_url: base of the URLs of the CSV files (see url_template); connections: maximum concurrent requests
+    #returns {symbol: {field: (dates, prices)}}
+    start,end = to_days([start,end])
+    symbols = list(OrderedDict.fromkeys(symbols)) #a symbol is fetched once, by a single thread writing its cache file
+    cache = PriceCache(cache_dir) if cache_dir is not None else None
+    task = lambda symbol: fetch_symbol(symbol,start,end,fields,cache,base_url,retries,backoff)
+    if connections == 1 or len(symbols) <= 1:
+        data = [task(symbol) for symbol in symbols]
+    else:
+        pool = ThreadPool(min(connections,len(symbols)))
+        try:
+            data = pool.map(task,symbols)
+        finally:
+            pool.close()
+            pool.join()
+    return dict(zip(symbols,data))
+
+#prices of many symbols as pandas DataFrames (dates x symbols, on the union of the dates), one per field, or a single
+#DataFrame if fields is a string
+def get_data(symbols,start,end,fields='close',**options):
+    import pandas as pd
+    data = fetch(symbols,start,end,list(np.atleast_1d(fields)),**options)
+    frames = []
+    for field in np.atleast_1d(fields):
+        frames.append(pd.DataFrame(dict((symbol,pd.Series(data[symbol][field][1],index=pd.DatetimeIndex(data[symbol][field][0])))
+                                        for symbol in symbols),columns=symbols))
+    return frames[0] if isinstance(fields,str) else frames
+
+class ThreadingHTTPServer(ThreadingMixIn,HTTPServer):
+    daemon_threads = True
+
+#local HTTP stand-in for the price server: serves <directory>/<symbol>.csv restricted to the start and end dates
+#of the query, with an optional latency (seconds per request) and failure rate (fraction of the requests answered
+#with a 503 error); the paths of the requests are recorded in server.requests
+def serve_fixtures(directory,port=0,latency=0.0,failure_rate=0.0,seed=0):
+    #returns the server (running in a background thread, stop it with server.shutdown()) and its base URL
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            with lock:
+                self.server.requests.append(self.path)
+                fail = rng.random() < failure_rate
+            if latency > 0:
+                time.sleep(latency)
+            if fail:
+                self.send_error(503)
+                return
+            name = os.path.join(directory,unquote(os.path.basename(url.path)))
+            if not os.path.exists(name):
+                self.send_error(404)
+                return
+            query = parse_qs(url.query)
+            start = query.get('start',['0000-00-00'])[0]
+            end = query.get('end',['9999-99-99'])[0]
+            with open(name) as f:
+                lines = f.read().splitlines()
+            body = '\n'.join(lines[:1]+[line for line in lines[1:] if start <= line[:10] <= end])+'\n'
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type','text/csv')
+            self.send_header('Content-Length',str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self,*args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1',port),Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server,'http://127.0.0.1:%d' % server.server_address[1]
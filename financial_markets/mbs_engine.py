@@ -0,0 +1,80 @@
+''' vectorized projection of the cash flows of pass-through mortgage-backed securities for many pools at once
+    (pools x months arrays), with the PSA prepayment model of MBS.py '''
+
+import numpy as np
+
+#PSA benchmark: CPR (constant prepayment rate) interpolated linearly between these months, then constant
+PSA_parameter_time=[1,30,240]
+PSA_parameter_rate=[0.002,0.06,0.06]
+
+#CPR of the PSA model for the given months (since origination) and PSA multipliers
+def PSA_CPR(age,multiplier,PSA_parameter_time=PSA_parameter_time,PSA_parameter_rate=PSA_parameter_rate):
+    #age is the month since origination of the loans (1 for the first month)
+    #multiplier is the multiplier for PSA prepayment model (1.0 for 100 PSA)
+    t,rate = PSA_parameter_time,PSA_parameter_rate
+    CPR = np.where(age < t[1],
+                   rate[0]+(age-t[0])*(rate[1]-rate[0])/float(t[1]-t[0]),
+                   rate[1]+(age-t[1])*(rate[2]-rate[1])/float(t[2]-t[1]))
+    return CPR*multiplier
+
+#project the cash flows of pass-through pools
+def project_pools(initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r,cash_flows=True,
+                  PSA_parameter_time=PSA_parameter_time,PSA_parameter_rate=PSA_parameter_rate):
+    #one value per pool (arrays broadcast against each other, or scalars):
+    #initial_balance is the mortgage balance (USD) at the start of the projection
+    #mortgage_rate is the annualized mortgage rate (0.0475 for 4.75%)
+    #passthrough_rate is the annualized pass-through rate
+    #seasoning is how old is the mortgage pool (in months)
+    #terms is the term of loan in months
+    #multiplier is the multiplier for PSA prepayment model (1.0 for 100 PSA)
+    #r is the annualized risk free interest rate used to discount the cash flows
+    #cash_flows: also return the monthly cash flows, arrays of shape (pools, months) (zero after the last payment)
+    #returns a dictionary of arrays with, per pool, the present values of the principal only (PV_PO) and interest only (PV_IO)
+    #MBS, the average lives average_life and average_IO_life (in years), and the total principal (TP) and interest (TI)
+    initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r = \
+        [np.atleast_1d(np.asarray(x,dtype=float))[:,np.newaxis] for x in
+         np.broadcast_arrays(initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r)]
+    months = int(np.max(terms-seasoning))
+    month = np.arange(1,months+1,dtype=float)[np.newaxis,:]
+    remaining = terms-seasoning-month+1.0 #months left to pay at the start of each month
+    paying = remaining > 0
+
+    CPR = np.where(paying,PSA_CPR(month+seasoning,multiplier,PSA_parameter_time,PSA_parameter_rate),0.0)
+    SMM = 1.0-(1.0-CPR)**(1./12.) #single monthly mortality
+    c = mortgage_rate/12.
+    with np.errstate(divide='ignore',invalid='ignore',over='ignore'):
+        payment_rate = np.where(paying,c/(1.0-(1.0+c)**(-remaining)),0.0) #monthly payment per unit of beginning balance
+    #the ending balance is the beginning balance less the scheduled principal repayment and the prepayment:
+    #the balances are cumulative products of the monthly factors
+    factor = np.where(paying,(1.0-(payment_rate-c))*(1.0-SMM),0.0)
+    ending_balance = initial_balance*np.cumprod(factor,axis=1)
+    beginning_balance = np.where(paying,np.hstack([initial_balance,ending_balance[:,:-1]]),0.0) #no rounding residue after the last payment
+
+    monthly_payment = beginning_balance*payment_rate
+    monthly_interest_paid = beginning_balance*c
+    monthly_interest_passed = beginning_balance*passthrough_rate/12.
+    scheduled_principal_repayment = monthly_payment-monthly_interest_paid
+    prepayment = (beginning_balance-scheduled_principal_repayment)*SMM
+    total_principal_repayment = scheduled_principal_repayment+prepayment
+
+    res = {}
+    discount = (1.0+r/12.0)**(-month)
+    res['TP'] = total_principal_repayment.sum(axis=1) #total principal amount
+    res['TI'] = monthly_interest_passed.sum(axis=1)   #total interest amount
+    res['average_life'] = np.dot(total_principal_repayment,month[0])/12./res['TP']
+    res['average_IO_life'] = np.dot(monthly_interest_passed,month[0])/12./res['TI']
+    res['PV_PO'] = (total_principal_repayment*discount).sum(axis=1) #present value of principal only MBS
+    res['PV_IO'] = (monthly_interest_passed*discount).sum(axis=1)   #present value of interest only MBS
+    if cash_flows:
+        res['month'] = month[0]
+        res['CPR'] = CPR
+        res['SMM'] = SMM
+        res['beginning_balance'] = beginning_balance
+        res['monthly_payment'] = monthly_payment
+        res['monthly_interest_paid'] = monthly_interest_paid
+        res['monthly_interest_passed'] = monthly_interest_passed
+        res['scheduled_principal_repayment'] = scheduled_principal_repayment
+        res['prepayment'] = prepayment
+        res['total_principal_repayment'] = total_principal_repayment
+        res['ending_balance'] = ending_balance
+    return res
@@ -0,0 +1,142 @@
+''' Monte Carlo pricing of a pass-through mortgage-backed security on short-rate paths and option-adjusted spread (OAS)
+the monthly short rates follow the binomial dynamics of short_rate_lattice (up by u or down by d with probability 1/2,
+r=r0*u**(i-j)*d**j after i months with j down moves); the prepayments follow the PSA model of MBS.py scaled by
+a refinancing incentive, so that they depend on the path of the rates
+the cash flows are discounted month by month at the short rate plus the spread: 1/(1+(r+spread)/12)
+paths are drawn with antithetic variates (every path has its mirror path with up and down moves swapped) and from
+fixed seeds, so that prices with different spreads or bumped rates use common random numbers
+'''
+
+import multiprocessing
+import numpy as np
+from financial_markets import derivative_pricing as dp
+from financial_markets.mbs_engine import PSA_CPR
+
+#parameters of the pool and of the models, as in MBS.py (rates in decimal)
+default_parameters = {
+    'initial_balance': 417000.,  #initial mortgage balance (USD)
+    'mortgage_rate': 0.0475,     #annualized mortgage rate
+    'passthrough_rate': 0.0475,  #annualized pass-through rate
+    'seasoning': 0,              #how old is the mortgage pool (in months)
+    'terms': 360,                #term of loan in months
+    'multiplier': 1.0,           #multiplier for PSA prepayment model
+    'r0': 0.035,                 #annualized short rate at t=0
+    'u': 1.01,                   #monthly factor by which the short rate goes up
+    'd': 0.99,                   #monthly factor by which the short rate goes down
+    'mortgage_spread': 0.015,    #spread of the current mortgage rate over the short rate
+    'refinancing': 25.0,         #sensitivity of the prepayments to the refinancing incentive (mortgage rate - current mortgage rate)
+    'max_CPR': 0.95,             #cap of the annual prepayment rate
+}
+
+#monthly short rates along paths of the binomial short-rate lattice
+def simulate_short_rates(r0,u,d,months,paths,seed=0,antithetic=True):
+    #returns an array (paths, months): the rate of month t (applied from t to t+1), r0 for the first month
+    rng = np.random.RandomState(seed)
+    n = (paths+1)//2 if antithetic else paths
+    down = rng.randint(0,2,(n,months-1))
+    if antithetic:
+        down = np.vstack([down,1-down])[:paths]
+    j = np.hstack([np.zeros((paths,1),dtype=int),np.cumsum(down,axis=1)]) #number of down moves
+    i = np.arange(months)[np.newaxis,:]
+    return dp.lattice_nodes(u,d,r0,i,j)
+
+#monthly cash flows (principal and pass-through interest) of the pool along rate paths
+def path_cash_flows(rates,p):
+    #rates are the short-rate paths (paths, months), p the parameters (see default_parameters)
+    months = int(p['terms']-p['seasoning'])
+    month = np.arange(1,months+1,dtype=float)
+    remaining = p['terms']-p['seasoning']-month+1.0
+    c = p['mortgage_rate']/12.
+    payment_rate = c/(1.0-(1.0+c)**(-remaining)) #monthly payment per unit of beginning balance
+    incentive = p['mortgage_rate']-(rates[:,:months]+p['mortgage_spread'])
+    CPR = np.minimum(PSA_CPR(month+p['seasoning'],p['multiplier'])*np.exp(p['refinancing']*incentive),p['max_CPR'])
+    SMM = 1.0-(1.0-CPR)**(1./12.)
+    factor = (1.0-(payment_rate-c))*(1.0-SMM)
+    ending_balance = p['initial_balance']*np.cumprod(factor,axis=1)
+    beginning_balance = np.hstack([np.full((len(rates),1),float(p['initial_balance'])),ending_balance[:,:-1]])
+    return beginning_balance-ending_balance+beginning_balance*p['passthrough_rate']/12.
+
+#sums over paths of the present values and of their derivatives with respect to the spread
+def path_values(cash_flows,rates,spread):
+    growth = 1.0+(rates[:,:cash_flows.shape[1]]+spread)/12.
+    discount = np.exp(-np.cumsum(np.log(growth),axis=1))
+    duration = np.cumsum(1.0/(12.*growth),axis=1) #minus the derivative of log(discount) with respect to the spread
+    value = cash_flows*discount
+    return value.sum(),-(value*duration).sum()
+
+#paths of one block: seed, number of paths and parameters
+def block_paths(seed,paths,p):
+    rates = simulate_short_rates(p['r0'],p['u'],p['d'],int(p['terms']-p['seasoning']),paths,seed)
+    return path_cash_flows(rates,p),rates
+
+#worker task: sums of the values and derivatives of a block of paths, regenerated from its seed
+def block_values(task):
+    seed,paths,p,spread = task
+    cash_flows,rates = block_paths(seed,paths,p)
+    return path_values(cash_flows,rates,spread)
+
+#price of the pool as a function of the spread, on a fixed set of paths split into blocks of block_size paths with
+#their own seeds: the paths depend on seed, paths and block_size only, not on the number of processes
+#with processes=1 the paths are generated once and kept in memory, otherwise each evaluation fans the blocks out
+#across a process pool (the blocks are regenerated from their seeds, so only seeds and sums are exchanged)
+class MBSPaths(object):
+
+    def __init__(self,parameters=None,paths=10000,seed=0,block_size=1000,processes=1):
+        self.p = dict(default_parameters)
+        if parameters is not None:
+            self.p.update(parameters)
+        self.paths = paths
+        self.processes = processes
+        sizes = [min(block_size,paths-start) for start in range(0,paths,block_size)]
+        self.tasks = [(seed*100003+k,int(n)) for k,n in enumerate(sizes)]
+        self.pool = None
+        if processes == 1:
+            self.blocks = [block_paths(s,n,self.p) for s,n in self.tasks]
+        else:
+            self.pool = multiprocessing.Pool(processes)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    #price and derivative of the price with respect to the spread
+    def value(self,spread):
+        if self.pool is None:
+            sums = [path_values(cash_flows,rates,spread) for cash_flows,rates in self.blocks]
+        else:
+            sums = self.pool.map(block_values,[(s,n,self.p,spread) for s,n in self.tasks])
+        value,derivative = np.sum(sums,axis=0)
+        return value/self.paths,derivative/self.paths
+
+    #option-adjusted spread: spread such that the price is the market price (Newton iterations)
+    def oas(self,market_price,spread=0.0,tol=1e-10,maxiter=50):
+        for it in range(maxiter):
+            value,derivative = self.value(spread)
+            step = (value-market_price)/derivative
+            spread -= step
+            if abs(step) < tol:
+                return spread
+        raise RuntimeError('OAS did not converge')
+
+#option-adjusted spread of a pool for a market price
+def solve_oas(market_price,parameters=None,paths=10000,seed=0,processes=1):
+    #parameters override default_parameters; paths is the number of Monte Carlo paths, processes the number of worker processes
+    mbs = MBSPaths(parameters,paths,seed,processes=processes)
+    try:
+        return mbs.oas(market_price)
+    finally:
+        mbs.close()
+
+#effective duration and convexity at a given OAS, bumping r0 by +-dr (same random moves for all the prices)
+def effective_duration(oas,parameters=None,dr=0.0001,paths=10000,seed=0):
+    prices = []
+    for shift in (0.0,dr,-dr):
+        p = dict(default_parameters)
+        if parameters is not None:
+            p.update(parameters)
+        p['r0'] += shift
+        prices.append(MBSPaths(p,paths,seed).value(oas)[0])
+    P,Pu,Pd = prices
+    return (Pd-Pu)/(2.0*dr*P),(Pu+Pd-2.0*P)/(dr**2*P)
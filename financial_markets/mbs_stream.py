@@ -0,0 +1,79 @@
+''' streaming projection of pass-through pool (or loan-level) tapes larger than memory: the tape is read in chunks,
+    each chunk is projected by mbs_engine.project_pools and the results are written to disk chunk after chunk,
+    so memory is bounded by the chunk size whatever the size of the tape
+the tape is a CSV or Parquet file with the columns initial_balance, mortgage_rate, passthrough_rate, seasoning, terms,
+multiplier (as in project_pools, rates in decimal) and optionally pool (identifier of the pool or loan)
+requires pandas for CSV files and pyarrow for Parquet files
+'''
+
+import numpy as np
+from financial_markets.mbs_engine import project_pools
+from financial_markets.results import is_parquet, ChunkWriter
+
+tape_fields = ['initial_balance','mortgage_rate','passthrough_rate','seasoning','terms','multiplier']
+pool_results = ['PV_PO','PV_IO','average_life','average_IO_life','TP','TI']
+monthly_cash_flows = ['CPR','SMM','beginning_balance','monthly_payment','monthly_interest_paid','monthly_interest_passed',
+                      'scheduled_principal_repayment','prepayment','total_principal_repayment','ending_balance']
+
+#chunks of a tape, as dictionaries of arrays
+def read_tape(path,chunksize=10000):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield dict((name,batch.column(k).to_numpy(zero_copy_only=False)) for k,name in enumerate(batch.schema.names))
+    else:
+        import pandas as pd
+        for df in pd.read_csv(path,chunksize=chunksize):
+            yield dict((name,df[name].values) for name in df.columns)
+
+#project a tape chunk after chunk
+def stream_tape(path,r,pool_output=None,cash_flow_output=None,chunksize=10000):
+    #path is the CSV or Parquet tape
+    #r is the annualized risk free interest rate used to discount the cash flows
+    #pool_output: file receiving one row per pool with the pool_results (PV_PO, PV_IO, average lives, total principal and interest)
+    #cash_flow_output: file receiving one row per pool and month with the monthly_cash_flows (until the last payment of the pool)
+    #chunksize is the number of pools projected at a time (memory is about 150 bytes per pool and month of the chunk)
+    #returns the aggregate results of the tape: number of pools, sum of PV_PO, PV_IO, TP and TI, average lives weighted by
+    #the principal and interest, and the monthly principal and interest passed through by the whole tape
+    agg = {'pools': 0, 'PV_PO': 0.0, 'PV_IO': 0.0, 'TP': 0.0, 'TI': 0.0,
+           'total_principal_repayment': np.zeros(0), 'monthly_interest_passed': np.zeros(0)}
+    life = 0.0
+    IO_life = 0.0
+    pool_writer = None if pool_output is None else ChunkWriter(pool_output,['pool']+pool_results)
+    cash_flow_writer = None if cash_flow_output is None else ChunkWriter(cash_flow_output,['pool','month']+monthly_cash_flows)
+    try:
+        for chunk in read_tape(path,chunksize):
+            n = len(chunk[tape_fields[0]])
+            pool = chunk.get('pool',np.arange(agg['pools'],agg['pools']+n))
+            res = project_pools(*[chunk[field] for field in tape_fields],r=r,cash_flows=True)
+
+            agg['pools'] += n
+            for field in ('PV_PO','PV_IO','TP','TI'):
+                agg[field] += res[field].sum()
+            life += np.dot(res['average_life'],res['TP'])
+            IO_life += np.dot(res['average_IO_life'],res['TI'])
+            for field in ('total_principal_repayment','monthly_interest_passed'):
+                monthly = res[field].sum(axis=0)
+                if len(monthly) > len(agg[field]):
+                    agg[field] = np.concatenate([agg[field],np.zeros(len(monthly)-len(agg[field]))])
+                agg[field][:len(monthly)] += monthly
+
+            if pool_writer is not None:
+                table = dict((field,res[field]) for field in pool_results)
+                table['pool'] = pool
+                pool_writer.write(table)
+            if cash_flow_writer is not None:
+                paying = res['month'][np.newaxis,:] <= (np.asarray(chunk['terms'])-np.asarray(chunk['seasoning']))[:,np.newaxis]
+                rows,months = np.nonzero(paying)
+                table = dict((field,res[field][paying]) for field in monthly_cash_flows)
+                table['pool'] = np.asarray(pool)[rows]
+                table['month'] = res['month'][months]
+                cash_flow_writer.write(table)
+    finally:
+        for writer in (pool_writer,cash_flow_writer):
+            if writer is not None:
+                writer.close()
+
+    agg['average_life'] = life/agg['TP'] if agg['TP'] > 0 else 0.0
+    agg['average_IO_life'] = IO_life/agg['TI'] if agg['TI'] > 0 else 0.0
+    return agg
@@ -0,0 +1,71 @@
+''' rolling risk analytics of many portfolios at once, as computed by portfolio.py for a single portfolio over its
+whole history: regression of the daily excess returns of the portfolio on those of the market (S&P 500)
+    y-Rf = alpha + beta*(x-Rf)
+with beta, Jensen's alpha (annualized as (1+alpha)**252-1), R-squared, adjusted R-squared and the annualized Sharpe
+ratio, over every window of the given number of days
+the statistics of all the windows come from the cumulative sums of x, y, x*y, x**2 and y**2 (differences of two
+cumulative sums give the sums over a window), so there is no refit per window
+'''
+
+import numpy as np
+
+#daily values of buy-and-hold portfolios: holdings (portfolios x tickers, numbers of shares) and prices (dates x tickers)
+def portfolio_values(holdings,prices):
+    return np.dot(prices,np.asarray(holdings,dtype=float).T)
+
+#daily returns of portfolios: weights (portfolios x tickers, fractions of the value) and returns (dates x tickers)
+def portfolio_returns(weights,returns):
+    return np.dot(returns,np.asarray(weights,dtype=float).T)
+
+#daily returns of a series or panel of values (dates x ...), one date less
+def daily_returns(values):
+    values = np.asarray(values,dtype=float)
+    return values[1:]/values[:-1]-1.0
+
+#cumulative sums along the dates with a leading 0: the sum over dates a..b-1 is S[b]-S[a]
+def cumulative(x):
+    S = np.zeros((len(x)+1,)+x.shape[1:])
+    np.cumsum(x,axis=0,out=S[1:])
+    return S
+
+#rolling regression statistics of portfolio returns y (dates x portfolios, or dates) on market returns x (dates)
+def rolling_statistics(y,x,window,Rf=0.0,periods=252):
+    #window is the number of days of each window (len(x) for the whole sample)
+    #Rf is the daily risk-free rate, periods the number of days per year used to annualize
+    #returns a dictionary of arrays (windows x portfolios) for the windows ending on dates window-1..len(x)-1
+    #(the date of the end of each window is in 'end'): beta, alpha (daily), jensen_alpha (annualized),
+    #r2, r2_adj, sharpe (annualized) and the mean and standard deviation of the daily excess returns
+    y = np.asarray(y,dtype=float)-Rf
+    x = np.asarray(x,dtype=float)-Rf
+    if y.ndim == 2:
+        x = x[:,np.newaxis]
+    #the market excess returns are centered on their mean to limit the cancellation in the window variances
+    x0 = x.mean(axis=0)
+    y0 = y.mean(axis=0)
+    x = x-x0
+    y = y-y0
+    n = float(window)
+    sums = {}
+    for name,z in (('x',x),('y',y),('xx',x*x),('yy',y*y),('xy',x*y)):
+        S = cumulative(z)
+        sums[name] = S[window:]-S[:-window]
+    Sx,Sy = sums['x'],sums['y']
+    Sxx = sums['xx']-Sx*Sx/n #sums of the squared deviations from the window means
+    Syy = sums['yy']-Sy*Sy/n
+    Sxy = sums['xy']-Sx*Sy/n
+    res = {'end': np.arange(window-1,len(x))}
+    with np.errstate(divide='ignore',invalid='ignore'):
+        res['beta'] = Sxy/Sxx
+        res['alpha'] = (Sy/n+y0)-res['beta']*(Sx/n+x0)
+        res['jensen_alpha'] = (1.0+res['alpha'])**periods-1.0
+        res['r2'] = Sxy*Sxy/(Sxx*Syy)
+        res['r2_adj'] = 1.0-(1.0-res['r2'])*(n-1.0)/(n-2.0)
+        res['mean'] = Sy/n+y0
+        res['std'] = np.sqrt(np.maximum(Syy,0.0)/(n-1.0))
+        res['sharpe'] = res['mean']/res['std']*np.sqrt(periods)
+    return res
+
+#statistics of the whole sample (the single regression of portfolio.py), as scalars or arrays (portfolios)
+def regression_statistics(y,x,Rf=0.0,periods=252):
+    res = rolling_statistics(y,x,len(x),Rf,periods)
+    return dict((name,value[0]) for name,value in res.items() if name != 'end')
@@ -0,0 +1,181 @@
+''' local columnar store of daily stock prices, read through memory maps instead of parsing CSV files
+the store is a directory with one array (dates x symbols, float64, NaN where there is no price) per field
+    open.npy high.npy low.npy close.npy volume.npy actual_close.npy
+and the index files dates.npy (datetime64[D], increasing) and symbols.txt (one symbol per line), plus optional
+symbol lists lists/<name>.txt
+as in QSTK's DataAccess('Yahoo'), close is the adjusted close and actual_close the close of the Yahoo CSV files
+ingest builds the store from per-symbol CSV files (Date,Open,High,Low,Close,Volume,Adj Close as in the QSData/Yahoo
+directory of QSTK, or as downloaded from Yahoo); PriceStore.get_data can replace DataAccess.get_data in the scripts
+usage: price-store csv_directory store_directory [list_file ...]   (or python -m financial_markets.price_store ...)
+    the symbol lists are the list files given (one symbol per line, named after the file without .txt, such as
+    sp5002012.txt) and those of the Lists subdirectory of csv_directory (as in QSData/Yahoo/Lists of QSTK)
+'''
+
+import os
+import csv
+import numpy as np
+
+#directory of the store read by Bollinger.py, event_study.py and portfolio.py (environment variable PRICE_STORE),
+#None to use QSTK's DataAccess and the Yahoo downloads
+store_path = os.environ.get('PRICE_STORE')
+
+fields = ['open','high','low','close','volume','actual_close']
+csv_columns = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Adj Close', 'volume': 'Volume', 'actual_close': 'Close'}
+
+#dates (datetime64, datetime, Timestamp or 'YYYY-MM-DD' strings) as an array of datetime64[D] (the time of the day is dropped)
+def to_days(dates):
+    dates = np.asarray(dates)
+    if dates.dtype.kind == 'M':
+        return dates.astype('datetime64[D]')
+    return dates.astype('datetime64[us]').astype('datetime64[D]')
+
+#dates and prices of a per-symbol CSV file
+def read_symbol_csv(filename):
+    #returns the dates (datetime64[D], increasing) and a dictionary of price arrays, one per field
+    with open(filename) as f:
+        return parse_symbol_csv(f)
+
+#dates and prices of the lines of a per-symbol CSV file (header line first)
+def parse_symbol_csv(lines):
+    rows = list(csv.reader(lines))
+    header = [name.strip().lower() for name in rows[0]]
+    rows = [row for row in rows[1:] if row]
+    dates = to_days([row[header.index('date')] for row in rows]) if rows else np.zeros(0,dtype='datetime64[D]')
+    order = np.argsort(dates,kind='mergesort')
+    prices = {}
+    for field in fields:
+        column = csv_columns[field].lower()
+        if column in header:
+            k = header.index(column)
+            prices[field] = np.array([float(row[k]) if row[k] not in ('','null') else np.nan for row in rows],dtype=float)[order]
+    return dates[order],prices
+
+#builds a store from per-symbol CSV files
+def ingest(csv_files,path,lists=None):
+    #csv_files: directory of <symbol>.csv files, or list of CSV files (the symbol is the file name without .csv)
+    #path: directory of the store (created if needed, the arrays already there are replaced)
+    #lists: dictionary of symbol lists {name: [symbols]} saved with the store (see PriceStore.get_symbols_from_list)
+    if isinstance(csv_files,str):
+        csv_files = sorted(os.path.join(csv_files,name) for name in os.listdir(csv_files) if name.lower().endswith('.csv'))
+    symbols = [os.path.splitext(os.path.basename(name))[0] for name in csv_files]
+    data = [read_symbol_csv(name) for name in csv_files]
+    dates = np.unique(np.concatenate([d for d,prices in data])) if data else np.zeros(0,dtype='datetime64[D]')
+
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    np.save(os.path.join(path,'dates.npy'),dates)
+    with open(os.path.join(path,'symbols.txt'),'w') as f:
+        f.write(''.join(symbol+'\n' for symbol in symbols))
+    for field in fields:
+        x = np.lib.format.open_memmap(os.path.join(path,field+'.npy'),mode='w+',dtype=float,shape=(len(dates),len(symbols)))
+        x[:] = np.nan
+        for k,(d,prices) in enumerate(data):
+            if field in prices:
+                x[np.searchsorted(dates,d),k] = prices[field]
+        x.flush()
+        del x
+    if lists:
+        if not os.path.isdir(os.path.join(path,'lists')):
+            os.makedirs(os.path.join(path,'lists'))
+        for name,members in lists.items():
+            with open(os.path.join(path,'lists',name+'.txt'),'w') as f:
+                f.write(''.join(symbol+'\n' for symbol in members))
+
+#symbol lists {name: [symbols]} of list files (one symbol per line, the name is the file name without .txt)
+def read_symbol_lists(list_files):
+    lists = {}
+    for name in list_files:
+        with open(name) as f:
+            lists[os.path.splitext(os.path.basename(name))[0]] = [line.strip() for line in f if line.strip()]
+    return lists
+
+#forward fill, then backward fill, then value of the missing prices along the dates (the fillna sequence of the scripts)
+def fill_missing(x,value=1.0):
+    x = np.array(x,dtype=float)
+    n = len(x)
+    valid = ~np.isnan(x)
+    last = np.maximum.accumulate(np.where(valid,np.arange(n)[:,np.newaxis],-1),axis=0)
+    first = np.minimum.accumulate(np.where(valid,np.arange(n)[:,np.newaxis],n)[::-1],axis=0)[::-1]
+    source = np.where(last >= 0,last,first)
+    found = source < n
+    columns = np.broadcast_to(np.arange(x.shape[1]),x.shape)
+    x[found] = x[source[found],columns[found]]
+    x[~found] = value
+    return x
+
+#read access to a store
+class PriceStore(object):
+
+    def __init__(self,path):
+        self.path = path
+        self.dates = np.load(os.path.join(path,'dates.npy'))
+        with open(os.path.join(path,'symbols.txt')) as f:
+            self.symbols = [line.strip() for line in f if line.strip()]
+        self.column = dict((symbol,k) for k,symbol in enumerate(self.symbols))
+        self.arrays = {}
+
+    #memory-mapped array (dates x symbols) of a field, opened on first use
+    def field(self,name):
+        if name not in self.arrays:
+            self.arrays[name] = np.load(os.path.join(self.path,name+'.npy'),mmap_mode='r')
+        return self.arrays[name]
+
+    def get_symbols_from_list(self,name):
+        with open(os.path.join(self.path,'lists',name+'.txt')) as f:
+            return [line.strip() for line in f if line.strip()]
+
+    #dates of the store between start and end (included), as datetime64[D], or at timeofday (datetime.timedelta, such as
+    #the 16:00 close of QSTK's getNYSEdays) if given
+    def trading_days(self,start=None,end=None,timeofday=None):
+        lo = 0 if start is None else np.searchsorted(self.dates,to_days([start])[0],'left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates,to_days([end])[0],'right')
+        if timeofday is None:
+            return self.dates[lo:hi]
+        return self.dates[lo:hi]+np.timedelta64(timeofday)
+
+    #prices (dates x symbols) of a field for the given dates and symbols (NaN for the dates and symbols not in the store)
+    def load(self,name,dates=None,symbols=None):
+        x = self.field(name)
+        if symbols is None:
+            columns = np.arange(len(self.symbols))
+        else:
+            columns = np.array([self.column.get(symbol,-1) for symbol in symbols],dtype=int)
+        if dates is None:
+            rows = slice(None)
+            found = np.ones(len(self.dates),dtype=bool)
+        else:
+            dates = to_days(dates)
+            rows = np.searchsorted(self.dates,dates)
+            found = rows < len(self.dates)
+            found[found] = self.dates[rows[found]] == dates[found]
+            if not found.any():
+                return np.full((len(dates),len(columns)),np.nan)
+            rows = np.where(found,rows,0)
+            if found.all() and np.all(np.diff(rows) == 1):
+                rows = slice(rows[0],rows[-1]+1) #contiguous dates: a view of the memory map, no fancy indexing on the rows
+        block = x[rows]
+        res = np.array(block if symbols is None else block[:,columns.clip(0)])
+        res[:,columns < 0] = np.nan
+        res[~found] = np.nan
+        return res
+
+    #drop-in replacement of DataAccess.get_data: one pandas DataFrame (timestamps x symbols) per key, or a single DataFrame
+    #if keys is a string
+    def get_data(self,timestamps,symbols,keys):
+        import pandas as pd
+        frames = [pd.DataFrame(self.load(key,timestamps,symbols),index=timestamps,columns=symbols) for key in np.atleast_1d(keys)]
+        return frames[0] if isinstance(keys,str) else frames
+
+#price-store csv_directory store_directory [list_file ...]: ingests the CSV files of a directory and the
+#symbol lists into a store
+def main():
+    import sys
+    csv_directory,path = sys.argv[1],sys.argv[2]
+    list_files = sys.argv[3:]
+    list_directory = os.path.join(csv_directory,'Lists')
+    if os.path.isdir(list_directory):
+        list_files += sorted(os.path.join(list_directory,name) for name in os.listdir(list_directory) if name.endswith('.txt'))
+    ingest(csv_directory,path,read_symbol_lists(list_files))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+''' precomputed surfaces of American option prices, to quote without rolling back a tree per request
+an option price is homogeneous in (S0, K): price(S0,K,T,r,c,sigma) = K*price(S0/K,1,T,r,c,sigma), so a surface holds
+the prices per unit of strike of the binomial trees of implied.lattice_option_prices (N periods) on a grid of
+moneyness S0/K, T, sigma, r and c, with the early-exercise boundary (critical moneyness S*/K below which a put, or
+above which a call, is exercised at once) on the grid of T, sigma, r and c
+a surface is saved as a directory of .npy files (one per axis, the prices, their spline coefficients and the
+boundary) read back memory-mapped, and is queried by multilinear or cubic spline interpolation
+validate measures the interpolation errors against direct lattice pricing at random points of the grid, and refine
+adds grid points in the middle of the intervals where the errors are above a tolerance and rebuilds the surface,
+reusing the prices of the grid points already computed
+'''
+
+import os
+import numpy as np
+from financial_markets.implied import lattice_option_prices
+
+axes = ['moneyness','T','sigma','r','c']
+methods = ['linear','spline']
+
+#grid of the surfaces of quotes with 1 month to 2 years to expiration
+def default_grid():
+    return {'moneyness': np.linspace(0.5,1.6,45),
+            'T': np.array([1/52.,1/12.,2/12.,3/12.,4/12.,6/12.,9/12.,1.,1.5,2.]),
+            'sigma': np.linspace(0.05,0.8,16),
+            'r': np.linspace(0.0,0.08,5),
+            'c': np.linspace(0.0,0.06,4)}
+
+#prices per unit of strike at all the points of a grid (in the order of axes), computed chunksize trees at a time
+def grid_prices(grid,cp,N,chunksize=4096,todo=None):
+    #todo: mask of the points to price (the others are NaN), None for all
+    points = [x.ravel() for x in np.meshgrid(*[grid[axis] for axis in axes],indexing='ij')]
+    prices = np.full(len(points[0]),np.nan)
+    index = np.arange(len(prices)) if todo is None else np.nonzero(np.ravel(todo))[0]
+    for start in range(0,len(index),chunksize):
+        k = index[start:start+chunksize]
+        m,T,sigma,r,c = [x[k] for x in points]
+        prices[k] = lattice_option_prices(m,1.0,T,r,c,sigma,cp,True,N)
+    return prices.reshape([len(grid[axis]) for axis in axes])
+
+#critical moneyness on the grid of T, sigma, r and c from the prices along the moneyness axis
+def exercise_boundary(moneyness,prices,cp):
+    #the option is exercised at once where its price is its payoff; the boundary lies between the last such grid
+    #point and the next one, where the early-exercise premium grows as the square of the distance to the boundary
+    #(smooth pasting): the square roots of the premiums at the two next points are extrapolated linearly to zero
+    #0 for puts and +inf for calls where the option is never exercised at once on the grid
+    m,p = (moneyness,prices) if cp < 0 else (moneyness[::-1],prices[::-1]) #calls: from the highest moneyness down
+    n = len(m)
+    p = np.asarray(p).reshape(n,-1)
+    payoff = np.maximum(cp*(m-1.0),0.0)[:,np.newaxis]
+    premium = np.sqrt(np.maximum(p-payoff,0.0))
+    exercised = (premium <= 1e-7) & (payoff > 0) #out of the money, the price of a worthless option is its payoff too
+    last = np.where(exercised.any(axis=0),n-1-np.argmax(exercised[::-1],axis=0),-1) #last point exercised at once
+    boundary = np.full(p.shape[1],0.0 if cp < 0 else np.inf)
+    inside = np.nonzero((last >= 0) & (last < n-2))[0]
+    k = last[inside]
+    s1,s2 = premium[k+1,inside],premium[k+2,inside]
+    with np.errstate(divide='ignore',invalid='ignore'):
+        root = m[k+1]-s1*(m[k+2]-m[k+1])/(s2-s1)
+    root = np.where(np.isfinite(root),root,m[k])
+    boundary[inside] = np.clip(root,np.minimum(m[k],m[k+1]),np.maximum(m[k],m[k+1]))
+    edge = last >= n-2 #no point beyond to extrapolate from
+    boundary[edge] = m[last[edge]]
+    boundary = boundary.reshape(prices.shape[1:])
+    return boundary
+
+#fractional indices of x on the axis of a grid, NaN outside the axis
+def grid_coordinates(axis,x):
+    return np.interp(x,axis,np.arange(len(axis),dtype=float),left=np.nan,right=np.nan)
+
+#multilinear interpolation of an array of values at fractional indices (list of arrays, one per axis): the 2**d
+#corners of the cells are gathered at once and the weights applied one axis at a time
+def multilinear(values,coordinates):
+    shape = np.shape(coordinates[0])
+    strides = np.cumprod((values.shape+(1,))[:0:-1])[::-1]
+    base = 0
+    weights = []
+    for x,n,stride in zip(coordinates,values.shape,strides):
+        x = np.ravel(x)
+        k = np.clip(np.floor(x),0,n-2)
+        k[np.isnan(k)] = 0
+        base = base+k.astype(int)*stride
+        weights.append(x-k) #NaN outside the grid
+    offsets = np.zeros(1,dtype=int)
+    for stride in strides:
+        offsets = (offsets[:,np.newaxis]+[0,stride]).ravel()
+    corners = np.reshape(values,-1)[base[:,np.newaxis]+offsets] #(points, 2**d), the last axis varying fastest
+    for w in weights[::-1]:
+        corners = corners.reshape(len(base),-1,2)
+        corners = corners[:,:,0]+w[:,np.newaxis]*(corners[:,:,1]-corners[:,:,0])
+    return corners.reshape(shape)
+
+#cubic spline coefficients of the prices on a grid (scipy.ndimage is imported on the first surface built or queried
+#with splines, not with the module)
+def spline_coefficients(prices):
+    from scipy import ndimage
+    return ndimage.spline_filter(np.asarray(prices,dtype=float),order=3)
+
+#cubic spline interpolation from the spline coefficients (see spline_coefficients) at fractional indices
+def spline(coefficients,coordinates):
+    from scipy import ndimage
+    ok = np.all([np.isfinite(x) for x in coordinates],axis=0)
+    res = ndimage.map_coordinates(coefficients,[np.where(ok,x,0).ravel() for x in coordinates],order=3,mode='mirror',prefilter=False)
+    return np.where(ok,res.reshape(np.shape(ok)),np.nan)
+
+class PriceSurface(object):
+    #grid: {axis: values}, prices: prices per unit of strike on the grid, boundary: critical moneyness on the grid
+    #without the moneyness axis, coefficients: cubic spline coefficients of the prices (computed if None)
+    #cp: 1 for calls, -1 for puts, N: number of periods of the trees, errors: results of validate (if any)
+
+    def __init__(self,grid,prices,boundary,cp,N,coefficients=None,errors=None):
+        self.grid = dict((axis,np.asarray(grid[axis],dtype=float)) for axis in axes)
+        self.prices = prices
+        self.boundary_values = boundary
+        self.cp = cp
+        self.N = N
+        self.coefficients = spline_coefficients(prices) if coefficients is None else coefficients
+        self.errors = errors or {}
+
+    def shape(self):
+        return tuple(len(self.grid[axis]) for axis in axes)
+
+    def coordinates(self,values):
+        return [grid_coordinates(self.grid[axis],x) for axis,x in zip(axes,np.broadcast_arrays(*values))]
+
+    #option prices (NaN outside the grid)
+    def price(self,S0,K,T,r,c,sigma,method='linear'):
+        #S0, K, T, r, c and sigma as in option_price_lattice (scalars or arrays broadcast against each other)
+        K = np.asarray(K,dtype=float)
+        m = np.divide(S0,K)
+        coordinates = self.coordinates([m,T,sigma,r,c])
+        if method == 'linear':
+            res = multilinear(self.prices,coordinates)
+        elif method == 'spline':
+            res = spline(self.coefficients,coordinates)
+        else:
+            raise ValueError('unknown interpolation method %r (one of %s)' % (method,', '.join(methods)))
+        return K*np.maximum(res,self.cp*(m-1.0)) #never below the payoff of immediate exercise (NaN stays NaN)
+
+    #critical stock prices: the option is exercised at once below (puts) or above (calls) them, interpolated over the
+    #corners of the cell where the option is exercised early on the grid; 0 (puts) or +inf (calls) where it is not
+    #exercised early at any corner, NaN outside the grid
+    def boundary(self,K,T,r,c,sigma):
+        coordinates = [grid_coordinates(self.grid[axis],x) for axis,x in zip(axes[1:],np.broadcast_arrays(T,sigma,r,c))]
+        values = np.asarray(self.boundary_values)
+        exercised = np.isfinite(values) & (values > 0)
+        weight = multilinear(exercised.astype(float),coordinates)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            res = multilinear(np.where(exercised,values,0.0),coordinates)/weight
+        res = np.where(weight > 0,res,0.0 if self.cp < 0 else np.inf)
+        return np.multiply(K,np.where(np.isnan(weight),np.nan,res))
+
+    def save(self,path):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        for axis in axes:
+            np.save(os.path.join(path,axis+'.npy'),self.grid[axis])
+        np.save(os.path.join(path,'prices.npy'),np.asarray(self.prices))
+        np.save(os.path.join(path,'coefficients.npy'),np.asarray(self.coefficients))
+        np.save(os.path.join(path,'boundary.npy'),np.asarray(self.boundary_values))
+        with open(os.path.join(path,'parameters.txt'),'w') as f:
+            f.write('cp %d\nN %d\n' % (self.cp,self.N))
+            for name in sorted(self.errors):
+                f.write('%s %r\n' % (name,self.errors[name]))
+
+#surface saved in a directory, with its arrays memory-mapped
+def load_surface(path):
+    parameters = {}
+    with open(os.path.join(path,'parameters.txt')) as f:
+        for line in f:
+            if line.strip():
+                name,value = line.split()
+                parameters[name] = float(value)
+    grid = dict((axis,np.load(os.path.join(path,axis+'.npy'))) for axis in axes)
+    arrays = [np.load(os.path.join(path,name+'.npy'),mmap_mode='r') for name in ('prices','boundary','coefficients')]
+    cp,N = int(parameters.pop('cp')),int(parameters.pop('N'))
+    return PriceSurface(grid,arrays[0],arrays[1],cp,N,arrays[2],parameters)
+
+#surface of the American options (cp 1 for calls, -1 for puts) priced on trees of N periods
+def build_surface(grid=None,cp=-1,N=100,chunksize=4096,previous=None):
+    #grid: {axis: increasing values} for all the axes (default_grid() if None)
+    #previous: surface of the same cp and N whose prices are reused at the points of the grid it already has
+    grid = dict((axis,np.asarray(values,dtype=float)) for axis,values in (default_grid() if grid is None else grid).items())
+    todo = None
+    if previous is not None and previous.cp == cp and previous.N == N:
+        found = []
+        for axis in axes:
+            old = previous.grid[axis]
+            k = np.clip(np.searchsorted(old,grid[axis]),0,len(old)-1)
+            found.append((np.abs(old[k]-grid[axis]) <= 1e-12*np.maximum(1.0,np.abs(grid[axis])),k))
+        known = np.ones([len(grid[axis]) for axis in axes],dtype=bool)
+        for axis,(f,k) in enumerate(found):
+            known &= f.reshape([-1 if a == axis else 1 for a in range(len(axes))])
+        todo = ~known
+    prices = grid_prices(grid,cp,N,chunksize,todo)
+    if todo is not None:
+        old = np.ix_(*[f for f,k in found])
+        prices[old] = np.asarray(previous.prices)[np.ix_(*[k[f] for f,k in found])]
+    return PriceSurface(grid,prices,exercise_boundary(grid['moneyness'],prices,cp),cp,N)
+
+#interpolation errors (per unit of strike) against direct lattice pricing at random points inside the grid
+def validate(surface,samples=2000,seed=0,method='linear',chunksize=4096):
+    #returns a dictionary: max, p99 and mean of the absolute errors, points (samples x axes) and errors (samples);
+    #the max, p99 and mean are also recorded in surface.errors
+    rng = np.random.RandomState(seed)
+    points = np.column_stack([rng.uniform(surface.grid[axis][0],surface.grid[axis][-1],samples) for axis in axes])
+    m,T,sigma,r,c = points.T
+    direct = np.concatenate([lattice_option_prices(m[k:k+chunksize],1.0,T[k:k+chunksize],r[k:k+chunksize],c[k:k+chunksize],
+                                                   sigma[k:k+chunksize],surface.cp,True,surface.N)
+                             for k in range(0,samples,chunksize)])
+    errors = np.abs(surface.price(m,1.0,T,r,c,sigma,method)-direct)
+    res = {'max': errors.max(), 'p99': np.percentile(errors,99), 'mean': errors.mean(), 'points': points, 'errors': errors}
+    for name in ('max','p99','mean'):
+        surface.errors[method+'_'+name] = float(res[name])
+    return res
+
+#grid with a point added in the middle of every interval (of every axis) holding a point whose error is above tol
+def refine_grid(grid,points,errors,tol):
+    refined = {}
+    for a,axis in enumerate(axes):
+        values = np.asarray(grid[axis],dtype=float)
+        k = np.clip(np.searchsorted(values,points[errors > tol,a],'right')-1,0,len(values)-2)
+        k = np.unique(k)
+        refined[axis] = np.union1d(values,0.5*(values[k]+values[k+1]))
+    return refined
+
+#refines the grid of a surface until the maximum validation error is at most tol (per unit of strike)
+def refine(surface,tol,rounds=3,samples=2000,method='linear',seed=0,chunksize=4096):
+    #returns the refined surface, validated (see validate) with a new sample at every round
+    res = validate(surface,samples,seed,method,chunksize)
+    for n in range(rounds):
+        if res['max'] <= tol:
+            break
+        grid = refine_grid(surface.grid,res['points'],res['errors'],tol)
+        surface = build_surface(grid,surface.cp,surface.N,chunksize,previous=surface)
+        res = validate(surface,samples,seed+n+1,method,chunksize)
+    return surface
+
+#price-surface directory [put|call] [N] [tol]: builds the surface on the default grid, refines it to the
+#tolerance (per unit of strike) if one is given, and saves it with its validation errors
+def main():
+    import sys
+    cp = 1 if len(sys.argv) > 2 and sys.argv[2] == 'call' else -1
+    N = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    surface = build_surface(cp=cp,N=N)
+    if len(sys.argv) > 4:
+        surface = refine(surface,float(sys.argv[4]))
+    for method in methods:
+        validate(surface,method=method)
+    surface.save(sys.argv[1])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+'''stress testing of the interest-rate lattice products of derivative_pricing.py (zero-coupon bond, swap, forward-starting swap,
+    swaption, forward and futures contracts on a coupon-bearing bond) over grids of short-rate scenarios (u, d, r0, fixed, N),
+    fanned out across a process pool
+'''
+
+import itertools
+import multiprocessing
+import numpy as np
+from financial_markets import derivative_pricing as dp
+
+scenario_fields = ['u','d','r0','fixed','N']
+product_fields = ['ZCB','swap','forswap','swaption','forward_on_bond','futures_on_bond']
+
+#products priced in every scenario (shared by all the scenarios and sent once to each worker process)
+default_products = {
+    'face': 100.0,           #face value of the bonds
+    'coupon': 0.0,           #coupon of the coupon-bearing bond underlying the forward and futures contracts
+    'delivery': 4,           #period at which the bond is delivered in the forward and futures contracts
+    'swaption_expiry': 5,    #expiration of the swaption (on the forward-starting swap)
+    'notional': 1000000.0,   #notional of the swaps and swaption
+}
+
+#grid of scenarios: cartesian product of the values given for each field
+def scenario_grid(u,d,r0,fixed,N):
+    #u is the factor by which the short rate goes up
+    #d is the facto by which the sort rate goes down
+    #r0 is the short rate at t=0
+    #fixed is the fixed rate of the swaps
+    #N is the number of periods (maturity of the zero-coupon and coupon-bearing bonds, expiration of the swaps)
+    grid = list(itertools.product(*[np.atleast_1d(x) for x in (u,d,r0,fixed,N)]))
+    scenarios = np.zeros(len(grid),dtype=[('u','f8'),('d','f8'),('r0','f8'),('fixed','f8'),('N','i8')])
+    for k,field in enumerate(scenario_fields):
+        scenarios[field] = [s[k] for s in grid]
+    return scenarios
+
+products = default_products
+
+#worker initialization: keep the shared read-only products in the worker
+def init_worker(shared_products):
+    global products
+    products = shared_products
+
+#price all the products in a chunk of scenarios (structured array with the scenario_fields)
+def price_scenarios(scenarios):
+    face = products['face']
+    notional = products['notional']
+    res = np.zeros(len(scenarios),dtype=[(field,'f8') for field in product_fields])
+    for k,s in enumerate(scenarios):
+        u,d,r0,fixed,N = [s[field] for field in scenario_fields]
+        N = int(N)
+        Ns = min(products['swaption_expiry'],N)
+        Nd = min(products['delivery'],N)
+        shrval = dp.lattice_rows(u,d,r0) #only one time slice of the short rates is held at a time
+        res['ZCB'][k] = dp.ZCB_lattice(N,face,shrval,keep=[0])[0][0]
+        res['swap'][k] = dp.swap(fixed,N,shrval,keep=[0])[0][0]*notional
+        forswapval = dp.forswap(fixed,N,shrval,keep=[0,Ns])
+        res['forswap'][k] = forswapval[0][0]*notional
+        res['swaption'][k] = dp.swaption(Ns,forswapval,shrval,keep=[0])[0][0]*notional
+        res['forward_on_bond'][k] = dp.forward_on_bond(Nd,face,N,products['coupon'],u,d,r0)
+        res['futures_on_bond'][k] = dp.futures_on_bond(Nd,face,N,products['coupon'],u,d,r0)
+    return res
+
+#price the products over all the scenarios
+def run_scenarios(scenarios,shared_products=None,processes=None,chunksize=None):
+    #scenarios is a structured array with the scenario_fields (see scenario_grid)
+    #shared_products overrides entries of default_products
+    #processes is the number of worker processes (default: number of cores), 1 to run in the calling process
+    #chunksize is the number of scenarios priced per task (default: about 4 tasks per process)
+    #returns a structured array with the scenario_fields and the product_fields (pandas.DataFrame(res) gives a DataFrame)
+    shared = dict(default_products)
+    if shared_products is not None:
+        shared.update(shared_products)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1,int(np.ceil(len(scenarios)/(4.0*processes))))
+    chunks = [scenarios[k:k+chunksize] for k in range(0,len(scenarios),chunksize)]
+
+    if processes == 1:
+        init_worker(shared)
+        priced = [price_scenarios(chunk) for chunk in chunks]
+    else:
+        pool = multiprocessing.Pool(processes,initializer=init_worker,initargs=(shared,))
+        try:
+            priced = pool.map(price_scenarios,chunks)
+        finally:
+            pool.close()
+            pool.join()
+
+    res = np.zeros(len(scenarios),dtype=scenarios.dtype.descr+[(field,'f8') for field in product_fields])
+    for field in scenario_fields:
+        res[field] = scenarios[field]
+    if priced:
+        priced = np.concatenate(priced)
+        for field in product_fields:
+            res[field] = priced[field]
+    return res
@@ -0,0 +1,177 @@
+''' bounded-memory output of the results of the scripts, instead of printing them row by row:
+ResultsWriter buffers tables (dictionaries of equal-length column arrays) and writes them in bulk to a CSV,
+Parquet or NumPy (.npy structured array) file chosen by the extension of the path
+ExerciseTrace is the opt-in trace of the pricers of derivative_pricing.py: it records the nodes where early
+exercise is optimal as arrays (the exercise boundary) instead of printing them
+uses pandas for CSV files if it is installed and requires pyarrow for Parquet files
+'''
+
+import numpy as np
+
+def is_parquet(path):
+    return path.endswith('.parquet') or path.endswith('.parq')
+
+def is_npy(path):
+    return path.endswith('.npy')
+
+#writes tables (dictionaries of equal-length arrays) to a CSV, Parquet or .npy file, one chunk after the other
+class ChunkWriter(object):
+
+    def __init__(self,path,columns):
+        self.path = path
+        self.columns = columns
+        self.writer = None
+        self.dtype = None #record type of the .npy file, from the first chunk (widened for longer strings, see widen)
+        self.header_length = None
+        self.rows = 0
+        if not is_parquet(path):
+            self.writer = open(path,'w+b' if is_npy(path) else 'w')
+            if not is_npy(path):
+                self.writer.write(','.join(columns)+'\n')
+
+    def write(self,table):
+        if is_parquet(self.path):
+            import pyarrow as pa, pyarrow.parquet as pq
+            batch = pa.Table.from_arrays([pa.array(table[name]) for name in self.columns],names=self.columns)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path,batch.schema)
+            self.writer.write_table(batch)
+        elif is_npy(self.path):
+            arrays = [np.asarray(table[name]) for name in self.columns]
+            dtype = np.dtype([(str(name),x.dtype) for name,x in zip(self.columns,arrays)])
+            if self.dtype is None:
+                self.dtype = dtype
+                self.write_npy_header()
+            else:
+                self.widen(dtype)
+            rows = np.zeros(len(arrays[0]),dtype=self.dtype)
+            for name,x in zip(self.columns,arrays):
+                rows[name] = x
+            self.writer.write(rows.tobytes())
+            self.rows += len(rows)
+        else:
+            try:
+                import pandas as pd
+            except ImportError: #slower formatting row by row without pandas
+                arrays = [np.asarray(table[name]) for name in self.columns]
+                formats = ['%.15g' if x.dtype.kind == 'f' else '%s' for x in arrays]
+                self.writer.write(''.join(','.join(f % v for f,v in zip(formats,row))+'\n' for row in zip(*arrays)))
+                return
+            pd.DataFrame(table,columns=self.columns).to_csv(self.writer,header=False,index=False,float_format='%.15g')
+
+    #string columns of a chunk longer than those of the file: the rows already written are read back and rewritten with
+    #the wider record type (the other columns keep the type of the first chunk)
+    def widen(self,dtype):
+        descr = [(name,np.promote_types(self.dtype[name],dtype[name]) if self.dtype[name].kind in 'SU' and dtype[name].kind in 'SU'
+                  else self.dtype[name]) for name in self.dtype.names]
+        wider = np.dtype(descr)
+        if wider == self.dtype:
+            return
+        self.writer.seek(self.header_length)
+        old = np.frombuffer(self.writer.read(self.rows*self.dtype.itemsize),dtype=self.dtype)
+        rows = np.zeros(len(old),dtype=wider)
+        for name in wider.names:
+            rows[name] = old[name]
+        self.dtype = wider
+        self.header_length = None #the header is written again, longer if needed
+        self.writer.seek(0)
+        self.writer.truncate()
+        self.write_npy_header()
+        self.writer.write(rows.tobytes())
+
+    #header of the .npy file (format 1.0), padded to a fixed length so that it can be rewritten with the final shape
+    def write_npy_header(self):
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (np.lib.format.dtype_to_descr(self.dtype),self.rows)
+        if self.header_length is None:
+            self.header_length = ((10+len(header)+20+1)//64+1)*64 #magic, length and header with room for 20 more digits
+        header = header+' '*(self.header_length-10-len(header)-1)+'\n'
+        self.writer.seek(0)
+        self.writer.write(b'\x93NUMPY\x01\x00'+np.array(len(header),dtype='<u2').tobytes()+header.encode('latin1'))
+        self.writer.seek(0,2)
+
+    def close(self):
+        if self.writer is not None:
+            if is_npy(self.path) and self.dtype is not None:
+                self.write_npy_header()
+            self.writer.close()
+            self.writer = None
+
+#buffered writer: small tables are accumulated and written in chunks of at least buffer_rows rows
+class ResultsWriter(object):
+
+    def __init__(self,path,columns,buffer_rows=65536):
+        self.writer = ChunkWriter(path,columns)
+        self.columns = columns
+        self.buffer_rows = buffer_rows
+        self.buffer = []
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+    #appends a table (dictionary of equal-length arrays, or of scalars for a single row)
+    def write(self,table):
+        table = dict((name,np.atleast_1d(table[name])) for name in self.columns)
+        self.buffer.append(table)
+        self.rows += len(table[self.columns[0]])
+        if self.rows >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.write(dict((name,np.concatenate([table[name] for table in self.buffer])) for name in self.columns))
+            self.buffer = []
+            self.rows = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+#nodes where early exercise is optimal, recorded by backward_induction (see the trace argument of the pricers)
+class ExerciseTrace(object):
+
+    def __init__(self):
+        self.records = []
+
+    #nodes of time i where exercising (payoff) is worth at least holding (value): exercised is the mask of these nodes,
+    #of shape (...,i+1) with one leading index per contract for batches
+    def record(self,name,i,exercised,value,payoff):
+        index = np.nonzero(exercised)
+        if len(index[0]) == 0:
+            return
+        contract = np.ravel_multi_index(index[:-1],exercised.shape[:-1]) if len(index) > 1 else np.zeros(len(index[0]),dtype=int)
+        self.records.append((name,i,contract,index[-1],np.broadcast_to(value,exercised.shape)[index],
+                             np.broadcast_to(payoff,exercised.shape)[index]))
+
+    #all the exercise nodes as arrays: name, time, contract, node (number of down moves), option value and payoff
+    def table(self):
+        if not self.records:
+            return {'name': np.zeros(0,dtype=str), 'time': np.zeros(0,dtype=int), 'contract': np.zeros(0,dtype=int),
+                    'node': np.zeros(0,dtype=int), 'value': np.zeros(0), 'payoff': np.zeros(0)}
+        n = [len(r[2]) for r in self.records]
+        return {'name': np.repeat([r[0] for r in self.records],n),
+                'time': np.repeat([r[1] for r in self.records],n),
+                'contract': np.concatenate([r[2] for r in self.records]),
+                'node': np.concatenate([r[3] for r in self.records]),
+                'value': np.concatenate([r[4] for r in self.records]),
+                'payoff': np.concatenate([r[5] for r in self.records])}
+
+    #exercise boundary: for every time (0..N-1) the first and last exercise nodes (-1 where there is none) of a contract
+    def boundary(self,N,name=None,contract=0):
+        first = np.full(N,-1,dtype=int)
+        last = np.full(N,-1,dtype=int)
+        for r in self.records:
+            if name is None or r[0] == name:
+                nodes = r[3][r[2] == contract]
+                if len(nodes):
+                    first[r[1]] = nodes.min()
+                    last[r[1]] = nodes.max()
+        return first,last
+
+    #writes the exercise nodes with a ResultsWriter
+    def write(self,path):
+        with ResultsWriter(path,['name','time','contract','node','value','payoff']) as writer:
+            writer.write(self.table())
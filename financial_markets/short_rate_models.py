@@ -0,0 +1,78 @@
+'''short-rate lattices calibrated to a term structure of interest rates:
+    Ho-Lee model       r(i,j) = a_i + b_i*(i-j)
+    Black-Derman-Toy   r(i,j) = a_i*exp(b_i*(i-j))
+(j is the number of down moves, as in short_rate_lattice, and q=0.5 as in the pricers of derivative_pricing.py)
+the drifts a_i are fitted level by level with forward induction of the Arrow-Debreu (elementary) prices, so that the
+zero-coupon bond prices of the lattice match the input curve; the calibrated lattice is used like the output of
+short_rate_lattice by ZCB_lattice, CB_lattice, swap, forswap, swaption and defaultable_ZCB
+'''
+
+import numpy as np
+
+#short rates at the nodes of time i are r = a*factor+offset for the drift a, with k=i-j the number of up moves
+models = {
+    'Ho-Lee': lambda b,k: (np.ones(len(k)),b*k),
+    'BDT': lambda b,k: (np.exp(b*k),np.zeros(len(k))),
+}
+
+#zero-coupon bond prices (for a face value of 1) of a term structure of spot rates
+def discount_factors(spot):
+    #spot[k-1] is the spot rate (per period, compounded every period) for the maturity of k periods
+    spot = np.asarray(spot,dtype=float)
+    return (1.0+spot)**(-np.arange(1,len(spot)+1))
+
+#short-rate lattice fitted to a term structure of spot rates
+def calibrate_short_rate_lattice(spot,b,model='BDT',tol=1e-14,maxiter=50):
+    #spot[k-1] is the spot rate (per period) for the maturity of k periods, k=1..n
+    #b is the volatility parameter of the model, a scalar or an array with one value per period
+    #model: 'BDT' for Black-Derman-Toy, 'Ho-Lee' for Ho-Lee
+    #tol and maxiter: relative tolerance on the bond prices and maximum number of Newton iterations per time
+    #(RuntimeError if a time does not converge)
+    #returns the short-rate lattice with n periods (n x n, times 0..n-1): the zero-coupon bond maturing at t=k
+    #computed by ZCB_lattice(k,1.0,shrval) costs 1/(1+spot[k-1])**k
+    shape = models[model]
+    P = discount_factors(spot)
+    n = len(P)
+    b = np.broadcast_to(np.asarray(b,dtype=float),(n,))
+    shrval = np.zeros((n,n))
+    AD = np.ones(1) #Arrow-Debreu prices at the nodes of time i
+    Pprev = 1.0
+    for i in range(n):
+        factor,offset = shape(b[i],i-np.arange(i+1))
+        #Newton iterations on the drift so that sum_j AD(i,j)/(1+r(i,j)) is the price of the bond maturing at t=i+1,
+        #starting from the forward rate at the middle of the lattice
+        a = Pprev/P[i]-1.0
+        if model == 'BDT':
+            a *= np.exp(-b[i]*i/2.0)
+        else:
+            a -= b[i]*i/2.0
+        for it in range(maxiter):
+            disc = 1.0/(1.0+a*factor+offset)
+            f = np.dot(AD,disc)-P[i]
+            a += f/np.dot(AD*factor,disc*disc)
+            if abs(f) < tol*P[i]:
+                break
+        else:
+            raise RuntimeError('the calibration of the short rates of time %d did not converge' % i)
+        r = a*factor+offset
+        shrval[i,:i+1] = r
+        #forward induction: state prices at time i+1
+        disc = 0.5*AD/(1.0+r)
+        AD = np.zeros(i+2)
+        AD[:-1] += disc
+        AD[1:] += disc
+        Pprev = P[i]
+    return shrval
+
+#Arrow-Debreu (elementary) prices of the nodes of a short-rate lattice: AD[i,j] is the value at t=0 of 1 paid at node (i,j)
+def state_prices(shrval,N=None):
+    #N is the last time, by default the last period of the short-rate lattice
+    if N is None:
+        N = shrval.shape[0]-1
+    AD = np.zeros((N+1,N+1))
+    AD[0,0] = 1.0
+    for i in range(N):
+        disc = 0.5*AD[i,:i+1]/(1.0+shrval[i,:i+1])
+        AD[i+1,:i+1] += disc
+        AD[i+1,1:i+2] += disc
+    return AD
@@ -0,0 +1,23 @@
+'''installs the package financial_markets (importable without running any example) and the example runs as commands'''
+
+from setuptools import setup
+
+setup(name='financial_markets',
+      version='0.1',
+      description='Codes to analyze financial markets: derivatives and mortgage-backed securities pricing, '
+                  'technical analysis of stocks, event studies, portfolio analytics',
+      packages=['financial_markets'],
+      install_requires=['numpy','scipy'],
+      #optional dependencies, imported only by the functions that use them
+      extras_require={'data': ['pandas'],
+                      'plots': ['matplotlib'],
+                      'parquet': ['pyarrow'],
+                      'web': ['pandas-datareader'],
+                      'qstk': ['QSTK']},
+      entry_points={'console_scripts': ['derivative-pricing = financial_markets.derivative_pricing:main',
+                                        'mbs = financial_markets.MBS:main',
+                                        'portfolio = financial_markets.portfolio:main',
+                                        'bollinger = financial_markets.Bollinger:main',
+                                        'event-study = financial_markets.event_study:main',
+                                        'price-store = financial_markets.price_store:main',
+                                        'price-surface = financial_markets.price_surface:main']})
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from financial_markets import black_scholes as bs
+
+S0 = np.array([80.0,100.0,120.0,100.0])
+K = np.array([100.0,100.0,100.0,90.0])
+T = np.array([0.25,0.5,1.0,2.0])
+r = np.array([0.01,0.03,0.05,0.0])
+c = np.array([0.0,0.02,0.01,0.03])
+sigma = np.array([0.15,0.2,0.3,0.4])
+
+def test_put_call_parity():
+    call = bs.black_scholes_price(S0,K,T,r,c,sigma,1)
+    put = bs.black_scholes_price(S0,K,T,r,c,sigma,-1)
+    assert np.allclose(call-put,S0*np.exp(-c*T)-K*np.exp(-r*T),rtol=0,atol=1e-12)
+    call = bs.black_price(S0,K,T,r,sigma,1)
+    put = bs.black_price(S0,K,T,r,sigma,-1)
+    assert np.allclose(call-put,(S0-K)*np.exp(-r*T),rtol=0,atol=1e-12)
+
+#central difference of the price with respect to one argument
+def difference(price,args,name,h):
+    up,down = dict(args),dict(args)
+    up[name] = args[name]+h
+    down[name] = args[name]-h
+    return (price(**up)-price(**down))/(2.0*h)
+
+@pytest.mark.parametrize('cp',[1,-1])
+def test_greeks_match_finite_differences(cp):
+    args = {'S0': S0, 'K': K, 'T': T, 'r': r, 'c': c, 'sigma': sigma, 'cp': cp}
+    greeks = bs.black_scholes_greeks(**args)
+    price = bs.black_scholes_price
+    assert np.allclose(greeks['delta'],difference(price,args,'S0',1e-4),rtol=1e-6,atol=1e-8)
+    delta = lambda **a: bs.black_scholes_greeks(**a)['delta']
+    assert np.allclose(greeks['gamma'],difference(delta,args,'S0',1e-4),rtol=1e-6,atol=1e-8)
+    assert np.allclose(greeks['vega'],difference(price,args,'sigma',1e-6),rtol=1e-6,atol=1e-8)
+    assert np.allclose(greeks['rho'],difference(price,args,'r',1e-6),rtol=1e-6,atol=1e-8)
+    assert np.allclose(greeks['theta'],-difference(price,args,'T',1e-6),rtol=1e-6,atol=1e-8)
+
+@pytest.mark.parametrize('cp',[1,-1])
+def test_black_greeks_match_finite_differences(cp):
+    args = {'F0': S0, 'K': K, 'T': T, 'r': r, 'sigma': sigma, 'cp': cp}
+    greeks = bs.black_greeks(**args)
+    price = bs.black_price
+    assert np.allclose(greeks['delta'],difference(price,args,'F0',1e-4),rtol=1e-6,atol=1e-8)
+    assert np.allclose(greeks['vega'],difference(price,args,'sigma',1e-6),rtol=1e-6,atol=1e-8)
+    assert np.allclose(greeks['rho'],difference(price,args,'r',1e-6),rtol=1e-6,atol=1e-8)
+
+def test_expired_options_are_worth_their_intrinsic_value():
+    greeks = bs.black_scholes_greeks(S0,K,0.0,0.02,0.01,sigma,1)
+    assert np.allclose(greeks['price'],np.maximum(S0-K,0.0))
+    assert np.array_equal(greeks['delta'],(S0 > K).astype(float))
+    assert np.all(greeks['gamma'] == 0) and np.all(greeks['vega'] == 0)
+
+def test_lattice_volatility():
+    u = np.exp(0.2*np.sqrt(0.01))
+    assert np.isclose(bs.lattice_volatility(u,1/u,0.01),0.2)
+    assert bs.lattice_volatility(1.1,0.95,0.01) is None
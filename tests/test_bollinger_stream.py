@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from financial_markets.bollinger_stream import BollingerStream, bollinger_values
+
+def prices(days=400,symbols=6,seed=0):
+    rng = np.random.RandomState(seed)
+    return 1e4*np.exp(np.cumsum(0.01*rng.randn(days,symbols),axis=0)) #large prices, where running sums lose digits
+
+@pytest.mark.parametrize('resync',[None,7])
+def test_stream_matches_the_history(resync):
+    x = prices()
+    expected = bollinger_values(x)
+    stream = BollingerStream(x[:30],resync=resync)
+    streamed = np.array([stream.update(row) for row in x[30:]])
+    assert np.allclose(streamed,expected[30:],rtol=0,atol=1e-8)
+
+@pytest.mark.parametrize('resync',[None,5])
+def test_stream_from_an_empty_history(resync):
+    x = prices(days=60)
+    stream = BollingerStream(np.zeros((0,x.shape[1])),resync=resync)
+    streamed = np.array([stream.update(row) for row in x])
+    assert np.all(np.isnan(streamed[:19]))
+    assert np.allclose(streamed[19:],bollinger_values(x)[19:],rtol=0,atol=1e-8)
+
+@pytest.mark.parametrize('resync',[None,3])
+def test_updates_of_subsets_of_symbols(resync):
+    x = prices(days=300,symbols=5)
+    rng = np.random.RandomState(1)
+    stream = BollingerStream(x[:10],resync=resync)
+    seen = [list(x[:10,k]) for k in range(5)]
+    for t in range(10,300):
+        columns = np.nonzero(rng.uniform(size=5) < 0.6)[0]
+        if len(columns) == 0:
+            continue
+        values = stream.update(x[t,columns],columns)
+        for value,k in zip(values,columns):
+            seen[k].append(x[t,k])
+            window = np.array(seen[k][-20:])
+            if len(seen[k]) < 20:
+                assert np.isnan(value)
+            else:
+                assert np.isclose(value,(window[-1]-window.mean())/window.std(ddof=1),rtol=0,atol=1e-8)
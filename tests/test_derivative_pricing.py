@@ -0,0 +1,65 @@
+import numpy as np
+from financial_markets import derivative_pricing as dp
+
+def test_packed_lattices_price_as_full_lattices():
+    u,d,N,T,r,c,K = 1.05,1/1.05,30,0.5,0.02,0.01,100.0
+    full = dp.stock_price_lattice(u,d,N,100.0)
+    packed = dp.stock_price_lattice(u,d,N,100.0,packed=True)
+    assert np.array_equal(dp.unpack_lattice(packed),full)
+    for cp,am in [(1,False),(-1,True)]:
+        expected = dp.option_price_lattice(u,d,N,T,r,c,cp,am,full,K,keep=[0],closed_form=False)[0]
+        assert np.allclose(dp.option_price_lattice(u,d,N,T,r,c,cp,am,packed,K,keep=[0],closed_form=False)[0],expected)
+    assert np.allclose(dp.futures_price_lattice(u,d,N,T,r,c,packed,keep=[0])[0],dp.futures_price_lattice(u,d,N,T,r,c,full,keep=[0])[0])
+
+    shrval = dp.short_rate_lattice(1.1,0.9,10,0.05)
+    packed = dp.short_rate_lattice(1.1,0.9,10,0.05,packed=True)
+    assert np.allclose(dp.ZCB_lattice(10,100.0,packed,keep=[0])[0],dp.ZCB_lattice(10,100.0,shrval,keep=[0])[0])
+    assert np.allclose(dp.defaultable_ZCB(packed,100.0,0.2,N=10,keep=[0])[0],dp.defaultable_ZCB(shrval,100.0,0.2,keep=[0])[0])
+
+def test_closed_form_is_opt_in():
+    u,N,T,r,c,K = 1.02,10,0.5,0.02,0.01,100.0
+    stkval = dp.stock_price_lattice(u,1/u,N,100.0)
+    full = dp.option_price_lattice(u,1/u,N,T,r,c,1,False,stkval,K)
+    assert np.isclose(dp.option_price_lattice(u,1/u,N,T,r,c,1,False,stkval,K,keep=[0])[0][0],full[0,0])
+    sigma = dp.lattice_volatility(u,1/u,T/N)
+    bs = dp.black_scholes_price(100.0,K,T,r,c,sigma,1)
+    assert np.isclose(dp.option_price_lattice(u,1/u,N,T,r,c,1,False,stkval,K,keep=[0],closed_form=True)[0][0],bs)
+    assert not np.isclose(full[0,0],bs)
+
+    futval = dp.futures_price_lattice(u,1/u,N,T,r,c,stkval)
+    full = dp.option_on_future_price_lattice(u,1/u,N,T,r,c,1,False,N,futval,K)
+    assert np.isclose(dp.option_on_future_price_lattice(u,1/u,N,T,r,c,1,False,N,futval,K,keep=[0])[0][0],full[0,0])
+    black = dp.black_price(futval[0,0],K,T,r,sigma,1)
+    assert np.isclose(dp.option_on_future_price_lattice(u,1/u,N,T,r,c,1,False,N,futval,K,keep=[0],closed_form=True)[0][0],black)
+
+#price at t=0 of one contract on its own tree calibrated by Black-Scholes
+def tree_price(S0,K,T,r,c,sigma,cp,am,N):
+    u = np.exp(sigma*np.sqrt(T/float(N)))
+    return dp.option_price_lattice(u,1/u,N,T,r,c,cp,am,dp.lattice_rows(u,1/u,S0),K,keep=[0])[0][0]
+
+def test_option_risk_batch_matches_one_tree_per_contract():
+    S0,K,T,r,c,sigma = 100.0,np.array([90.0,100.0,110.0,100.0]),np.array([0.5,1.0,0.25,0.75]),0.03,0.01,0.25
+    cp,am,N,dsigma,dr = np.array([1,-1,-1,1]),np.array([True,True,False,False]),60,0.01,0.0001
+    risk = dp.option_risk_batch(S0,K,T,r,c,sigma,cp,am,N,dsigma,dr,closed_form=False)
+    for k in range(len(K)):
+        u = np.exp(sigma*np.sqrt(T[k]/N))
+        stkval = dp.stock_price_lattice(u,1/u,N,S0)
+        optval = dp.option_price_lattice(u,1/u,N,T[k],r,c,cp[k],am[k],stkval,K[k])
+        greeks = dp.lattice_greeks(optval,stkval,T[k]/N)
+        for greek in ('price','delta','gamma','theta'):
+            assert np.isclose(risk[greek][k],greeks[greek]),(greek,k)
+        price = lambda sig,rate: tree_price(S0,K[k],T[k],rate,c,sig,cp[k],am[k],N)
+        assert np.isclose(risk['vega'][k],(price(sigma+dsigma,r)-price(sigma-dsigma,r))/(2*dsigma))
+        assert np.isclose(risk['rho'][k],(price(sigma,r+dr)-price(sigma,r-dr))/(2*dr))
+
+def test_option_risk_batch_closed_form_for_european_contracts():
+    S0,K,T,r,c,sigma,cp = 100.0,np.array([90.0,110.0]),0.5,0.03,0.01,0.25,np.array([1,-1])
+    am = np.array([False,True])
+    risk = dp.option_risk_batch(S0,K,T,r,c,sigma,cp,am,200)
+    greeks = dp.black_scholes_greeks(S0,K[0],T,r,c,sigma,cp[0])
+    for greek in greeks:
+        assert risk[greek][0] == greeks[greek]
+    tree = dp.option_risk_batch(S0,K,T,r,c,sigma,cp,am,200,closed_form=False)
+    for greek in greeks:
+        assert risk[greek][1] == tree[greek][1]
+        assert np.isclose(tree[greek][0],greeks[greek],rtol=5e-2,atol=1e-3),greek #binomial error
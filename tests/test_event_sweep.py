@@ -0,0 +1,49 @@
+import numpy as np
+from financial_markets import event_profile as ep
+from financial_markets import event_sweep as es
+
+def panel(days=400,symbols=30,seed=0):
+    rng = np.random.RandomState(seed)
+    market = 100.0*np.exp(np.cumsum(rng.normal(0.0,0.015,days)))
+    close = 50.0*np.exp(np.cumsum(rng.normal(0.0,0.03,(days,symbols)),axis=0))
+    return close,market
+
+#CAR of every event by a loop over the events, leaving out the windows with missing prices
+def loop_profile(mask,close,market,lookback,lookforward):
+    cars = []
+    for t,s in zip(*np.nonzero(mask)):
+        if t < lookback or t+lookforward >= len(close):
+            continue
+        window = range(t-lookback,t+lookforward+1)
+        if np.isnan(close[window,s]).any() or np.isnan(close[t-lookback-1,s]) and t-lookback > 0:
+            continue
+        car = []
+        for k in window:
+            lo,hi = min(k,t),max(k,t)
+            ret = close[lo+1:hi+1,s]/close[lo:hi,s]-1.0-(market[lo+1:hi+1]/market[lo:hi]-1.0)
+            growth = np.prod(1.0+ret)
+            car.append(growth-1.0 if k >= t else 1.0/growth-1.0)
+        cars.append(car)
+    return np.array(cars)
+
+def test_sweep_with_missing_prices():
+    close,market = panel()
+    close[:50,3] = np.nan
+    close[200,7] = np.nan
+    definitions = es.definition_grid([-0.03,-0.05],[0.0,0.01],[10,20],[10,20])
+    res = es.run_sweep(definitions,close,market,processes=1)
+    assert (res['events'] > 0).all()
+    for field in es.summary_fields[1:]:
+        assert np.isfinite(res[field]).all()
+
+def test_profile_leaves_out_windows_with_missing_prices():
+    close,market = panel()
+    close[:50,3] = np.nan
+    close[200,7] = np.nan
+    mask = ep.event_mask(close,market,ep.price_drop_event(-0.03,0.0))
+    profile = ep.event_profile(mask,close,market,10,15,keep_windows=True)
+    cars = loop_profile(mask,close,market,10,15)
+    assert profile['count'] == len(cars) > 0
+    assert np.allclose(profile['windows'],cars,rtol=0,atol=1e-12)
+    assert np.allclose(profile['mean'],cars.mean(axis=0),rtol=0,atol=1e-12)
+    assert np.allclose(profile['std'],cars.std(axis=0,ddof=1),rtol=0,atol=1e-12)
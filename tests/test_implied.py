@@ -0,0 +1,38 @@
+import numpy as np
+from financial_markets import derivative_pricing as dp
+from financial_markets import implied as im
+from financial_markets.black_scholes import black_scholes_price
+
+def test_lattice_option_prices_scalar_and_shape():
+    price = im.lattice_option_prices(100.0,100.0,0.5,0.02,0.01,0.2,-1,True,50)
+    assert np.ndim(price) == 0
+    u = np.exp(0.2*np.sqrt(0.5/50))
+    ref = dp.option_price_lattice(u,1/u,50,0.5,0.02,0.01,-1,True,dp.lattice_rows(u,1/u,100.0),100.0,keep=[0])[0][0]
+    assert abs(price-ref) < 1e-12
+    K = np.linspace(80.0,120.0,20).reshape(4,5)
+    prices = im.lattice_option_prices(100.0,K,0.5,0.02,0.01,0.2,-1,True,50)
+    assert prices.shape == (4,5)
+    assert abs(prices[0,0]-im.lattice_option_prices(100.0,80.0,0.5,0.02,0.01,0.2,-1,True,50)) < 1e-12
+
+def test_implied_volatility_shape():
+    sigma = np.linspace(0.1,0.5,20).reshape(4,5)
+    K = np.linspace(90.0,110.0,20).reshape(4,5)
+    price = black_scholes_price(100.0,K,0.5,0.02,0.01,sigma,1)
+    res = im.implied_volatility(price,100.0,K,0.5,0.02,0.01,1)
+    assert res.shape == (4,5)
+    assert np.allclose(res,sigma,rtol=0,atol=1e-8)
+    res = im.implied_volatility(price[0,0],100.0,K[0,0],0.5,0.02,0.01,1)
+    assert np.ndim(res) == 0 and abs(res-sigma[0,0]) < 1e-8
+
+def test_implied_volatility_american():
+    sigma = np.array([0.15,0.3,0.45])
+    price = im.lattice_option_prices(100.0,[95.0,100.0,110.0],1.0,0.05,0.0,sigma,-1,True,100)
+    res = im.implied_volatility(price,100.0,[95.0,100.0,110.0],1.0,0.05,0.0,-1,True,100)
+    assert np.allclose(res,sigma,rtol=0,atol=1e-8)
+
+def test_implied_short_rate():
+    r0 = np.array([0.03,0.05,0.08])
+    N = np.array([5,10,10])
+    price = [dp.ZCB_lattice(n,100.0,dp.short_rate_lattice(1.1,0.9,n,r))[0,0] for n,r in zip(N,r0)]
+    assert np.allclose(im.implied_short_rate(price,N),r0,rtol=0,atol=1e-10)
+    assert np.ndim(im.implied_short_rate(price[0],5)) == 0
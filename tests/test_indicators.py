@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from financial_markets import indicators as ind
+
+def panel(days=300,symbols=3,seed=0):
+    rng = np.random.RandomState(seed)
+    price = 100.0*np.exp(np.cumsum(0.01*rng.randn(days,symbols),axis=0))
+    volume = rng.randint(1000,5000,size=(days,symbols)).astype(float)
+    return price,volume
+
+def test_default_without_volume():
+    price,volume = panel()
+    res = ind.indicators(price)
+    assert sorted(res) == sorted(name for name in ind.indicator_names if name != 'OBV')
+    for value in res.values():
+        assert value.shape == price.shape
+
+def test_default_with_volume():
+    price,volume = panel()
+    res = ind.indicators(price,volume)
+    assert sorted(res) == sorted(ind.indicator_names)
+    assert np.allclose(res['OBV'][-1],volume.mean(axis=0)+(volume[1:]*np.sign(np.diff(price,axis=0))).sum(axis=0))
+
+def test_obv_without_volume():
+    price,volume = panel()
+    with pytest.raises(ValueError):
+        ind.indicators(price,names=['OBV'])
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from financial_markets import derivative_pricing as dp
+from financial_markets.lattice_cache import LatticeCache
+
+u,d,S0 = 1.1,0.9,100.0
+
+def test_hit():
+    cache = LatticeCache()
+    first = cache.stock_price_lattice(u,d,10,S0)
+    second = cache.stock_price_lattice(u,d,10,S0)
+    assert np.array_equal(first,dp.stock_price_lattice(u,d,10,S0))
+    assert np.array_equal(second,first)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_extension_of_a_shallower_lattice():
+    cache = LatticeCache()
+    cache.short_rate_lattice(u,d,5,0.05)
+    deeper = cache.short_rate_lattice(u,d,12,0.05)
+    assert np.allclose(deeper,dp.short_rate_lattice(u,d,12,0.05))
+    stats = cache.stats()
+    assert stats['extensions'] == 1 and stats['entries'] == 1 and stats['nbytes'] == deeper.nbytes
+
+def test_view_of_a_deeper_lattice():
+    cache = LatticeCache()
+    deep = cache.stock_price_lattice(u,d,20,S0)
+    shallow = cache.stock_price_lattice(u,d,8,S0)
+    assert shallow.shape == (9,9)
+    assert shallow.base is deep
+    assert np.array_equal(shallow,dp.stock_price_lattice(u,d,8,S0))
+    assert cache.stats()['hits'] == 1
+
+def test_read_only():
+    cache = LatticeCache()
+    lattice = cache.stock_price_lattice(u,d,10,S0)
+    with pytest.raises(ValueError):
+        lattice[0,0] = 1.0
+    with pytest.raises(ValueError):
+        cache.stock_price_lattice(u,d,5,S0)[0,0] = 1.0
+
+def test_byte_budget_eviction():
+    size = 11*11*8
+    cache = LatticeCache(max_bytes=2*size)
+    cache.stock_price_lattice(u,d,10,100.0)
+    cache.stock_price_lattice(u,d,10,101.0)
+    cache.stock_price_lattice(u,d,10,100.0) #most recently used
+    cache.stock_price_lattice(u,d,10,102.0) #evicts the lattice of 101
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['entries'] == 2 and stats['nbytes'] <= 2*size
+    cache.stock_price_lattice(u,d,10,100.0)
+    assert cache.stats()['hits'] == 2
+    cache.stock_price_lattice(u,d,10,101.0)
+    assert cache.stats()['misses'] == 4
+    #a lattice larger than the budget is returned without being cached
+    big = cache.stock_price_lattice(u,d,30,S0)
+    assert big.shape == (31,31) and cache.stats()['nbytes'] <= 2*size
+
+def test_zcb_keyed_on_the_content_of_the_rates():
+    cache = LatticeCache()
+    shrval = cache.short_rate_lattice(u,d,10,0.05)
+    zcb = cache.ZCB_lattice(10,100.0,shrval)
+    assert np.allclose(zcb,dp.ZCB_lattice(10,100.0,dp.short_rate_lattice(u,d,10,0.05)))
+    #the same rates, from the cache (a view) or from a copy, hit the same entry
+    assert cache.ZCB_lattice(10,100.0,cache.short_rate_lattice(u,d,10,0.05)) is zcb
+    assert cache.ZCB_lattice(10,100.0,np.array(shrval)) is zcb
+    assert cache.ZCB_lattice(10,100.0,dp.short_rate_lattice(u,d,10,0.05)) is zcb
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['misses'] == 2
+    #other rates or another face value are other entries
+    assert cache.ZCB_lattice(10,100.0,dp.short_rate_lattice(u,d,10,0.06)) is not zcb
+    assert cache.ZCB_lattice(10,50.0,shrval) is not zcb
+    assert cache.stats()['entries'] == 4
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from financial_markets import lattice_engines as le
+from financial_markets.black_scholes import black_scholes_price
+
+T,sigma,r,c,K,S0 = 1.0,0.2,0.05,0.01,100.0,100.0
+
+def tree(N):
+    u = np.exp(sigma*np.sqrt(T/N))
+    return u,1.0/u
+
+def test_trinomial_european_converges_to_black_scholes():
+    N = 800
+    u,d = tree(N)
+    for cp in (1,-1):
+        P = le.trinomial_option_price(u,d,N,T,r,c,cp,False,S0,K)
+        assert abs(P-black_scholes_price(S0,K,T,r,c,sigma,cp)) < 2e-3
+
+def test_trinomial_middle_branch():
+    #with stretch 1 there is no middle branch and the tree matches the one with the default stretch in the limit
+    N = 400
+    u,d = tree(N)
+    P1 = le.trinomial_option_price(u,d,N,T,r,c,-1,True,S0,K,stretch=1.0)
+    P = le.trinomial_option_price(u,d,N,T,r,c,-1,True,S0,K)
+    assert P != P1
+    assert abs(P-P1) < 1e-2
+    with pytest.raises(ValueError):
+        le.trinomial_option_price(u,d,N,T,r,c,-1,True,S0,K,stretch=0.9)
+
+def test_richardson_needs_two_periods():
+    u,d = tree(1)
+    with pytest.raises(ValueError):
+        le.richardson_option_price(u,d,1,T,r,c,-1,True,S0,K)
+    u,d = tree(2)
+    assert np.isfinite(le.richardson_option_price(u,d,2,T,r,c,-1,True,S0,K))
+
+def test_richardson_odd_periods():
+    #the weights of the extrapolation follow N and N//2, so odd N converge as even N do
+    reference = black_scholes_price(S0,K,T,r,c,sigma,1)
+    for N in (2,4,100):
+        u,d = tree(N)
+        P = le.richardson_option_price(u,d,N,T,r,c,1,False,S0,K)
+        u2,d2 = tree(N//2)
+        assert np.isclose(P,2*le.binomial_option_price(u,d,N,T,r,c,1,False,S0,K)-le.binomial_option_price(u2,d2,N//2,T,r,c,1,False,S0,K))
+    for N in (51,101,201):
+        u,d = tree(N)
+        error = abs(le.richardson_option_price(u,d,N,T,r,c,1,False,S0,K)-reference)
+        assert error < abs(le.binomial_option_price(u,d,N,T,r,c,1,False,S0,K)-reference)/5
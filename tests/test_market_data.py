@@ -0,0 +1,120 @@
+import os
+import numpy as np
+import pytest
+from financial_markets import market_data as md
+
+dates = np.busday_offset('2010-01-04',np.arange(40))
+
+#fixture CSV files: the close of symbol k on day t is 10*(k+1)+t, the adjusted close 90% of it
+def write_fixtures(directory,symbols,adjusted=True):
+    for k,symbol in enumerate(symbols):
+        with open(os.path.join(directory,symbol+'.csv'),'w') as f:
+            f.write('Date,Open,High,Low,Close,Volume'+(',Adj Close' if adjusted else '')+'\n')
+            for t,date in enumerate(dates[::-1]):
+                close = 10.0*(k+1)+(len(dates)-1-t)
+                f.write('%s,%g,%g,%g,%g,1000' % (date,close,close,close,close)+(',%g' % (0.9*close) if adjusted else '')+'\n')
+
+@pytest.fixture
+def server(tmpdir):
+    fixtures = str(tmpdir.mkdir('fixtures'))
+    write_fixtures(fixtures,['AAA','BBB','^GSPC'])
+    write_fixtures(fixtures,['NOADJ'],adjusted=False)
+    server,url = md.serve_fixtures(fixtures)
+    server.url = url
+    server.cache = str(tmpdir.join('cache'))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def queries(requests):
+    return sorted(request.split('?')[1] for request in requests)
+
+def test_fetch_and_cache_hit(server):
+    options = {'fields': ['close','actual_close'], 'cache_dir': server.cache, 'base_url': server.url}
+    data = md.fetch(['AAA','BBB','^GSPC'],'2010-01-04','2010-01-29',**options)
+    assert len(server.requests) == 3
+    days = dates[dates <= np.datetime64('2010-01-29')]
+    for k,symbol in enumerate(['AAA','BBB','^GSPC']):
+        assert np.array_equal(data[symbol]['actual_close'][0],days)
+        assert np.allclose(data[symbol]['actual_close'][1],10.0*(k+1)+np.arange(len(days)))
+        assert np.allclose(data[symbol]['close'][1],0.9*data[symbol]['actual_close'][1])
+    cached = md.fetch(['AAA','BBB','^GSPC'],'2010-01-04','2010-01-29',**options)
+    assert len(server.requests) == 3
+    for symbol in data:
+        for field in options['fields']:
+            assert np.array_equal(cached[symbol][field][0],data[symbol][field][0])
+            assert np.array_equal(cached[symbol][field][1],data[symbol][field][1])
+
+def test_fetch_only_the_missing_ranges(server):
+    options = {'fields': ['close'], 'cache_dir': server.cache, 'base_url': server.url}
+    md.fetch(['AAA'],'2010-01-11','2010-01-20',**options)
+    md.fetch(['AAA'],'2010-01-15','2010-01-18',**options)
+    assert queries(server.requests) == ['start=2010-01-11&end=2010-01-20']
+    n = len(server.requests)
+    data = md.fetch(['AAA'],'2010-01-04','2010-02-05',**options)
+    assert queries(server.requests[n:]) == ['start=2010-01-04&end=2010-01-10','start=2010-01-21&end=2010-02-05']
+    days = dates[dates <= np.datetime64('2010-02-05')]
+    assert np.array_equal(data['AAA']['close'][0],days)
+    assert np.allclose(data['AAA']['close'][1],0.9*(10.0+np.arange(len(days))))
+
+def test_field_missing_from_the_csv_is_not_requested_again(server):
+    options = {'fields': ['close','actual_close'], 'cache_dir': server.cache, 'base_url': server.url}
+    data = md.fetch(['NOADJ'],'2010-01-04','2010-01-29',**options)
+    assert len(data['NOADJ']['close'][0]) == 0 and len(data['NOADJ']['actual_close'][0]) == 20
+    data = md.fetch(['NOADJ'],'2010-01-04','2010-01-29',**options)
+    assert len(server.requests) == 1
+    assert len(data['NOADJ']['close'][0]) == 0 and len(data['NOADJ']['actual_close'][0]) == 20
+
+def test_duplicate_symbols_are_fetched_once(server):
+    data = md.fetch(['AAA','BBB','AAA','AAA'],'2010-01-04','2010-01-29',cache_dir=server.cache,base_url=server.url)
+    assert sorted(data) == ['AAA','BBB']
+    assert len(server.requests) == 2
+    assert sorted(os.listdir(server.cache)) == ['AAA.npz','BBB.npz']
+
+def test_fetch_retries_failed_requests(tmpdir):
+    fixtures = str(tmpdir.mkdir('fixtures'))
+    symbols = ['S%d' % k for k in range(10)]
+    write_fixtures(fixtures,symbols)
+    server,url = md.serve_fixtures(fixtures,failure_rate=0.5,seed=1)
+    try:
+        data = md.fetch(symbols,'2010-01-04','2010-01-29',base_url=url,connections=1,retries=20,backoff=0.001)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(server.requests) > len(symbols)
+    for k,symbol in enumerate(symbols):
+        assert np.allclose(data[symbol]['close'][1],0.9*(10.0*(k+1)+np.arange(20)))
+
+class Response(object):
+
+    def read(self):
+        return b'body'
+
+    def close(self):
+        pass
+
+#urlopen failing with the given HTTP errors before answering
+def failing_urlopen(codes,calls):
+    def urlopen(url,timeout):
+        calls.append(url)
+        if len(calls) <= len(codes):
+            raise md.HTTPError(url,codes[len(calls)-1],'error',{},None)
+        return Response()
+    return urlopen
+
+def test_fetch_url_retries_429_and_5xx_only(monkeypatch):
+    calls = []
+    monkeypatch.setattr(md,'urlopen',failing_urlopen([429,503,500],calls))
+    monkeypatch.setattr(md.time,'sleep',lambda seconds: None)
+    assert md.fetch_url('http://example.invalid/a',retries=3) == 'body'
+    assert len(calls) == 4
+    calls = []
+    monkeypatch.setattr(md,'urlopen',failing_urlopen([503,503],calls))
+    with pytest.raises(md.HTTPError):
+        md.fetch_url('http://example.invalid/a',retries=1)
+    assert len(calls) == 2
+    calls = []
+    monkeypatch.setattr(md,'urlopen',failing_urlopen([404],calls))
+    with pytest.raises(md.HTTPError):
+        md.fetch_url('http://example.invalid/a',retries=3)
+    assert len(calls) == 1
@@ -0,0 +1,56 @@
+import numpy as np
+from financial_markets.mbs_engine import project_pools
+from financial_markets.mbs_stream import tape_fields
+
+#month loop of the original MBS.py for one pool (rates in decimal), over the months left to pay
+def project_pool_loop(initial_balance,mortgage_rate,passthrough_rate,seasoning,terms,multiplier,r):
+    PSA_parameter_time=[1,30,240]
+    PSA_parameter_rate=[0.002,0.06,0.06]
+    months=terms-seasoning
+    month=np.zeros(months)
+    monthly_interest_passed=np.zeros(months)
+    total_principal_repayment=np.zeros(months)
+    ending_balance=np.zeros(months)
+    for i in range(months):
+        month[i]=i+1
+        if i+seasoning < PSA_parameter_time[1]:
+            CPR=PSA_parameter_rate[0]+(month[i]+seasoning-PSA_parameter_time[0])*(PSA_parameter_rate[1]-PSA_parameter_rate[0])/(PSA_parameter_time[1]-PSA_parameter_time[0])
+        else:
+            CPR=PSA_parameter_rate[1]+(month[i]+seasoning-PSA_parameter_time[1])*(PSA_parameter_rate[2]-PSA_parameter_rate[1])/(PSA_parameter_time[2]-PSA_parameter_time[1])
+        CPR *= multiplier
+        beginning_balance = ending_balance[i-1] if i>0 else initial_balance
+        monthly_payment=beginning_balance*(mortgage_rate/12.)/(1.0-(1.0+(mortgage_rate/12.0))**(-(terms-seasoning-month[i]+1.0)))
+        monthly_interest_paid=mortgage_rate*beginning_balance/12.
+        monthly_interest_passed[i]=monthly_interest_paid*passthrough_rate/mortgage_rate
+        scheduled_principal_repayment=monthly_payment-monthly_interest_paid
+        prepayment=(beginning_balance-scheduled_principal_repayment)*(1.0-(1.0-CPR)**(1./12.))
+        total_principal_repayment[i]=scheduled_principal_repayment+prepayment
+        ending_balance[i]=beginning_balance-total_principal_repayment[i]
+    TP=total_principal_repayment.sum()
+    TI=monthly_interest_passed.sum()
+    discount=(1.0+r/12.0)**month
+    return {'PV_PO': (total_principal_repayment/discount).sum(), 'PV_IO': (monthly_interest_passed/discount).sum(),
+            'average_life': (month*total_principal_repayment).sum()/12./TP,
+            'average_IO_life': (month*monthly_interest_passed).sum()/12./TI, 'TP': TP, 'TI': TI,
+            'total_principal_repayment': total_principal_repayment, 'monthly_interest_passed': monthly_interest_passed,
+            'ending_balance': ending_balance}
+
+#seasoned and unseasoned pools with several PSA multipliers
+pools = {'initial_balance': np.array([417000.,250000.,100000.,800000.,150000.]),
+         'mortgage_rate': np.array([0.0475,0.06,0.035,0.05,0.07]),
+         'passthrough_rate': np.array([0.0475,0.055,0.03,0.045,0.065]),
+         'seasoning': np.array([0,12,0,45,250]),
+         'terms': np.array([360,360,180,360,300]),
+         'multiplier': np.array([1.0,1.5,0.5,3.0,2.0])}
+
+def test_project_pools_matches_the_month_loop():
+    r = 0.035
+    res = project_pools(*[pools[field] for field in tape_fields],r=r)
+    for k in range(len(pools['terms'])):
+        loop = project_pool_loop(*[pools[field][k] for field in tape_fields],r=r)
+        months = len(loop['ending_balance'])
+        for field in ('PV_PO','PV_IO','average_life','average_IO_life','TP','TI'):
+            assert np.isclose(res[field][k],loop[field],rtol=1e-12)
+        for field in ('total_principal_repayment','monthly_interest_passed','ending_balance'):
+            assert np.allclose(res[field][k,:months],loop[field],rtol=1e-10,atol=1e-6)
+            assert np.all(res[field][k,months:] == 0)
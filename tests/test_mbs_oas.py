@@ -0,0 +1,17 @@
+import numpy as np
+from financial_markets import mbs_oas
+
+def test_oas_does_not_depend_on_the_processes():
+    parameters = {'terms': 120}
+    price = 400000.0
+    oas1 = mbs_oas.solve_oas(price,parameters,paths=2500,seed=3,processes=1)
+    oas2 = mbs_oas.solve_oas(price,parameters,paths=2500,seed=3,processes=2)
+    assert oas1 == oas2
+    #the OAS reprices the pool at the market price
+    value,derivative = mbs_oas.MBSPaths(parameters,paths=2500,seed=3).value(oas1)
+    assert abs(value-price) < 1e-6
+    assert derivative < 0
+
+def test_blocks_of_fixed_size():
+    mbs = mbs_oas.MBSPaths({'terms': 12},paths=2500,seed=1,block_size=1000)
+    assert [n for s,n in mbs.tasks] == [1000,1000,500]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from financial_markets.mbs_engine import project_pools
+from financial_markets import mbs_stream
+
+def random_tape(n=23,seed=0):
+    rng = np.random.RandomState(seed)
+    rate = rng.uniform(0.03,0.07,n)
+    terms = rng.choice([180,240,360],n)
+    return {'pool': np.arange(100,100+n),
+            'initial_balance': rng.uniform(1e5,1e6,n),
+            'mortgage_rate': rate,
+            'passthrough_rate': rate-0.005,
+            'seasoning': (rng.uniform(0,1,n)*(terms-1)).astype(int),
+            'terms': terms,
+            'multiplier': rng.uniform(0.5,3.0,n)}
+
+def write_tape(tape,path):
+    import pandas as pd
+    df = pd.DataFrame(tape,columns=['pool']+mbs_stream.tape_fields)
+    if path.endswith('.parquet'):
+        df.to_parquet(path,index=False)
+    else:
+        df.to_csv(path,index=False)
+
+@pytest.mark.parametrize('extension',['csv','parquet'])
+def test_stream_tape_chunks_match_one_projection(tmpdir,extension):
+    pytest.importorskip('pandas')
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+    tape = random_tape()
+    path = str(tmpdir.join('tape.'+extension))
+    write_tape(tape,path)
+    r = 0.035
+    whole = project_pools(*[tape[field] for field in mbs_stream.tape_fields],r=r)
+
+    pool_output = str(tmpdir.join('pools.npy'))
+    cash_flow_output = str(tmpdir.join('cash_flows.npy'))
+    agg = mbs_stream.stream_tape(path,r,pool_output,cash_flow_output,chunksize=5)
+    assert agg['pools'] == len(tape['pool'])
+    for field in ('PV_PO','PV_IO','TP','TI'):
+        assert np.isclose(agg[field],whole[field].sum(),rtol=1e-12)
+    assert np.isclose(agg['average_life'],np.dot(whole['average_life'],whole['TP'])/whole['TP'].sum(),rtol=1e-12)
+    assert np.isclose(agg['average_IO_life'],np.dot(whole['average_IO_life'],whole['TI'])/whole['TI'].sum(),rtol=1e-12)
+    for field in ('total_principal_repayment','monthly_interest_passed'):
+        assert np.allclose(agg[field],whole[field].sum(axis=0),rtol=1e-12)
+
+    rows = np.load(pool_output)
+    assert np.array_equal(rows['pool'],tape['pool'])
+    assert np.allclose(rows['PV_PO'],whole['PV_PO'],rtol=1e-12)
+    flows = np.load(cash_flow_output)
+    assert len(flows) == (tape['terms']-tape['seasoning']).sum()
+    k = np.searchsorted(tape['pool'],flows['pool'])
+    assert np.allclose(flows['prepayment'],whole['prepayment'][k,flows['month'].astype(int)-1],rtol=1e-12)
@@ -0,0 +1,36 @@
+import numpy as np
+from financial_markets import portfolio_analytics as pa
+
+#statistics of one window fitted directly: least squares of y on [1, x]
+def refit(y,x,Rf,periods):
+    y = y-Rf
+    x = x-Rf
+    A = np.column_stack([np.ones(len(x)),x])
+    (alpha,beta),residuals = np.linalg.lstsq(A,y,rcond=None)[:2]
+    n = float(len(x))
+    r2 = 1.0-residuals[0]/((y-y.mean())**2).sum()
+    return {'alpha': alpha, 'beta': beta, 'jensen_alpha': (1.0+alpha)**periods-1.0, 'r2': r2,
+            'r2_adj': 1.0-(1.0-r2)*(n-1.0)/(n-2.0), 'mean': y.mean(), 'std': y.std(ddof=1),
+            'sharpe': y.mean()/y.std(ddof=1)*np.sqrt(periods)}
+
+def test_rolling_statistics_match_a_refit_per_window():
+    rng = np.random.RandomState(0)
+    x = 0.0004+0.01*rng.randn(200)
+    y = 0.0001+np.array([0.5,1.0,1.5])*x[:,np.newaxis]+0.005*rng.randn(200,3)
+    window,Rf = 60,0.0001
+    res = pa.rolling_statistics(y,x,window,Rf)
+    assert np.array_equal(res['end'],np.arange(window-1,200))
+    for k,end in enumerate(res['end']):
+        for portfolio in range(3):
+            ref = refit(y[end-window+1:end+1,portfolio],x[end-window+1:end+1],Rf,252)
+            for name,value in ref.items():
+                assert np.isclose(res[name][k,portfolio],value,rtol=1e-9,atol=1e-12),(name,end,portfolio)
+
+def test_regression_statistics_of_one_portfolio():
+    rng = np.random.RandomState(1)
+    x = 0.01*rng.randn(100)
+    y = 0.0002+1.2*x+0.003*rng.randn(100)
+    res = pa.regression_statistics(y,x)
+    ref = refit(y,x,0.0,252)
+    for name,value in ref.items():
+        assert np.isclose(res[name],value,rtol=1e-9,atol=1e-12),name
@@ -0,0 +1,86 @@
+import datetime as dt
+import os
+import sys
+import numpy as np
+import pytest
+from financial_markets import price_store as ps
+
+def write_csv(filename,dates,closes):
+    with open(filename,'w') as f:
+        f.write('Date,Open,High,Low,Close,Volume,Adj Close\n')
+        for date,close in zip(dates,closes):
+            f.write('%s,%g,%g,%g,%g,1000,%g\n' % (date,close,close,close,close,close))
+
+def test_main_ingests_lists(tmpdir,monkeypatch):
+    csv_directory = str(tmpdir.mkdir('Yahoo'))
+    write_csv(os.path.join(csv_directory,'AAA.csv'),['2010-01-05','2010-01-04','2010-01-06'],[11.0,10.0,12.0])
+    write_csv(os.path.join(csv_directory,'BBB.csv'),['2010-01-04','2010-01-06'],[20.0,22.0])
+    os.mkdir(os.path.join(csv_directory,'Lists'))
+    with open(os.path.join(csv_directory,'Lists','sp5002012.txt'),'w') as f:
+        f.write('AAA\nBBB\n')
+    extra = str(tmpdir.join('mine.txt'))
+    with open(extra,'w') as f:
+        f.write('BBB\n')
+    path = str(tmpdir.join('store'))
+    monkeypatch.setattr(sys,'argv',['price_store.py',csv_directory,path,extra])
+    ps.main()
+
+    store = ps.PriceStore(path)
+    assert store.get_symbols_from_list('sp5002012') == ['AAA','BBB']
+    assert store.get_symbols_from_list('mine') == ['BBB']
+    days = store.trading_days(dt.datetime(2010,1,5),dt.datetime(2010,1,6),dt.timedelta(hours=16))
+    assert list(days) == [np.datetime64('2010-01-05T16:00'),np.datetime64('2010-01-06T16:00')]
+    close = store.load('close',days,['AAA','BBB'])
+    assert np.array_equal(close[:,0],[11.0,12.0])
+    assert np.isnan(close[0,1]) and close[1,1] == 22.0
+
+#store of random prices over 300 trading days of 2010 for the symbols of the list sp5002012 and SPY
+def random_store(tmpdir,symbols=['AAA','BBB','CCC','DDD','EEE']):
+    csv_directory = str(tmpdir.mkdir('csv'))
+    dates = np.busday_offset('2010-01-04',np.arange(300))
+    rng = np.random.RandomState(1)
+    market = 100.0*np.exp(np.cumsum(0.015*rng.randn(len(dates))))
+    write_csv(os.path.join(csv_directory,'SPY.csv'),dates,market)
+    for symbol in symbols:
+        close = 50.0*np.exp(np.cumsum(0.03*rng.randn(len(dates))))
+        write_csv(os.path.join(csv_directory,symbol+'.csv'),dates[5:],close[5:]) #missing first days, filled by the scripts
+    path = str(tmpdir.join('store'))
+    ps.ingest(csv_directory,path,{'sp5002012': symbols})
+    return path,dates
+
+def test_bollinger_reads_the_store(tmpdir,monkeypatch):
+    from financial_markets import Bollinger
+    path,dates = random_store(tmpdir)
+    monkeypatch.setattr(Bollinger,'store_path',path)
+    output = str(tmpdir.join('Bollinger.csv'))
+    bollinger,close = Bollinger.simulate(dt.datetime(2010,1,1),dt.datetime(2010,12,31),['AAA','BBB'],output)
+    store = ps.PriceStore(path)
+    expected = ps.fill_missing(store.load('close',close.index,['AAA','BBB']))
+    assert np.allclose(close.values,expected)
+    x = expected[:,0]
+    window = x[-20:]
+    assert np.isclose(bollinger['AAA'].values[-1],(x[-1]-window.mean())/window.std(ddof=1))
+    assert np.all(np.isnan(bollinger.values[:19]))
+    assert len(open(output).read().splitlines()) == len(close)+1
+
+def test_event_study_reads_the_store(tmpdir,monkeypatch):
+    from financial_markets import event_study
+    path,dates = random_store(tmpdir)
+    monkeypatch.setattr(event_study,'store_path',path)
+    monkeypatch.chdir(str(tmpdir))
+    profiles = []
+    monkeypatch.setattr(event_study,'plot_profile',lambda profile,*args,**kwargs: profiles.append(profile))
+    event_study.main()
+    profile, = profiles
+    assert profile['count'] > 0
+    assert profile['mean'][60] == 0.0 and np.all(np.isfinite(profile['mean']))
+    table = np.loadtxt(str(tmpdir.join('EventStudy.csv')),delimiter=',',skiprows=1)
+    assert np.allclose(table[:,1],profile['mean'])
+
+def test_portfolio_needs_the_benchmark_in_the_store(tmpdir,monkeypatch):
+    pytest.importorskip('matplotlib')
+    from financial_markets import portfolio
+    path,dates = random_store(tmpdir)
+    monkeypatch.setattr(portfolio,'store_path',path)
+    with pytest.raises(ValueError,match=r'\^GSPC'):
+        portfolio.main()
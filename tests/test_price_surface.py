@@ -0,0 +1,25 @@
+import numpy as np
+from financial_markets import price_surface as psf
+
+def small_grid():
+    return {'moneyness': np.linspace(0.5,1.6,23),
+            'T': np.array([0.25,0.5]),
+            'sigma': np.array([0.2,0.4]),
+            'r': np.array([0.0,0.02,0.04]),
+            'c': np.array([0.0,0.02])}
+
+def test_boundary_next_to_corners_without_early_exercise():
+    put = psf.build_surface(small_grid(),cp=-1,N=50)
+    #puts with r=0 and c>0 are never exercised early
+    assert np.all(put.boundary_values[:,:,0,1] == 0.0)
+    b = put.boundary(100.0,0.4,0.02,0.01,0.3)
+    assert np.isfinite(b) and 50.0 < b < 100.0
+    assert put.boundary(100.0,0.4,0.0,0.02,0.3) == 0.0
+    assert np.isnan(put.boundary(100.0,3.0,0.02,0.01,0.3))
+
+    call = psf.build_surface(small_grid(),cp=1,N=50)
+    #calls with c=0 are never exercised early
+    assert np.all(np.isinf(call.boundary_values[:,:,:,0]))
+    b = call.boundary(100.0,0.4,0.02,0.01,0.3)
+    assert np.isfinite(b) and b > 100.0
+    assert np.isinf(call.boundary(100.0,0.4,0.02,0.0,0.3))
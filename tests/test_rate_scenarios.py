@@ -0,0 +1,32 @@
+import numpy as np
+from financial_markets import derivative_pricing as dp
+from financial_markets import rate_scenarios as rs
+
+scenarios = rs.scenario_grid([1.1,1.25],[0.9],[0.05,0.06],[0.045,0.05],[6,10])
+
+def test_scenario_grid():
+    assert len(scenarios) == 16
+    assert rs.scenario_fields == list(scenarios.dtype.names)
+    assert set(scenarios['N']) == set([6,10]) and set(scenarios['r0']) == set([0.05,0.06])
+
+def test_process_pool_matches_serial_run():
+    serial = rs.run_scenarios(scenarios,processes=1)
+    pooled = rs.run_scenarios(scenarios,processes=2,chunksize=3)
+    assert serial.dtype == pooled.dtype
+    for field in rs.scenario_fields+rs.product_fields:
+        assert np.array_equal(serial[field],pooled[field]),field
+
+def test_prices_match_full_lattices():
+    res = rs.run_scenarios(scenarios,{'notional': 1.0},processes=1)
+    for s in res:
+        u,d,r0,fixed,N = [s[field] for field in rs.scenario_fields]
+        shrval = dp.short_rate_lattice(u,d,int(N),r0)
+        assert np.isclose(s['ZCB'],dp.ZCB_lattice(int(N),100.0,shrval)[0,0])
+        assert np.isclose(s['swap'],dp.swap(fixed,int(N),shrval)[0,0])
+        forswapval = dp.forswap(fixed,int(N),shrval)
+        assert np.isclose(s['forswap'],forswapval[0,0])
+        assert np.isclose(s['swaption'],dp.swaption(5,forswapval,shrval)[0,0])
+
+def test_no_scenarios():
+    res = rs.run_scenarios(scenarios[:0],processes=1)
+    assert len(res) == 0 and res.dtype.names == tuple(rs.scenario_fields+rs.product_fields)
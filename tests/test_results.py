@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from financial_markets import derivative_pricing as dp
+from financial_markets import results
+
+columns = ['id','month','value']
+
+def chunks():
+    rng = np.random.RandomState(0)
+    return [{'id': np.array(['P%d' % k for k in range(start,start+n)]), 'month': np.arange(start,start+n),
+             'value': rng.randn(n)} for start,n in [(0,7),(7,5),(12,100),(112,1)]]
+
+def read(path):
+    if results.is_npy(path):
+        return np.load(path)
+    pd = pytest.importorskip('pandas')
+    return pd.read_parquet(path) if results.is_parquet(path) else pd.read_csv(path)
+
+@pytest.mark.parametrize('extension',['csv','parquet','npy'])
+@pytest.mark.parametrize('buffer_rows',[1,10,1000])
+def test_results_writer_round_trip(tmpdir,extension,buffer_rows):
+    if extension == 'parquet':
+        pytest.importorskip('pyarrow')
+    path = str(tmpdir.join('results.'+extension))
+    with results.ResultsWriter(path,columns,buffer_rows=buffer_rows) as writer:
+        for chunk in chunks():
+            writer.write(chunk)
+        writer.write({'id': 'last', 'month': 113, 'value': 0.5}) #a single row of scalars
+    data = read(path)
+    assert len(data) == 114
+    expected = dict((name,np.concatenate([chunk[name] for chunk in chunks()]+[np.atleast_1d(last)]))
+                    for name,last in zip(columns,['last',113,0.5]))
+    assert list(np.asarray(data['id'])) == list(expected['id'])
+    assert np.array_equal(np.asarray(data['month']),expected['month'])
+    assert np.allclose(np.asarray(data['value']),expected['value'],rtol=1e-14,atol=0) #CSV: 15 significant digits
+
+def test_npy_header_has_the_row_count(tmpdir):
+    path = str(tmpdir.join('results.npy'))
+    writer = results.ChunkWriter(path,columns)
+    for chunk in chunks():
+        writer.write(chunk)
+    writer.close()
+    with open(path,'rb') as f:
+        assert np.lib.format.read_magic(f) == (1,0)
+        shape,fortran_order,dtype = np.lib.format.read_array_header_1_0(f)
+        assert f.tell()%64 == 0
+    assert shape == (113,) and not fortran_order and dtype.names == tuple(columns)
+
+def test_npy_strings_are_widened_by_later_chunks(tmpdir):
+    path = str(tmpdir.join('results.npy'))
+    writer = results.ChunkWriter(path,['name','x'])
+    writer.write({'name': np.array(['a','bb']), 'x': np.array([1.0,2.0])})
+    writer.write({'name': np.array(['ccc']), 'x': np.array([3.0])})
+    writer.write({'name': np.array(['a much longer name'*10]), 'x': np.array([4])})
+    writer.write({'name': np.array(['d']), 'x': np.array([5.0])})
+    writer.close()
+    data = np.load(path)
+    assert list(data['name']) == ['a','bb','ccc','a much longer name'*10,'d']
+    assert np.array_equal(data['x'],[1.0,2.0,3.0,4.0,5.0]) and data['x'].dtype == float
+
+def test_empty_npy_file_is_not_written(tmpdir):
+    path = str(tmpdir.join('results.npy'))
+    results.ChunkWriter(path,columns).close()
+    with open(path,'rb') as f:
+        assert f.read() == b''
+
+def test_exercise_trace_of_an_american_put(tmpdir):
+    u,N,T,r,c,K = 1.05,20,0.5,0.05,0.0,100.0
+    stkval = dp.stock_price_lattice(u,1/u,N,100.0)
+    trace = results.ExerciseTrace()
+    optval = dp.option_price_lattice(u,1/u,N,T,r,c,-1,True,stkval,K,trace=trace)
+    table = trace.table()
+    assert len(table['time']) > 0
+    exercise = K-stkval[table['time'],table['node']]
+    assert np.allclose(table['payoff'],exercise)
+    assert np.allclose(optval[table['time'],table['node']],exercise)
+    first,last = trace.boundary(N)
+    for i in range(N):
+        nodes = table['node'][table['time'] == i]
+        assert (first[i],last[i]) == ((nodes.min(),nodes.max()) if len(nodes) else (-1,-1))
+    path = str(tmpdir.join('trace.npy'))
+    trace.write(path)
+    assert np.array_equal(np.load(path)['node'],table['node'])
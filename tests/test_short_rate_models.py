@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from financial_markets import derivative_pricing as dp
+from financial_markets import short_rate_models as srm
+
+spot = np.array([0.030,0.032,0.035,0.037,0.038,0.040,0.041,0.042,0.043,0.043,0.044,0.045])
+
+@pytest.mark.parametrize('model,b',[('BDT',0.05),('Ho-Lee',0.002),('BDT',np.linspace(0.08,0.03,len(spot)))])
+def test_calibrated_lattice_reproduces_the_curve(model,b):
+    shrval = srm.calibrate_short_rate_lattice(spot,b,model)
+    P = srm.discount_factors(spot)
+    for k in range(1,len(spot)+1):
+        assert np.isclose(dp.ZCB_lattice(k,1.0,shrval,keep=[0])[0][0],P[k-1],rtol=1e-12,atol=0)
+    #the state prices price the same bonds, and match those of the lattice of bond prices
+    AD = srm.state_prices(shrval)
+    for k in range(1,len(spot)):
+        assert np.isclose(AD[k,:k+1].sum(),P[k-1],rtol=1e-12,atol=0)
+    assert np.isclose(np.dot(AD[-1,:],1.0/(1.0+shrval[-1,:])),P[-1],rtol=1e-12,atol=0)
+
+def test_state_prices_of_a_lattice():
+    shrval = dp.short_rate_lattice(1.1,0.9,6,0.05)
+    AD = srm.state_prices(shrval)
+    #value of 1 paid at every node of time k: the zero-coupon bond maturing at t=k
+    for k in range(1,7):
+        assert np.isclose(AD[k,:k+1].sum(),dp.ZCB_lattice(k,1.0,shrval,keep=[0])[0][0])
+    #value at t=0 of a payoff at time 4 by backward induction
+    payoff = np.arange(5.0)
+    assert np.isclose(np.dot(AD[4,:5],payoff),dp.backward_induction(payoff,0.5,lambda i: 1.0+shrval[i,:i+1],keep=[0])[0][0])
+
+def test_no_convergence():
+    with pytest.raises(RuntimeError):
+        srm.calibrate_short_rate_lattice(spot,0.05,'BDT',maxiter=1)